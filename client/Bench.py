@@ -0,0 +1,603 @@
+"""
+HTTP 부하 생성기 (벤치마크)
+실행 중인 서버에 요청을 섞어 보내고 처리량(RPS), 지연 시간 분포, 에러 수를 측정합니다.
+
+- 요청 종류: static(GET 정적 파일), list(GET /users), create(POST), update(PUT), patch(PATCH), delete(DELETE)
+  --mix로 종류별 가중치 지정 (수정/삭제할 사용자가 없으면 create로 대신 보냄)
+- 연결 N개를 각각 스레드 하나가 담당 (--processes로 여러 프로세스에 나눠 GIL 한계를 피함)
+- closed-loop (기본): 응답을 받으면 바로 다음 요청 → 서버가 낼 수 있는 최대 처리량 측정
+- open-loop (--rate): 정해진 시각에 요청 → 지연 시간은 예정 시각부터 측정 (서버가 밀리면 대기 시간 포함)
+- keep-alive 켜기/끄기 (--no-keepalive: 요청마다 새 연결, 연결 시간 포함)
+- 결과를 JSON으로 저장(--output)하고 이전 결과와 비교(--compare, 허용 범위보다 나빠지면 종료 코드 1)
+- 측정 중 만든 사용자는 종료 후 삭제 (측정에 포함하지 않음)
+
+실행 예:
+  python client/Bench.py --connections 32 --duration 10 --output before.json
+  python client/Bench.py --rate 2000 --no-keepalive --mix static=50,list=50
+  python client/Bench.py --compare before.json
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import random
+import socket
+import platform
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.HTTPConstants import (
+    CLIENT_HOST, DEFAULT_PORT, BUFFER_SIZE,
+    BENCH_OPERATIONS, DEFAULT_BENCH_MIX, DEFAULT_BENCH_STATIC_PATH, DEFAULT_BENCH_LIST_PATH,
+    DEFAULT_BENCH_CONNECTIONS, DEFAULT_BENCH_DURATION, DEFAULT_BENCH_WARMUP, BENCH_TIMEOUT,
+    BENCH_PERCENTILES, DEFAULT_BENCH_TOLERANCE
+)
+from client.HTTPRequest import HTTPRequest
+
+# 사용자 ID가 필요한 요청 종류
+_NEEDS_USER = ('update', 'patch', 'delete')
+
+
+def parse_mix(text):
+    """
+    'static=30,list=30,...' → [(종류, 가중치), ...]
+    
+    Raises:
+        ValueError: 알 수 없는 종류이거나 가중치가 올바르지 않을 때
+    """
+    mix = []
+    for item in text.split(','):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in BENCH_OPERATIONS:
+            raise ValueError(f'Unknown operation: {name}')
+        weight = float(weight) if weight.strip() else 1.0
+        if weight < 0:
+            raise ValueError(f'Invalid weight: {item}')
+        if weight > 0:
+            mix.append((name, weight))
+    if not mix:
+        raise ValueError('Empty mix')
+    return mix
+
+
+class ResponseError(Exception):
+    """응답 형식 오류 (상태 라인, 청크 크기 등)"""
+    pass
+
+
+class _Connection:
+    """서버 연결 하나 (keep-alive면 재사용, 응답은 Content-Length / chunked / 연결 종료로 구분)"""
+    
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.socket = None
+        self.buffer = bytearray()
+    
+    def request(self, request_bytes, method):
+        """
+        요청 전송 후 응답 하나 수신
+        
+        Returns:
+            tuple: (상태 코드, 바디 bytes, 연결 유지 여부)
+        """
+        if self.socket is None:
+            self.socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket.sendall(request_bytes)
+        return self._read_response(method)
+    
+    def close(self):
+        """연결 종료 (다음 요청 때 새로 연결)"""
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+        self.buffer.clear()
+    
+    def _recv(self):
+        """수신 버퍼에 데이터 추가 (서버가 연결을 닫았으면 ConnectionError)"""
+        data = self.socket.recv(BUFFER_SIZE * 16)
+        if not data:
+            raise ConnectionError('Connection closed by server')
+        self.buffer += data
+    
+    def _read_until(self, delimiter):
+        """구분자까지 읽고 구분자를 뺀 앞부분 반환"""
+        while True:
+            index = self.buffer.find(delimiter)
+            if index >= 0:
+                data = bytes(self.buffer[:index])
+                del self.buffer[:index + len(delimiter)]
+                return data
+            self._recv()
+    
+    def _read_exact(self, size):
+        """정확히 size bytes 읽기"""
+        while len(self.buffer) < size:
+            self._recv()
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+    
+    def _read_response(self, method):
+        """상태 라인 + 헤더 + 바디 읽기"""
+        lines = self._read_until(b'\r\n\r\n').decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ', 2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ResponseError(f'Invalid status line: {lines[0]!r}')
+        status_code = int(parts[1])
+        
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        
+        if method == 'HEAD' or status_code in (204, 304) or status_code < 200:
+            body = b''
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            body = self._read_chunked()
+        elif 'content-length' in headers:
+            body = self._read_exact(int(headers['content-length']))
+        else:
+            # 길이 정보가 없으면 서버가 연결을 닫을 때까지가 바디
+            try:
+                while True:
+                    self._recv()
+            except ConnectionError:
+                pass
+            body = bytes(self.buffer)
+            self.buffer.clear()
+            keep_alive = False
+        return status_code, body, keep_alive
+    
+    def _read_chunked(self):
+        """Transfer-Encoding: chunked 바디 읽기"""
+        chunks = []
+        while True:
+            size_line = self._read_until(b'\r\n').split(b';')[0].strip()
+            try:
+                size = int(size_line, 16)
+            except ValueError:
+                raise ResponseError(f'Invalid chunk size: {size_line!r}')
+            if size == 0:
+                # 트레일러 헤더 건너뛰기 (빈 줄까지)
+                while self._read_until(b'\r\n'):
+                    pass
+                return b''.join(chunks)
+            chunks.append(self._read_exact(size))
+            self._read_exact(2)
+
+
+class _Worker:
+    """연결 하나로 요청을 보내고 결과를 기록 (기록은 이 워커의 스레드만 하므로 잠금 없음)"""
+    
+    def __init__(self, index, options):
+        self.index = index
+        self.options = options
+        self.random = random.Random(options['seed'] * 100003 + index)
+        self.connection = _Connection(options['host'], options['port'], options['timeout'])
+        self.host_header = f"{options['host']}:{options['port']}"
+        
+        self.names = [name for name, _ in options['mix']]
+        self.weights = [weight for _, weight in options['mix']]
+        
+        self.user_ids = []      # 이 워커가 만든 사용자 (수정·삭제 대상)
+        self.created = 0
+        self.latencies = {}     # 종류 → [지연 시간(초), ...]
+        self.status = {}        # 종류 → Counter(상태 코드)
+        self.errors = Counter()     # 에러 종류 → 개수
+    
+    def _build(self, operation):
+        """요청 종류 → (실제 종류, HTTPRequest)"""
+        if operation in _NEEDS_USER and not self.user_ids:
+            operation = 'create'
+        headers = {'Host': self.host_header}
+        if not self.options['keepalive']:
+            headers['Connection'] = 'close'
+        
+        if operation == 'static':
+            return operation, HTTPRequest.build_GET(self.options['static_path'], headers)
+        if operation == 'list':
+            return operation, HTTPRequest.build_GET(self.options['list_path'], headers)
+        if operation == 'create':
+            self.created += 1
+            name = f'bench-{self.index}-{self.created}'
+            return operation, HTTPRequest.build_POST('/users', {
+                'name': name, 'email': f'{name}@example.com', 'age': self.random.randint(18, 80)
+            }, headers)
+        
+        user_id = self.random.choice(self.user_ids)
+        if operation == 'update':
+            return operation, HTTPRequest.build_PUT(f'/users/{user_id}', {
+                'name': f'bench-{self.index}-{user_id}', 'email': f'bench-{user_id}@example.com',
+                'age': self.random.randint(18, 80)
+            }, headers)
+        if operation == 'patch':
+            return operation, HTTPRequest.build_PATCH(
+                f'/users/{user_id}', {'age': self.random.randint(18, 80)}, headers
+            )
+        self.user_ids.remove(user_id)
+        return operation, HTTPRequest.build_DELETE(f'/users/{user_id}', headers)
+    
+    def _send(self, request):
+        """
+        요청 하나 전송 → (상태 코드, 바디), 전송/수신 실패면 예외
+        
+        keep-alive를 끄거나 서버가 연결을 닫겠다고 하면 응답 후 연결을 닫습니다.
+        """
+        try:
+            status_code, body, keep_alive = self.connection.request(
+                request.to_string().encode('utf-8'), request.method
+            )
+        except BaseException:
+            self.connection.close()
+            raise
+        if not keep_alive or not self.options['keepalive']:
+            self.connection.close()
+        return status_code, body
+    
+    def execute(self, started, record):
+        """
+        요청 하나 실행 후 결과 기록
+        
+        Args:
+            started (float): 지연 시간 측정 시작 시각 (perf_counter, open-loop면 예정 시각)
+            record (bool): 결과를 기록할지 (워밍업 중이면 False)
+        """
+        operation, request = self._build(self.random.choices(self.names, self.weights)[0])
+        try:
+            status_code, body = self._send(request)
+        except socket.timeout:
+            error = 'timeout'
+        except ResponseError:
+            error = 'protocol'
+        except OSError:
+            error = 'connection'
+        else:
+            latency = time.perf_counter() - started
+            if operation == 'create' and status_code == 201:
+                try:
+                    self.user_ids.append(json.loads(body)['user']['id'])
+                except (ValueError, KeyError, TypeError):
+                    pass
+            if record:
+                self.latencies.setdefault(operation, []).append(latency)
+                self.status.setdefault(operation, Counter())[status_code] += 1
+                if status_code >= 400:
+                    self.errors[f'status_{status_code}'] += 1
+            return
+        if record:
+            self.errors[error] += 1
+    
+    def run_closed(self, measure_start, end):
+        """closed-loop: 응답을 받으면 바로 다음 요청"""
+        while True:
+            started = time.perf_counter()
+            if started >= end:
+                return
+            self.execute(started, started >= measure_start)
+    
+    def run_open(self, start, measure_start, end, interval, connections):
+        """
+        open-loop: 전체 요청 시각 start + i × interval 중 이 워커 몫(i ≡ index mod N)을 차례로 전송
+        
+        이전 응답이 늦어 예정 시각을 지났으면 바로 보내고, 지연 시간은 예정 시각부터 계산합니다.
+        """
+        slot = self.index
+        while True:
+            scheduled = start + slot * interval
+            if scheduled >= end:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.execute(scheduled, scheduled >= measure_start)
+            slot += connections
+    
+    def cleanup(self):
+        """측정 중 만든 사용자 삭제 (새 연결, 결과에 포함하지 않음)"""
+        self.connection.close()
+        headers = {'Host': self.host_header}
+        for user_id in self.user_ids:
+            try:
+                self._send(HTTPRequest.build_DELETE(f'/users/{user_id}', dict(headers)))
+            except OSError:
+                pass
+        self.user_ids = []
+        self.connection.close()
+
+
+def _run_process(options, first_index, connections, start_time):
+    """
+    프로세스 하나: 연결 connections개를 스레드로 실행 (전체 연결 번호는 first_index부터)
+    
+    Returns:
+        dict: 워커 결과를 합친 원본 기록 (지연 시간 목록, 상태 코드, 에러, 측정 시간)
+    """
+    workers = [_Worker(first_index + index, options) for index in range(connections)]
+    total_connections = options['connections']
+    
+    # 프로세스끼리 같은 시각에 시작하도록 벽시계 시각 → perf_counter 변환
+    start = time.perf_counter() + max(0.0, start_time - time.time())
+    measure_start = start + options['warmup']
+    end = measure_start + options['duration']
+    
+    if options['rate']:
+        interval = 1.0 / options['rate']
+        targets = [(worker.run_open, (start, measure_start, end, interval, total_connections))
+                   for worker in workers]
+    else:
+        targets = [(worker.run_closed, (measure_start, end)) for worker in workers]
+    threads = [threading.Thread(target=target, args=args, daemon=True) for target, args in targets]
+    
+    delay = start - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - measure_start
+    
+    result = {'latencies': {}, 'status': {}, 'errors': Counter(), 'elapsed': elapsed}
+    for worker in workers:
+        worker.cleanup()
+        for operation, latencies in worker.latencies.items():
+            result['latencies'].setdefault(operation, []).extend(latencies)
+        for operation, status in worker.status.items():
+            result['status'].setdefault(operation, Counter()).update(status)
+        result['errors'].update(worker.errors)
+    return result
+
+
+def _percentile(sorted_values, percent):
+    """nearest-rank 백분위수 (정렬된 리스트)"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _percentile_key(percent):
+    """50 → 'p50', 99.9 → 'p999'"""
+    return 'p' + f'{percent:g}'.replace('.', '')
+
+
+def _summarize(latencies, errors, elapsed):
+    """지연 시간 목록 → 요청 수, RPS, 지연 시간 통계 (ms)"""
+    values = sorted(latencies)
+    summary = {
+        'requests': len(values),
+        'errors': errors,
+        'rps': round(len(values) / elapsed, 2) if elapsed > 0 else 0.0,
+        'latency_ms': None,
+    }
+    if values:
+        latency = {'mean': sum(values) / len(values)}
+        for percent in BENCH_PERCENTILES:
+            latency[_percentile_key(percent)] = _percentile(values, percent)
+        latency['max'] = values[-1]
+        summary['latency_ms'] = {name: round(value * 1000, 3) for name, value in latency.items()}
+    return summary
+
+
+def run_bench(host=CLIENT_HOST, port=DEFAULT_PORT, connections=DEFAULT_BENCH_CONNECTIONS,
+              duration=DEFAULT_BENCH_DURATION, warmup=DEFAULT_BENCH_WARMUP, mix=DEFAULT_BENCH_MIX,
+              rate=None, keepalive=True, processes=1, timeout=BENCH_TIMEOUT,
+              static_path=DEFAULT_BENCH_STATIC_PATH, list_path=DEFAULT_BENCH_LIST_PATH, seed=1):
+    """
+    벤치마크 실행
+    
+    Args:
+        host (str): 서버 호스트
+        port (int): 서버 포트
+        connections (int): 동시 연결 수 (전체)
+        duration (float): 측정 시간 (초)
+        warmup (float): 측정 전 워밍업 시간 (초)
+        mix (str): 요청 종류별 가중치 ('static=30,list=30,...')
+        rate (float): open-loop 전체 요청률 (초당 요청 수, None이면 closed-loop)
+        keepalive (bool): 연결 재사용 여부
+        processes (int): 연결을 나눠 실행할 프로세스 수
+        timeout (float): 응답 대기 제한 시간 (초)
+        static_path (str): 'static' 요청 경로
+        list_path (str): 'list' 요청 경로
+        seed (int): 요청 순서 난수 시드 (같은 시드면 같은 요청 순서)
+    
+    Returns:
+        dict: 설정, 전체 요약, 종류별 요약, 에러 종류별 개수 (JSON으로 저장 가능)
+    """
+    if connections < 1 or processes < 1:
+        raise ValueError('connections and processes must be >= 1')
+    processes = min(processes, connections)
+    config = {
+        'host': host, 'port': port, 'connections': connections, 'duration': duration,
+        'warmup': warmup, 'mix': mix, 'mode': 'open' if rate else 'closed', 'rate': rate,
+        'keepalive': keepalive, 'processes': processes, 'timeout': timeout,
+        'static_path': static_path, 'list_path': list_path, 'seed': seed,
+    }
+    options = dict(config, mix=parse_mix(mix))
+    
+    # 연결을 프로세스에 고르게 나눔 (프로세스 시작 시간을 고려해 조금 뒤에 함께 시작)
+    shares = [connections // processes + (1 if index < connections % processes else 0)
+              for index in range(processes)]
+    firsts = [sum(shares[:index]) for index in range(processes)]
+    start_time = time.time() + 0.2 + 0.1 * processes
+    if processes == 1:
+        parts = [_run_process(options, 0, connections, start_time)]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(_run_process, options, first, share, start_time)
+                       for first, share in zip(firsts, shares)]
+            parts = [future.result() for future in futures]
+    
+    latencies = {}
+    status = {}
+    errors = Counter()
+    for part in parts:
+        for operation, values in part['latencies'].items():
+            latencies.setdefault(operation, []).extend(values)
+        for operation, counts in part['status'].items():
+            status.setdefault(operation, Counter()).update(counts)
+        errors.update(part['errors'])
+    elapsed = max(part['elapsed'] for part in parts)
+    
+    operations = {}
+    for operation in BENCH_OPERATIONS:
+        if operation not in latencies:
+            continue
+        counts = status[operation]
+        summary = _summarize(latencies[operation], sum(n for code, n in counts.items() if code >= 400), elapsed)
+        summary['status'] = {str(code): n for code, n in sorted(counts.items())}
+        operations[operation] = summary
+    
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'config': config,
+        'elapsed': round(elapsed, 3),
+        'summary': _summarize(all_latencies, sum(errors.values()), elapsed),
+        'operations': operations,
+        'errors': dict(sorted(errors.items())),
+    }
+
+
+def compare(result, baseline, tolerance=DEFAULT_BENCH_TOLERANCE):
+    """
+    이전 결과와 비교해 허용 범위를 넘게 나빠진 항목 찾기
+    
+    - RPS가 (1 - tolerance)배 미만
+    - p50 / p99 지연 시간이 (1 + tolerance)배 초과
+    - 에러 수 증가
+    
+    Returns:
+        list: (항목, 기준값, 현재값, 나빠졌는지) 목록 (전체 + 양쪽에 있는 요청 종류)
+    """
+    rows = []
+    sections = [('all', result['summary'], baseline['summary'])]
+    sections += [(operation, summary, baseline['operations'][operation])
+                 for operation, summary in result['operations'].items()
+                 if operation in baseline.get('operations', {})]
+    for name, current, previous in sections:
+        rows.append((f'{name} rps', previous['rps'], current['rps'],
+                     current['rps'] < previous['rps'] * (1 - tolerance)))
+        for key in ('p50', 'p99'):
+            if current['latency_ms'] and previous['latency_ms']:
+                before, after = previous['latency_ms'][key], current['latency_ms'][key]
+                rows.append((f'{name} {key} ms', before, after, after > before * (1 + tolerance)))
+        rows.append((f'{name} errors', previous['errors'], current['errors'],
+                     current['errors'] > previous['errors']))
+    return rows
+
+
+def print_report(result):
+    """결과 표 출력"""
+    config = result['config']
+    mode = f"open-loop {config['rate']:g} req/s" if config['mode'] == 'open' else 'closed-loop'
+    keepalive = 'keep-alive' if config['keepalive'] else '요청마다 새 연결'
+    print("=" * 78)
+    print(f"📊 {config['host']}:{config['port']}  연결 {config['connections']}개, "
+          f"{mode}, {keepalive}, {result['elapsed']:.1f}초")
+    print("=" * 78)
+    
+    columns = ['mean'] + [_percentile_key(percent) for percent in BENCH_PERCENTILES] + ['max']
+    print(f"{'종류':<8}{'요청':>9}{'에러':>7}{'RPS':>10}" + ''.join(f'{name:>8}' for name in columns))
+    rows = list(result['operations'].items()) + [('all', result['summary'])]
+    for name, summary in rows:
+        latency = summary['latency_ms'] or {}
+        values = ''.join(f"{latency.get(column, 0):>8.2f}" for column in columns)
+        print(f"{name:<8}{summary['requests']:>9}{summary['errors']:>7}{summary['rps']:>10.1f}{values}")
+    print("(지연 시간 단위: ms)")
+    
+    if result['errors']:
+        print("\n❌ 에러: " + ', '.join(f'{kind} {count}' for kind, count in result['errors'].items()))
+    print()
+
+
+def parse_args(argv=None):
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description='HTTP 서버 부하 생성기 (벤치마크)')
+    parser.add_argument('--host', default=CLIENT_HOST, help='서버 호스트')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='서버 포트')
+    parser.add_argument('--connections', '-c', type=int, default=DEFAULT_BENCH_CONNECTIONS,
+                        help='동시 연결 수')
+    parser.add_argument('--duration', '-d', type=float, default=DEFAULT_BENCH_DURATION,
+                        help='측정 시간 (초)')
+    parser.add_argument('--warmup', type=float, default=DEFAULT_BENCH_WARMUP,
+                        help='측정 전 워밍업 시간 (초, 결과에서 제외)')
+    parser.add_argument('--mix', default=DEFAULT_BENCH_MIX,
+                        help=f"요청 종류별 가중치 (종류: {', '.join(BENCH_OPERATIONS)})")
+    parser.add_argument('--rate', type=float, default=None,
+                        help='open-loop 전체 요청률 (초당 요청 수, 지정하지 않으면 closed-loop)')
+    parser.add_argument('--no-keepalive', dest='keepalive', action='store_false',
+                        help='요청마다 새 연결 (Connection: close)')
+    parser.add_argument('--processes', '-p', type=int, default=1,
+                        help='연결을 나눠 실행할 프로세스 수 (부하 생성기의 GIL 한계 회피)')
+    parser.add_argument('--timeout', type=float, default=BENCH_TIMEOUT,
+                        help='응답 대기 제한 시간 (초)')
+    parser.add_argument('--static-path', default=DEFAULT_BENCH_STATIC_PATH,
+                        help="'static' 요청 경로")
+    parser.add_argument('--list-path', default=DEFAULT_BENCH_LIST_PATH,
+                        help="'list' 요청 경로")
+    parser.add_argument('--seed', type=int, default=1, help='요청 순서 난수 시드')
+    parser.add_argument('--output', '-o', default=None, help='결과를 저장할 JSON 파일')
+    parser.add_argument('--compare', default=None,
+                        help='비교할 이전 결과 JSON 파일 (나빠진 항목이 있으면 종료 코드 1)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_BENCH_TOLERANCE,
+                        help='비교 허용 범위 (0.1 = 10%%)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """벤치마크 실행 → 결과 출력 / 저장 / 비교 (종료 코드 반환)"""
+    args = parse_args(argv)
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        print(f"❌ 잘못된 --mix: {e}")
+        return 2
+    
+    mode = f'open-loop {args.rate:g} req/s' if args.rate else 'closed-loop'
+    print(f"🏁 벤치마크: http://{args.host}:{args.port} 연결 {args.connections}개, {mode}, "
+          f"워밍업 {args.warmup:g}초 + 측정 {args.duration:g}초")
+    result = run_bench(
+        args.host, args.port, args.connections, args.duration, args.warmup, args.mix,
+        args.rate, args.keepalive, args.processes, args.timeout,
+        args.static_path, args.list_path, args.seed
+    )
+    print_report(result)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare(result, baseline, args.tolerance)
+        print(f"\n🔍 비교: {args.compare} (허용 범위 {args.tolerance:.0%})")
+        for name, before, after, regressed in rows:
+            change = f'{(after - before) / before:+.1%}' if before else ''
+            mark = '❌' if regressed else '  '
+            print(f"{mark} {name:<22}{before:>12.2f} → {after:>12.2f} {change:>8}")
+        regressions = [row for row in rows if row[3]]
+        if regressions:
+            print(f"\n❌ 성능 저하 {len(regressions)}건")
+            return 1
+        print("\n✅ 허용 범위 안")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+사용자 데이터 동시성 스트레스 테스트
+여러 스레드에서 HTTPHandler를 동시에 호출하여 사용자 데이터가 깨지지 않는지 확인합니다.
+
+- 생성 스레드: POST /users를 반복 → 발급된 ID가 중복되지 않아야 함
+- 수정 스레드: 같은 사용자를 스레드마다 다른 필드로 PATCH → 어떤 수정도 사라지지 않아야 함
+- 읽기 스레드: GET /users를 반복 → 항상 올바른 JSON, 목록 안에 ID 중복 없음
+- 종료 후 디스크에서 다시 읽은 데이터가 메모리 상태와 같아야 함
+- 큰 저장소: 사용자가 많아도 쓰기(POST/PATCH/DELETE) 한 번의 시간이 작은 저장소와 비슷해야 함
+  (copy-on-write가 전체 데이터를 복사하면 사용자 수에 비례해 느려짐)
+- 검사에 실패하면 AssertionError (명령줄 실행은 실패 내용을 출력하고 종료 코드 1)
+
+실행: python client/StressTest.py [--threads N] [--iterations N] [--durability sync] [--large-users N]
+(임시 디렉토리에서 실행하므로 server/data/users.json은 변경되지 않음)
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.HTTPConstants import DURABILITY_MODES, DEFAULT_DURABILITY
+from server.HTTPHandler import HTTPHandler
+
+
+def _request(handler, method, path, data=None):
+    """핸들러 직접 호출 (바디는 서버와 같이 바이트로 전달)"""
+    body = b'' if data is None else json.dumps(data).encode('utf-8')
+    response = handler.handle_request(method, path, {}, body)
+    return response.status_code, response.body
+
+
+def run(threads, iterations, durability):
+    """
+    스트레스 테스트 실행
+    
+    Args:
+        threads (int): 종류별 스레드 수 (생성/수정/읽기 각각)
+        iterations (int): 스레드당 요청 수
+        durability (str): 사용자 데이터 저장 모드
+    
+    Raises:
+        AssertionError: ID 중복, 잃어버린 수정, 잘못된 응답, 복구 데이터 불일치
+    """
+    data_dir = tempfile.mkdtemp(prefix='user-stress-')
+    # 요청 스레드에서 발견한 문제 (스레드 안에서 발생한 AssertionError는 호출한 쪽에 전달되지 않음)
+    errors = []
+    errors_lock = threading.Lock()
+    
+    def fail(message):
+        with errors_lock:
+            errors.append(message)
+    
+    try:
+        handler = HTTPHandler(data_dir, durability=durability, flush_interval=0.05)
+        status, body = _request(handler, 'POST', '/users', {'name': 'shared'})
+        shared_id = json.loads(body)['user']['id']
+        
+        created_ids = [[] for _ in range(threads)]
+        start = threading.Barrier(threads * 3)
+        stop_readers = threading.Event()
+        
+        def creator(index):
+            start.wait()
+            for i in range(iterations):
+                status, body = _request(handler, 'POST', '/users', {'name': f'c{index}-{i}'})
+                if status != 201:
+                    fail(f'POST 실패: {status} {body}')
+                    continue
+                created_ids[index].append(json.loads(body)['user']['id'])
+        
+        def patcher(index):
+            start.wait()
+            for i in range(iterations):
+                status, body = _request(handler, 'PATCH', f'/users/{shared_id}', {f'p{index}': i})
+                if status != 200:
+                    fail(f'PATCH 실패: {status} {body}')
+        
+        def reader(index):
+            start.wait()
+            while not stop_readers.is_set():
+                status, body = _request(handler, 'GET', '/users')
+                try:
+                    ids = [user['id'] for user in json.loads(body)['users']]
+                except (ValueError, KeyError) as e:
+                    fail(f'GET 응답 오류: {e}')
+                    continue
+                if status != 200 or len(ids) != len(set(ids)):
+                    fail(f'GET 목록 오류: status={status}, 중복 ID 포함')
+        
+        writers = [threading.Thread(target=creator, args=(i,)) for i in range(threads)]
+        writers += [threading.Thread(target=patcher, args=(i,)) for i in range(threads)]
+        readers = [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+        for thread in writers + readers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop_readers.set()
+        for thread in readers:
+            thread.join()
+        
+        assert not errors, '\n'.join(errors[:20])
+        
+        # 1. 발급된 ID 중복 검사
+        all_ids = [user_id for ids in created_ids for user_id in ids]
+        assert len(all_ids) == len(set(all_ids)), f'중복 ID 발급: {len(all_ids) - len(set(all_ids))}개'
+        assert len(all_ids) == threads * iterations, f'생성 수 불일치: {len(all_ids)} != {threads * iterations}'
+        
+        # 2. 잃어버린 수정 검사 (모든 스레드의 마지막 값이 남아 있어야 함)
+        expected = {f'p{i}': iterations - 1 for i in range(threads)}
+        shared = handler.store.get(shared_id)
+        lost = {key: shared.get(key) for key, value in expected.items() if shared.get(key) != value}
+        assert not lost, f'잃어버린 수정: {lost}'
+        
+        # 3. 디스크에서 다시 읽은 상태가 메모리와 같은지 검사
+        in_memory = handler.store.list_users()
+        handler.close()
+        reopened = HTTPHandler(data_dir, durability=durability)
+        recovered = reopened.store.list_users()
+        reopened.close()
+        assert recovered == in_memory, '디스크에서 복구한 데이터가 메모리 상태와 다름'
+    
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def measure_writes(user_count, writes):
+    """
+    사용자 user_count명이 있는 저장소에서 POST → PATCH → DELETE 한 번의 평균 시간 측정
+    
+    Args:
+        user_count (int): 미리 넣어 둘 사용자 수 (스냅샷 파일로 직접 생성)
+        writes (int): 측정할 POST/PATCH/DELETE 반복 횟수
+    
+    Returns:
+        float: 반복 한 번(요청 3개)의 평균 시간 (ms)
+    """
+    data_dir = tempfile.mkdtemp(prefix='user-stress-large-')
+    try:
+        users = {
+            str(user_id): {'id': user_id, 'name': f'u{user_id}', 'email': f'u{user_id}@example.com',
+                           'age': user_id % 80}
+            for user_id in range(1, user_count + 1)
+        }
+        with open(os.path.join(data_dir, 'users.json'), 'w', encoding='utf-8') as f:
+            json.dump({'users': users, 'next_id': user_count + 1}, f)
+        del users
+        
+        handler = HTTPHandler(data_dir, flush_interval=3600)
+        started = time.perf_counter()
+        for i in range(writes):
+            status, body = _request(handler, 'POST', '/users', {'name': f'w{i}', 'age': i % 80})
+            assert status == 201, f'POST 실패: {status} {body}'
+            user_id = json.loads(body)['user']['id']
+            status, body = _request(handler, 'PATCH', f'/users/{user_id}', {'age': (i + 1) % 80})
+            assert status == 200, f'PATCH 실패: {status} {body}'
+            status, body = _request(handler, 'DELETE', f'/users/{user_id}')
+            assert status == 200, f'DELETE 실패: {status} {body}'
+        elapsed = time.perf_counter() - started
+        handler.close()
+        return elapsed / writes * 1000
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def run_large(user_count, writes=300, max_slowdown=10.0):
+    """
+    큰 저장소 쓰기 비용 검사 (사용자 1,000명 대비 user_count명일 때 몇 배 느린지)
+    
+    Returns:
+        float: 사용자 1,000명 대비 쓰기 시간 배율
+    
+    Raises:
+        AssertionError: 배율이 max_slowdown을 넘음
+    """
+    small = measure_writes(1000, writes)
+    large = measure_writes(user_count, writes)
+    print(f"📏 쓰기 3회(POST/PATCH/DELETE): 사용자 1,000명 {small:.3f}ms, "
+          f"{user_count:,}명 {large:.3f}ms ({large / small:.1f}배)")
+    assert large <= small * max_slowdown, \
+        f'큰 저장소에서 쓰기가 {large / small:.1f}배 느림 (허용 {max_slowdown:g}배)'
+    return large / small
+
+
+def parse_args():
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description='사용자 데이터 동시성 스트레스 테스트')
+    parser.add_argument('--threads', type=int, default=8,
+                        help='종류별(생성/수정/읽기) 스레드 수')
+    parser.add_argument('--iterations', type=int, default=200,
+                        help='스레드당 요청 수')
+    parser.add_argument('--durability', choices=DURABILITY_MODES, default=DEFAULT_DURABILITY,
+                        help='사용자 데이터 저장 모드')
+    parser.add_argument('--large-users', type=int, default=100000,
+                        help='쓰기 비용을 확인할 큰 저장소의 사용자 수 (0이면 건너뜀)')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    print(f"🔨 스트레스 테스트: 스레드 {args.threads}×3, 스레드당 {args.iterations}회, {args.durability}")
+    try:
+        run(args.threads, args.iterations, args.durability)
+        if args.large_users:
+            run_large(args.large_users)
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print("✅ ID 중복 없음, 잃어버린 수정 없음, 복구 데이터 일치, 큰 저장소 쓰기 비용 정상")
@@ -10,9 +10,19 @@ HTTP_METHODS = ['GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'PATCH']
 STATUS_CODES = {
     200: 'OK',
     201: 'Created',
+    202: 'Accepted',
+    206: 'Partial Content',
+    304: 'Not Modified',
     400: 'Bad Request',
+    403: 'Forbidden',
     404: 'Not Found',
-    500: 'Internal Server Error'
+    405: 'Method Not Allowed',
+    409: 'Conflict',
+    413: 'Payload Too Large',
+    416: 'Range Not Satisfiable',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable'
 }
 
 # HTTP 버전
@@ -28,5 +38,120 @@ DEFAULT_HOST = SERVER_HOST  # 서버에서 사용
 DEFAULT_PORT = 8080
 BUFFER_SIZE = 4096
 
+# 요청 크기 제한 (초과 시 431 / 413 응답)
+MAX_HEADER_SIZE = 16 * 1024        # 요청 라인 + 헤더 최대 크기 (bytes)
+MAX_BODY_SIZE = 1024 * 1024        # 바디 최대 크기 (bytes)
+
+# 워커 풀 설정 (스레드 수 제한 + 대기 큐 크기)
+DEFAULT_POOL_SIZE = 32
+DEFAULT_QUEUE_SIZE = 128
+# 종료 시 워커 스레드가 처리 중인 연결을 마치기를 기다리는 시간 (초, keep-alive 유휴 시간보다 길고 prefork의 SIGKILL 대기보다 짧게)
+POOL_SHUTDOWN_TIMEOUT = 8.0
+# 대기 큐가 가득 찼을 때의 처리 정책
+# - 'reject': 즉시 503 응답 후 연결 종료 (부하 차단)
+# - 'drop': 응답 없이 연결 종료
+# - 'block': 큐에 자리가 날 때까지 accept 스레드 대기
+REJECT_POLICIES = ['reject', 'drop', 'block']
+DEFAULT_REJECT_POLICY = 'reject'
+
+# HTTP/1.1 지속 연결 (keep-alive) 설정
+# 유휴 연결을 닫기까지의 시간 (초)
+DEFAULT_KEEPALIVE_TIMEOUT = 5
+# 한 연결에서 처리할 최대 요청 수
+DEFAULT_MAX_KEEPALIVE_REQUESTS = 100
+
+# 사용자 데이터 저장소 (UserStore) 설정
+# - 'async': 변경 사항을 메모리에 반영하고 flush 주기마다 백그라운드에서 로그를 디스크에 기록
+# - 'sync': 변경할 때마다 응답 전에 로그를 디스크에 기록 (동시 요청은 fsync 한 번으로 묶음)
+DURABILITY_MODES = ['async', 'sync']
+DEFAULT_DURABILITY = 'async'
+# 'async' 모드의 파일 저장 주기 (초)
+DEFAULT_FLUSH_INTERVAL = 1.0
+# 쓰기 전 로그(users.json.wal)가 이 크기를 넘으면 스냅샷(users.json)으로 압축 (bytes)
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024
+# GET /users 조회 조건용 보조 인덱스를 만들 필드 (인덱스가 없는 필드는 전체 검사)
+DEFAULT_INDEX_FIELDS = ['name', 'email', 'age']
+
+# GET /users 페이지 조회 (?limit=&cursor=)
+# cursor만 지정했을 때의 페이지 크기 / 한 페이지 최대 크기
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+# 스트리밍 응답(?stream=1)에서 청크 하나로 묶어 보낼 크기 (bytes)
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# 정적 파일 캐시 (StaticFileCache)
+STATIC_CACHE_SIZE = 32 * 1024 * 1024         # 캐시할 파일 내용의 총 크기 (bytes)
+STATIC_CACHE_MAX_FILE_SIZE = 1024 * 1024     # 내용을 캐시할 파일 하나의 최대 크기 (초과 시 헤더만 캐시)
+STATIC_CACHE_MAX_ENTRIES = 4096              # 캐시 항목 최대 개수
+STATIC_REVALIDATE_INTERVAL = 1.0             # 파일 변경(mtime/크기)을 다시 확인하는 주기 (초)
+MAX_RANGES = 16                              # Range 요청 하나의 최대 구간 수 (초과 시 Range 무시 → 전체 전송)
+
+# gzip 응답 압축 (Accept-Encoding: gzip)
+DEFAULT_GZIP_LEVEL = 6                       # 압축 레벨 (1: 빠름 ~ 9: 작음, 0이면 압축하지 않음)
+GZIP_MIN_SIZE = 1024                         # 동적 응답을 압축할 최소 크기 (bytes, 작은 응답은 압축 이득이 적음)
+# 압축할 Content-Type (접두사, 이미지 등 이미 압축된 형식은 제외)
+GZIP_CONTENT_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+# 서버 엔진 선택
+# - 'thread': 워커 풀 기반 블로킹 서버 (HTTPServer)
+# - 'eventloop': selectors(epoll) 기반 단일 스레드 논블로킹 서버 (EventLoopServer)
+SERVER_ENGINES = ['thread', 'eventloop']
+DEFAULT_ENGINE = 'thread'
+# 이벤트 루프 서버에서 블로킹 핸들러 작업(파일 I/O)을 실행할 스레드 수
+DEFAULT_EXECUTOR_WORKERS = 4
+
+# 멀티 프로세스(prefork) 모드 (--workers N)
+# 워커 프로세스마다 SO_REUSEPORT 리스닝 소켓을 열고, 사용자 데이터는 데이터 프로세스 하나가 담당
+DEFAULT_WORKERS = 1                  # 1이면 단일 프로세스로 실행
+WORKER_RESTART_DELAY = 1.0           # 시작 직후 종료된 워커를 다시 띄우기 전 대기 시간 (초, 재시작 폭주 방지)
+WORKER_MAX_FAST_EXITS = 5            # 시작 직후 종료가 연속으로 이 횟수만큼 반복되면 재시작 중단
+WORKER_SHUTDOWN_TIMEOUT = 10.0       # 종료 신호 후 워커가 끝나기를 기다리는 시간 (초, 초과 시 SIGKILL)
+DATA_PROCESS_START_TIMEOUT = 60.0    # 데이터 프로세스가 복구를 마치고 준비되기를 기다리는 시간 (초)
+
+# 접근 로그 (AccessLogger, 백그라운드 스레드가 기록)
+# - 'error': 에러만 / 'info': 에러 + 요청마다 접근 로그 한 줄 / 'debug': 연결 수락·종료까지
+LOG_LEVELS = ['error', 'info', 'debug']
+DEFAULT_LOG_LEVEL = 'info'
+# - 'text': 한 줄 텍스트 / 'json': 한 줄에 JSON 객체 하나 (수집 도구용)
+LOG_FORMATS = ['text', 'json']
+DEFAULT_LOG_FORMAT = 'text'
+DEFAULT_LOG_SAMPLE_RATE = 1.0        # 기록할 접근 로그 비율 (0~1, 에러는 항상 기록)
+LOG_QUEUE_SIZE = 10000               # 기록 대기 큐 크기 (가득 차면 요청 스레드를 막지 않고 버림)
+LOG_BATCH_SIZE = 256                 # 기록 스레드가 한 번에 모아 쓰는 최대 항목 수
+
+# 서버 메트릭 (Prometheus 텍스트 형식)
+METRICS_PATH = '/_metrics'           # 예약 경로 (GET이면 핸들러/정적 파일보다 먼저 처리)
+# 처리 시간 히스토그램 버킷 경계 (초)
+METRICS_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# prefork 워커가 다른 워커와 합산할 수 있도록 자기 메트릭을 공유 디렉토리에 쓰는 주기 (초)
+METRICS_SHARE_INTERVAL = 1.0
+
+# 느린 요청 로그: 수신부터 전송 완료까지 이 시간(초)을 넘은 요청은 단계별 시간과 함께 기록 (0이면 끔)
+SLOW_REQUEST_THRESHOLD = 1.0
+
+# 실행 중 프로파일러 (SIGUSR1 또는 GET /_profile?seconds=N&mode=stack → 결과는 GET /_profile/<파일 이름>)
+PROFILE_PATH = '/_profile'           # 예약 경로 (--profile-token을 지정했을 때만 사용 가능)
+# - 'stack': 요청 처리 중인 스레드의 스택 샘플링 → collapsed stack (flamegraph 입력)
+# - 'cprofile': 요청마다 cProfile로 측정해 합산 → pstats 덤프
+PROFILE_MODES = ['stack', 'cprofile']
+DEFAULT_PROFILE_MODE = 'stack'
+DEFAULT_PROFILE_SECONDS = 10         # 신호로 시작했을 때의 프로파일링 시간 (초)
+PROFILE_MAX_SECONDS = 60             # /_profile로 요청할 수 있는 최대 시간 (초)
+PROFILE_SAMPLE_INTERVAL = 0.005      # 'stack' 모드의 스택 수집 주기 (초)
+
+# 부하 생성기 (client/Bench.py)
+# - 'static': GET 정적 파일, 'list': GET 사용자 목록
+# - 'create' / 'update' / 'patch' / 'delete': POST / PUT / PATCH / DELETE (연결마다 자기가 만든 사용자만 수정·삭제)
+BENCH_OPERATIONS = ['static', 'list', 'create', 'update', 'patch', 'delete']
+DEFAULT_BENCH_MIX = 'static=30,list=30,create=10,update=10,patch=10,delete=10'   # 종류=가중치
+DEFAULT_BENCH_STATIC_PATH = '/index.html'
+DEFAULT_BENCH_LIST_PATH = '/users?limit=20'
+DEFAULT_BENCH_CONNECTIONS = 16
+DEFAULT_BENCH_DURATION = 10.0        # 측정 시간 (초)
+DEFAULT_BENCH_WARMUP = 1.0           # 측정 전 워밍업 시간 (초, 결과에서 제외)
+BENCH_TIMEOUT = 10.0                 # 응답 대기 제한 시간 (초)
+BENCH_PERCENTILES = (50, 90, 99, 99.9)
+DEFAULT_BENCH_TOLERANCE = 0.1        # 비교 기준 대비 허용 범위 (0.1 = 처리량 10% 감소 / 지연 시간 10% 증가까지)
+
 # CRLF (줄바꿈)
 CRLF = '\r\n'
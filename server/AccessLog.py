@@ -0,0 +1,182 @@
+"""
+접근 로그 모듈
+요청 처리 스레드 대신 백그라운드 스레드가 로그를 기록합니다.
+
+- 요청 스레드는 로그 항목(튜플)을 큐에 넣기만 함 (포맷팅과 stdout/파일 I/O는 기록 스레드에서)
+- 큐가 가득 차면 기다리지 않고 항목을 버림 (버린 개수는 종료 시 기록)
+- 기록 스레드는 쌓인 항목을 모아 한 번에 write + flush
+- 출력 수준(error / info / debug), 접근 로그 샘플링 비율, 출력 형식(text / json) 설정
+- 느린 요청 로그: 임계값을 넘은 요청의 단계별 처리 시간 (에러처럼 항상 기록)
+"""
+
+import sys
+import os
+import json
+import time
+import queue
+import random
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.HTTPConstants import (
+    LOG_LEVELS, DEFAULT_LOG_LEVEL, DEFAULT_LOG_FORMAT, DEFAULT_LOG_SAMPLE_RATE,
+    LOG_QUEUE_SIZE, LOG_BATCH_SIZE
+)
+
+# 큐 항목 종류
+_ACCESS = 'access'
+_ERROR = 'error'
+_EVENT = 'debug'
+_SLOW = 'slow'
+
+
+def _format_client(client_address):
+    """클라이언트 주소 → 'host:port'"""
+    if isinstance(client_address, tuple) and len(client_address) >= 2:
+        return f'{client_address[0]}:{client_address[1]}'
+    return str(client_address)
+
+
+class AccessLogger:
+    """큐 기반 비동기 로거 (서버마다 하나, 기록 스레드 하나)"""
+    
+    def __init__(self, level=DEFAULT_LOG_LEVEL, log_format=DEFAULT_LOG_FORMAT,
+                 sample_rate=DEFAULT_LOG_SAMPLE_RATE, stream=None, queue_size=LOG_QUEUE_SIZE):
+        """
+        Args:
+            level (str): 출력 수준
+                         'error': 에러만 / 'info': 에러 + 접근 로그 / 'debug': 연결 수락·종료까지
+            log_format (str): 'text' (한 줄 텍스트) 또는 'json' (한 줄에 JSON 객체 하나)
+            sample_rate (float): 기록할 접근 로그 비율 (0~1, 에러는 항상 기록)
+            stream: 출력 대상 (기본값: sys.stdout)
+            queue_size (int): 기록 대기 큐 크기 (가득 차면 새 항목을 버림)
+        """
+        rank = LOG_LEVELS.index(level)
+        self.access_enabled = rank >= LOG_LEVELS.index('info') and sample_rate > 0
+        self.debug_enabled = rank >= LOG_LEVELS.index('debug')
+        self.log_format = log_format
+        self.sample_rate = sample_rate
+        self.stream = stream or sys.stdout
+        self.dropped = 0    # 큐가 가득 차서 버린 항목 수 (여러 스레드가 갱신하므로 근사값)
+        
+        self._queue = queue.Queue(queue_size)
+        self._writer = threading.Thread(target=self._run, name='access-log-writer', daemon=True)
+        self._writer.start()
+    
+    def access(self, client_address, method, path, version, status_code, size, latency):
+        """
+        요청 하나의 접근 로그 (info 수준, sample_rate 비율만 기록)
+        
+        Args:
+            client_address: 클라이언트 주소
+            method (str): HTTP 메소드
+            path (str): 요청 경로 (쿼리 문자열 포함)
+            version (str): HTTP 버전
+            status_code (int): 응답 상태 코드
+            size (int): 응답 바디 크기 (bytes, 길이를 미리 알 수 없는 스트리밍 응답은 None)
+            latency (float): 요청 처리 시간 (초)
+        """
+        if not self.access_enabled:
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        self._put((_ACCESS, time.time(), client_address, method, path, version, status_code, size, latency))
+    
+    def slow_request(self, client_address, method, path, status_code, phases, total_ns):
+        """
+        느린 요청의 단계별 처리 시간 (출력 수준·샘플링과 관계없이 항상 기록)
+        
+        Args:
+            client_address: 클라이언트 주소
+            method (str): HTTP 메소드
+            path (str): 요청 경로
+            status_code (int): 응답 상태 코드
+            phases (dict): 단계 이름 → 시간 (ns)
+            total_ns (int): 수신부터 전송 완료까지의 시간 (ns)
+        """
+        self._put((_SLOW, time.time(), client_address, method, path, status_code, phases, total_ns))
+    
+    def error(self, message):
+        """에러 / 경고 메시지 (항상 기록)"""
+        self._put((_ERROR, time.time(), message))
+    
+    def event(self, message):
+        """연결 수락·종료 같은 상세 메시지 (debug 수준에서만 기록)"""
+        if self.debug_enabled:
+            self._put((_EVENT, time.time(), message))
+    
+    def _put(self, item):
+        """큐에 항목 추가 (가득 차 있으면 기다리지 않고 버림)"""
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+    
+    def close(self):
+        """남은 항목을 모두 기록하고 기록 스레드 종료"""
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+    
+    def _run(self):
+        """기록 스레드: 항목이 오면 쌓인 항목까지 최대 LOG_BATCH_SIZE개를 모아 한 번에 기록"""
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < LOG_BATCH_SIZE:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            stopping = None in batch
+            lines = [self._format(item) for item in batch if item is not None]
+            if stopping and self.dropped:
+                lines.append(self._format((_ERROR, time.time(), f'⚠️  로그 큐 초과로 버린 항목: {self.dropped}개')))
+            self._write(''.join(lines))
+            if stopping:
+                return
+    
+    def _write(self, text):
+        """출력 (출력 대상 에러로 기록 스레드가 멈추지 않도록 무시)"""
+        if not text:
+            return
+        try:
+            self.stream.write(text)
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+    
+    def _format(self, item):
+        """항목 → 출력 한 줄 (줄바꿈 포함)"""
+        kind, timestamp = item[0], item[1]
+        if kind == _ACCESS:
+            _, _, client_address, method, path, version, status_code, size, latency = item
+            if self.log_format == 'json':
+                return json.dumps({
+                    'time': timestamp, 'client': _format_client(client_address),
+                    'method': method, 'path': path, 'version': version,
+                    'status': status_code, 'bytes': size, 'latency_ms': round(latency * 1000, 3)
+                }, ensure_ascii=False) + '\n'
+            clock = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+            size_text = '-' if size is None else size
+            return (f'[{clock}] {_format_client(client_address)} "{method} {path} {version}" '
+                    f'{status_code} {size_text} {latency * 1000:.2f}ms\n')
+        
+        if kind == _SLOW:
+            _, _, client_address, method, path, status_code, phases, total_ns = item
+            if self.log_format == 'json':
+                return json.dumps({
+                    'time': timestamp, 'level': kind, 'client': _format_client(client_address),
+                    'method': method, 'path': path, 'status': status_code,
+                    'total_ms': round(total_ns / 1e6, 3),
+                    'phases_ms': {name: round(duration / 1e6, 3) for name, duration in phases.items()}
+                }, ensure_ascii=False) + '\n'
+            clock = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+            breakdown = ' '.join([f'{name}={duration / 1e6:.2f}ms' for name, duration in phases.items()])
+            return (f'[{clock}] 🐢 느린 요청 {total_ns / 1e6:.2f}ms {_format_client(client_address)} '
+                    f'"{method} {path}" {status_code} ({breakdown})\n')
+        
+        message = item[2]
+        if self.log_format == 'json':
+            return json.dumps({'time': timestamp, 'level': kind, 'message': message}, ensure_ascii=False) + '\n'
+        clock = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+        return f'[{clock}] {message}\n'
@@ -0,0 +1,88 @@
+"""
+응답 압축 모듈
+Accept-Encoding 협상과 gzip 압축 함수를 제공합니다.
+
+- 정적 파일: StaticFileCache가 압축본을 한 번만 만들어 보관 (또는 디스크의 .gz 파일 사용)
+- 동적 응답(/users): 크기가 GZIP_MIN_SIZE 이상일 때만 압축, 스트리밍 응답은 청크 단위로 압축
+"""
+
+import sys
+import os
+import gzip
+import zlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.HTTPConstants import GZIP_CONTENT_TYPES
+from server.HTTPParser import get_header
+
+
+def accepts_gzip(headers):
+    """
+    Accept-Encoding 헤더로 gzip 응답을 받을 수 있는지 확인 (RFC 7231 5.3.4)
+    
+    - gzip;q=0 이면 거부, gzip이 없으면 *의 q 값을 따름
+    
+    Args:
+        headers (dict): 요청 헤더
+    
+    Returns:
+        bool: gzip 사용 가능 여부
+    """
+    accept_encoding = get_header(headers, 'Accept-Encoding')
+    if not accept_encoding:
+        return False
+    
+    gzip_q = None
+    any_q = None
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ('gzip', 'x-gzip'):
+            gzip_q = q
+        elif coding == '*':
+            any_q = q
+    
+    if gzip_q is not None:
+        return gzip_q > 0
+    return any_q is not None and any_q > 0
+
+
+def is_compressible(content_type):
+    """텍스트 계열(HTML, CSS, JS, JSON, SVG)인지 확인 (이미 압축된 이미지 등은 제외)"""
+    content_type = content_type.split(';')[0].strip().lower()
+    return content_type.startswith(GZIP_CONTENT_TYPES)
+
+
+def gzip_bytes(data, level):
+    """
+    bytes 전체를 gzip으로 압축
+    
+    mtime을 0으로 고정해 같은 입력이면 항상 같은 결과가 나오도록 합니다.
+    """
+    return gzip.compress(data, level, mtime=0)
+
+
+def gzip_stream(chunks, level):
+    """
+    bytes 조각들을 이어지는 하나의 gzip 스트림으로 압축 (전체를 메모리에 모으지 않음)
+    
+    Args:
+        chunks (iterable): 원본 bytes 조각들
+        level (int): 압축 레벨 (1~9)
+    
+    Yields:
+        bytes: 압축된 조각 (압축기가 아직 내보낼 데이터가 없으면 빈 bytes)
+    """
+    # wbits=31: gzip 헤더/트레일러 포함
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compressor.compress(chunk)
+    yield compressor.flush()
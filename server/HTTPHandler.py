@@ -6,18 +6,358 @@ HTTP 요청 처리 모듈
 import sys
 import os
 import json
+import base64
+import secrets
+from urllib.parse import parse_qsl
+from email.utils import parsedate_to_datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from server.HTTPResponse import HTTPResponse
+from common.HTTPConstants import (
+    HTTP_METHODS, DEFAULT_DURABILITY, DEFAULT_FLUSH_INTERVAL, DEFAULT_COMPACT_THRESHOLD, DEFAULT_INDEX_FIELDS,
+    DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, STREAM_CHUNK_SIZE,
+    STATIC_CACHE_SIZE, STATIC_REVALIDATE_INTERVAL, MAX_RANGES, DEFAULT_GZIP_LEVEL, GZIP_MIN_SIZE, CRLF
+)
+from server.HTTPResponse import HTTPResponse, FileBody
+from server.HTTPParser import get_header
+from server.UserStore import UserStore
+from server.StaticFileCache import StaticFileCache, StaticFile
+from server.UserIndex import index_key, sort_users
+from server.Compression import accepts_gzip, is_compressible, gzip_bytes, gzip_stream
+from server.Router import Router
+
+# GET /users 조회 조건의 범위 연산자 (예: age_gt=20 → age > 20)
+RANGE_OPERATORS = ('gt', 'gte', 'lt', 'lte')
+
+
+def _decode_body(body):
+    """
+    요청 바디를 문자열로 디코딩
+    
+    Args:
+        body (memoryview | bytes | str | None): 파서가 반환한 바디
+        
+    Returns:
+        str: UTF-8 디코딩된 바디
+    """
+    if body is None:
+        return ''
+    if isinstance(body, str):
+        return body
+    # memoryview도 중간 bytes 복사 없이 바로 디코딩
+    return str(body, 'utf-8')
+
+
+def _etag_matches(if_none_match, etag):
+    """
+    If-None-Match 헤더가 현재 ETag와 일치하는지 (약한 비교, RFC 7232 3.2)
+    
+    Args:
+        if_none_match (str): If-None-Match 헤더 값 (쉼표로 구분된 ETag 목록 또는 *)
+        etag (str): 현재 ETag
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    current = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+def _not_modified(headers, static_file):
+    """
+    조건부 요청 검사: 클라이언트가 가진 버전이 최신이면 True (304 응답)
+    
+    If-None-Match가 있으면 ETag만 비교하고, 없을 때만 If-Modified-Since를 비교합니다. (RFC 7232 6)
+    """
+    if_none_match = get_header(headers, 'If-None-Match')
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, static_file.etag)
+    
+    if_modified_since = get_header(headers, 'If-Modified-Since')
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False  # 잘못된 날짜는 무시
+    if since.tzinfo is None:
+        return False
+    return static_file.mtime <= since.timestamp()
+
+
+def _if_range_matches(headers, static_file):
+    """
+    If-Range 검사: 클라이언트가 받던 버전과 현재 파일이 같으면 True (Range 적용)
+    
+    ETag는 강한 비교(W/ 약한 ETag는 항상 불일치), 날짜는 Last-Modified와 정확히 같아야 합니다. (RFC 7233 3.2)
+    """
+    if_range = get_header(headers, 'If-Range')
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == static_file.etag
+    return if_range == static_file.last_modified
+
+
+def _parse_range(range_header, size):
+    """
+    Range 헤더 → 전송할 구간 리스트 (RFC 7233 2.1)
+    
+    - bytes=0-499 (처음부터), bytes=500- (끝까지), bytes=-500 (마지막 500 bytes)
+    - 겹치거나 맞닿은 구간은 하나로 합치고 파일 위치 순서로 정렬
+    
+    Args:
+        range_header (str): Range 헤더 값
+        size (int): 파일 크기 (bytes)
+    
+    Returns:
+        list: (시작, 끝) 구간 리스트 (끝 포함)
+              None → Range 무시하고 전체 전송 (형식 오류, 다른 단위, 구간이 너무 많음)
+              [] → 만족할 수 있는 구간 없음 (416)
+    """
+    unit, _, specs = range_header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        return None
+    specs = [spec.strip() for spec in specs.split(',') if spec.strip()]
+    if not specs or len(specs) > MAX_RANGES:
+        return None
+    
+    ranges = []
+    for spec in specs:
+        first, dash, last = spec.partition('-')
+        first, last = first.strip(), last.strip()
+        if not dash or not (first.isdigit() or first == '') or not (last.isdigit() or last == ''):
+            return None
+        if first == '':
+            if last == '':
+                return None
+            # 접미사 구간: 마지막 N bytes
+            suffix = int(last)
+            if suffix > 0 and size > 0:
+                ranges.append((max(size - suffix, 0), size - 1))
+            continue
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+    
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _byterange_parts(ranges, size, content_type, slice_of):
+    """
+    multipart/byteranges 바디 조각 생성 (RFC 7233 4.1)
+    
+    Args:
+        ranges (list): (시작, 끝) 구간 리스트 (2개 이상)
+        size (int): 파일 전체 크기
+        content_type (str): 원래 파일의 Content-Type
+        slice_of (callable): (시작, 길이) → 바디 조각 (bytes 또는 FileBody)
+    
+    Returns:
+        tuple: (바디 조각 리스트, 바디 전체 길이, Content-Type 헤더 값)
+    """
+    boundary = secrets.token_hex(16)
+    parts = []
+    length = 0
+    for index, (start, end) in enumerate(ranges):
+        # 첫 구분자 앞에는 빈 줄이 없고, 이후 구분자는 앞 구간 데이터 뒤의 CRLF 다음에 옴
+        separator = CRLF if index > 0 else ''
+        part_head = (
+            f'{separator}--{boundary}{CRLF}'
+            f'Content-Type: {content_type}{CRLF}'
+            f'Content-Range: bytes {start}-{end}/{size}{CRLF}{CRLF}'
+        ).encode('ascii')
+        parts.append(part_head)
+        parts.append(slice_of(start, end - start + 1))
+        length += len(part_head) + end - start + 1
+    tail = f'{CRLF}--{boundary}--{CRLF}'.encode('ascii')
+    parts.append(tail)
+    length += len(tail)
+    return parts, length, f'multipart/byteranges; boundary={boundary}'
+
+
+def _parse_user_id(segment):
+    """
+    경로의 사용자 ID 세그먼트 → 정수 (정수가 아니면 None → 400 'Invalid user ID')
+    
+    라우트는 ID를 문자열 세그먼트로 매칭하므로 /users/abc도 처리 함수까지 옵니다.
+    """
+    try:
+        return int(segment)
+    except ValueError:
+        return None
+
+
+def _parse_query_value(text):
+    """
+    쿼리 문자열 값 → 비교할 값 (숫자/true/false/null은 JSON으로 해석, 나머지는 문자열)
+    
+    숫자처럼 보이는 문자열과 비교하려면 따옴표로 감쌉니다. (예: name="123")
+    """
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return text
+    if isinstance(value, (list, dict)):
+        return text
+    return value
+
+
+def _encode_cursor(user_id):
+    """마지막으로 보낸 사용자 ID → 불투명 커서 문자열 (URL에 그대로 사용 가능)"""
+    data = json.dumps({'after': user_id}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor):
+    """커서 문자열 → 마지막으로 보낸 사용자 ID (잘못된 커서는 ValueError)"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        after_id = json.loads(data)['after']
+    except (ValueError, TypeError, KeyError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(after_id, int) or isinstance(after_id, bool):
+        raise ValueError('Invalid cursor')
+    return after_id
+
+
+def _parse_user_query(query_string):
+    """
+    GET /users 쿼리 문자열 파싱
+    
+    - 필드=값: 동등 비교 (예: name=Alice)
+    - 필드_gt / _gte / _lt / _lte=값: 범위 비교 (예: age_gt=20)
+    - sort=필드 / sort=-필드: 오름차순 / 내림차순 정렬
+    - fields=필드1,필드2: 응답에 포함할 필드만 선택
+    - limit=N / cursor=...: ID 순서 커서 페이지 조회 (응답의 next_cursor로 다음 페이지 요청)
+    - stream=1: Transfer-Encoding: chunked 스트리밍 응답
+    
+    Args:
+        query_string (str): '?' 뒤의 쿼리 문자열
+    
+    Returns:
+        dict: {'conditions', 'sort_field', 'descending', 'fields', 'limit', 'after_id', 'stream'}
+    
+    Raises:
+        ValueError: 잘못된 쿼리
+    """
+    query = {
+        'conditions': [],
+        'sort_field': None,
+        'descending': False,
+        'fields': None,
+        'limit': None,
+        'after_id': None,
+        'stream': False
+    }
+    
+    for name, value in parse_qsl(query_string, keep_blank_values=True):
+        if name == 'sort':
+            query['descending'] = value.startswith('-')
+            query['sort_field'] = value.lstrip('-')
+            if not query['sort_field']:
+                raise ValueError('Invalid sort field')
+        elif name == 'fields':
+            query['fields'] = [field for field in value.split(',') if field]
+            if not query['fields']:
+                raise ValueError('Invalid fields')
+        elif name == 'limit':
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError('Invalid limit')
+            query['limit'] = min(int(value), MAX_PAGE_LIMIT)
+        elif name == 'cursor':
+            query['after_id'] = _decode_cursor(value)
+        elif name == 'stream':
+            query['stream'] = value.lower() in ('1', 'true', 'yes')
+        else:
+            field, _, op = name.rpartition('_')
+            if not field or op not in RANGE_OPERATORS:
+                field, op = name, 'eq'
+            query['conditions'].append((field, op, index_key(_parse_query_value(value))))
+    
+    if query['after_id'] is not None and query['limit'] is None:
+        query['limit'] = DEFAULT_PAGE_LIMIT
+    if query['limit'] is not None and query['sort_field'] is not None:
+        # 커서는 ID 순서 기준이므로 다른 정렬과 함께 쓰면 페이지가 안정적이지 않음
+        raise ValueError('sort cannot be combined with limit/cursor')
+    return query
+
+
+def _iter_users_json(users, encode_user, next_cursor=None, paged=False):
+    """
+    사용자 목록 JSON을 STREAM_CHUNK_SIZE 단위 bytes 조각으로 생성
+    
+    전체 목록을 한 문자열로 만들지 않으므로 스트리밍 응답은 크기와 관계없이 메모리 사용량이 일정하고,
+    일반 응답은 조각을 join 한 번으로 이어 붙입니다.
+    
+    Args:
+        users (iterable): 사용자 딕셔너리
+        encode_user (callable): 사용자 딕셔너리 → JSON bytes
+        next_cursor (str): 페이지 조회의 다음 커서 (마지막 페이지면 None)
+        paged (bool): 페이지 조회 여부 (True면 next_cursor 필드 포함)
+    
+    Yields:
+        bytes: JSON 조각 (이어 붙이면 json.dumps({'users': [...]})와 같음)
+    """
+    parts = [b'{"users": [']
+    size = 0
+    separator = b''
+    for user in users:
+        fragment = encode_user(user)
+        parts.append(separator)
+        parts.append(fragment)
+        separator = b', '
+        size += len(fragment)
+        if size >= STREAM_CHUNK_SIZE:
+            yield b''.join(parts)
+            parts = []
+            size = 0
+    
+    parts.append(b']')
+    if paged:
+        parts.append(b', "next_cursor": ' + json.dumps(next_cursor).encode('utf-8'))
+    parts.append(b'}')
+    yield b''.join(parts)
 
 
 class HTTPHandler:
     """HTTP 요청을 처리하는 클래스"""
     
-    def __init__(self, data_dir=None):
+    # 라우트 테이블: 아래 @routes.route로 클래스 정의 시 한 번 등록 (이후 변경 없음)
+    routes = Router()
+    
+    def __init__(self, data_dir=None, durability=DEFAULT_DURABILITY, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 compact_threshold=DEFAULT_COMPACT_THRESHOLD, index_fields=DEFAULT_INDEX_FIELDS,
+                 static_cache_size=STATIC_CACHE_SIZE, static_revalidate_interval=STATIC_REVALIDATE_INTERVAL,
+                 gzip_level=DEFAULT_GZIP_LEVEL, gzip_min_size=GZIP_MIN_SIZE):
         """
         Args:
             data_dir (str): 데이터 파일이 저장된 디렉토리 경로 (기본값: 현재 파일 기준 data 디렉토리)
+            durability (str): 사용자 데이터 저장 모드 ('async', 'sync')
+            flush_interval (float): 'async' 모드의 로그 기록 주기 (초)
+            compact_threshold (int): 변경 로그를 스냅샷으로 압축할 크기 (bytes)
+            index_fields (list): GET /users 조회용 보조 인덱스를 만들 필드 목록
+            static_cache_size (int): 정적 파일 캐시 크기 (bytes)
+            static_revalidate_interval (float): 정적 파일 변경을 다시 확인하는 주기 (초)
+            gzip_level (int): gzip 압축 레벨 (1~9, 0이면 압축하지 않음)
+            gzip_min_size (int): 동적 응답을 압축할 최소 크기 (bytes)
         """
         if data_dir is None:
             # 현재 파일의 디렉토리를 기준으로 절대 경로 생성
@@ -27,60 +367,254 @@ class HTTPHandler:
         self.data_dir = data_dir
         self.static_dir = os.path.join(data_dir, 'static')
         self.users_file = os.path.join(data_dir, 'users.json')
+        
+        # 사용자 데이터는 시작 시 한 번만 읽고 이후 메모리에서 처리
+        self.store = self._open_store(durability, flush_interval, compact_threshold, index_fields)
+        
+        # 정적 파일은 내용과 응답 헤더를 캐시하고 변경 여부만 주기적으로 확인
+        self._static_root = os.path.normpath(self.static_dir) + os.sep
+        self.static_cache = StaticFileCache(
+            self._get_content_type, static_cache_size,
+            revalidate_interval=static_revalidate_interval, gzip_level=gzip_level
+        )
+        
+        # 응답 압축 (Accept-Encoding: gzip)
+        self.gzip_level = gzip_level
+        self.gzip_min_size = gzip_min_size
+    
+    def _open_store(self, durability, flush_interval, compact_threshold, index_fields):
+        """사용자 저장소 생성 (사용자 데이터를 다른 프로세스에 맡기는 처리기는 None 반환)"""
+        return UserStore(self.users_file, durability, flush_interval, compact_threshold, index_fields)
+    
+    def close(self):
+        """저장되지 않은 사용자 데이터 저장"""
+        if self.store is not None:
+            self.store.close()
     
     def handle_request(self, method, path, headers, body):
         """
-        요청 메소드에 따라 적절한 핸들러 호출
+        라우트 테이블로 처리 함수를 찾아 호출
+        
+        - 지원하지 않는 메소드 → 400
+        - 등록된 경로 + 메소드 → 처리 함수 (경로 파라미터는 키워드 인자로 전달)
+        - 등록된 경로 + 다른 메소드 → 405 (Allow 헤더에 허용 메소드)
+        - 등록되지 않은 경로의 GET/HEAD → 정적 파일
+        - 그 밖의 경로 → 404
         
         Args:
             method (str): HTTP 메소드
-            path (str): 요청 경로
+            path (str): 요청 경로 (쿼리 문자열 포함)
             headers (dict): 요청 헤더
-            body (str): 요청 바디
+            body (memoryview | bytes | str): 요청 바디
             
         Returns:
             HTTPResponse: 생성된 HTTP 응답 객체
         """
-        if method == 'GET':
-            return self.handle_GET(path)
-        elif method == 'HEAD':
-            return self.handle_HEAD(path)
-        elif method == 'POST':
-            return self.handle_POST(path, body)
-        elif method == 'PUT':
-            return self.handle_PUT(path, body)
-        elif method == 'DELETE':
-            return self.handle_DELETE(path)
-        elif method == 'PATCH':
-            return self.handle_PATCH(path, body)
-        else:
+        if method not in HTTP_METHODS:
             return HTTPResponse.create_400_response(f'Unsupported method: {method}')
+        
+        # 바디가 있는 메소드만 바이트 → 문자열 디코딩 (파서는 바디를 디코딩하지 않음)
+        if method in ('POST', 'PUT', 'PATCH'):
+            try:
+                body = _decode_body(body)
+            except UnicodeDecodeError:
+                return HTTPResponse.create_400_response('Invalid UTF-8 body')
+        
+        # 경로와 쿼리 문자열 분리 (라우팅은 경로만으로)
+        path, _, query_string = path.partition('?')
+        headers = headers or {}
+        if method == 'HEAD' and get_header(headers, 'Range') is not None:
+            # Range는 GET에만 적용 (RFC 7233 3.1)
+            headers = {key: value for key, value in headers.items() if key.lower() != 'range'}
+        
+        handler, params, allow = self.routes.resolve(method, path)
+        if handler is not None:
+            request = {
+                'method': method, 'path': path, 'query_string': query_string,
+                'headers': headers, 'body': body
+            }
+            response = handler(self, request, **params)
+            response.route = self.routes.patterns[handler]
+        elif allow is not None:
+            return HTTPResponse.create_405_response(allow)
+        elif method in ('GET', 'HEAD'):
+            response = self.serve_static(path, headers)
+            response.route = 'static'
+        else:
+            return HTTPResponse.create_404_response(f'Endpoint not found: {path}')
+        
+        if method == 'HEAD':
+            return self._strip_body(response)
+        return response
     
-    def handle_GET(self, path):
+    @routes.route('GET', '/users')
+    def list_users(self, request):
         """
-        GET 요청 처리: API 엔드포인트 및 정적 파일 자동 반환
+        GET /users: 사용자 목록 조회
+        
+        - GET /users → 전체 목록 (200)
+        - GET /users?name=Alice&age_gt=20&sort=-age&fields=id,name → 조건 조회 (200, 잘못된 쿼리는 400)
+        - GET /users?limit=50&cursor=... → 페이지 조회 (next_cursor 포함)
+        - GET /users?stream=1 → chunked 스트리밍 응답
+        - If-None-Match가 현재 ETag와 일치 → 304 (바디 없음, 조회/직렬화 생략)
+        - Accept-Encoding: gzip → gzip_min_size 이상이면 압축 응답
+        """
+        try:
+            # 데이터 버전 기반 ETag: 바뀐 것이 없으면 조회/직렬화 없이 304
+            etag = f'"{self.store.epoch}-{self.store.version}"'
+            validators = {'ETag': etag, 'Cache-Control': 'no-cache'}
+            if self.gzip_level > 0:
+                validators['Vary'] = 'Accept-Encoding'
+            if _etag_matches(get_header(request['headers'], 'If-None-Match'), etag):
+                return HTTPResponse.create_304_response(validators)
+            
+            if request['query_string']:
+                response = self._query_users(request['query_string'])
+            else:
+                # 사용자별 캐시된 JSON bytes를 이어 붙임 (변경되지 않은 사용자는 다시 직렬화하지 않음)
+                content = b''.join(_iter_users_json(self.store.iter_users(), self.store.fragment))
+                response = HTTPResponse.create_200_response(content, 'application/json')
+            if response.status_code == 200:
+                response.headers.update(validators)
+                self._compress_response(response, request['headers'])
+            return response
+        
+        except Exception as e:
+            return HTTPResponse.create_500_response(f'Server error: {str(e)}')
+    
+    @routes.route('POST', '/users')
+    def create_user(self, request):
+        """
+        POST /users: 새 사용자 생성
+        
+        - 올바른 JSON → 201 Created
+        - 잘못된 JSON → 400 Bad Request
+        """
+        try:
+            # JSON 파싱
+            user_data = json.loads(request['body'])
+            if not isinstance(user_data, dict):
+                return HTTPResponse.create_400_response('Invalid JSON format')
+            
+            # Auto Increment ID 생성 + 딕셔너리에 추가 (O(1))
+            user_data = self.store.create(user_data)
+            
+            # 201 Created 응답
+            response_body = json.dumps({'message': 'User created', 'user': user_data}, ensure_ascii=False)
+            return HTTPResponse.create_201_response(response_body)
+        
+        except json.JSONDecodeError:
+            return HTTPResponse.create_400_response('Invalid JSON format')
+        except Exception as e:
+            return HTTPResponse.create_500_response(f'Server error: {str(e)}')
+    
+    @routes.route('PUT', '/users/{user_id}')
+    def replace_user(self, request, user_id):
+        """
+        PUT /users/{user_id}: 사용자 전체 수정
+        
+        - PUT /users/1 (존재하는 사용자) → 200 OK
+        - PUT /users/999 (존재하지 않는 사용자) → 404 Not Found
+        - PUT /users/abc (정수가 아닌 ID) → 400 Bad Request
+        """
+        user_id = _parse_user_id(user_id)
+        if user_id is None:
+            return HTTPResponse.create_400_response('Invalid user ID')
+        
+        try:
+            # JSON 파싱
+            updated_data = json.loads(request['body'])
+            if not isinstance(updated_data, dict):
+                return HTTPResponse.create_400_response('Invalid JSON format')
+            
+            # 사용자 존재 확인 + 전체 교체 (O(1), ID 유지)
+            updated_data = self.store.replace(user_id, updated_data)
+            if updated_data is None:
+                return HTTPResponse.create_404_response(f'User not found: {user_id}')
+            
+            # 200 OK 응답
+            response_body = json.dumps({'message': 'User updated', 'user': updated_data}, ensure_ascii=False)
+            return HTTPResponse.create_200_response(response_body, 'application/json')
+        
+        except json.JSONDecodeError:
+            return HTTPResponse.create_400_response('Invalid JSON format')
+        except Exception as e:
+            return HTTPResponse.create_500_response(f'Server error: {str(e)}')
+    
+    @routes.route('PATCH', '/users/{user_id}')
+    def patch_user(self, request, user_id):
+        """
+        PATCH /users/{user_id}: 사용자 부분 수정
+        
+        - PATCH /users/1 (존재하는 사용자) → 200 OK
+        - PATCH /users/999 (존재하지 않는 사용자) → 404 Not Found
+        - PATCH /users/abc (정수가 아닌 ID) → 400 Bad Request
+        
+        PUT과의 차이: PUT은 전체 리소스 교체, PATCH는 부분 수정
+        """
+        user_id = _parse_user_id(user_id)
+        if user_id is None:
+            return HTTPResponse.create_400_response('Invalid user ID')
+        
+        try:
+            # JSON 파싱
+            patch_data = json.loads(request['body'])
+            if not isinstance(patch_data, dict):
+                return HTTPResponse.create_400_response('Invalid JSON format')
+            
+            # 사용자 존재 확인 + 부분 업데이트 (기존 필드 유지, 새 필드만 변경, ID는 변경 불가)
+            patched_user = self.store.patch(user_id, patch_data)
+            if patched_user is None:
+                return HTTPResponse.create_404_response(f'User not found: {user_id}')
+            
+            # 200 OK 응답
+            response_body = json.dumps({'message': 'User patched', 'user': patched_user}, ensure_ascii=False)
+            return HTTPResponse.create_200_response(response_body, 'application/json')
+        
+        except json.JSONDecodeError:
+            return HTTPResponse.create_400_response('Invalid JSON format')
+        except Exception as e:
+            return HTTPResponse.create_500_response(f'Server error: {str(e)}')
+    
+    @routes.route('DELETE', '/users/{user_id}')
+    def delete_user(self, request, user_id):
+        """
+        DELETE /users/{user_id}: 사용자 삭제
+        
+        - DELETE /users/1 (존재하는 사용자) → 200 OK
+        - DELETE /users/999 (존재하지 않는 사용자) → 404 Not Found
+        - DELETE /users/abc (정수가 아닌 ID) → 400 Bad Request
+        """
+        user_id = _parse_user_id(user_id)
+        if user_id is None:
+            return HTTPResponse.create_400_response('Invalid user ID')
+        
+        try:
+            # 사용자 존재 확인 및 삭제 (O(1))
+            deleted_user = self.store.delete(user_id)
+            if deleted_user is None:
+                return HTTPResponse.create_404_response(f'User not found: {user_id}')
+            
+            # 200 OK 응답
+            response_body = json.dumps({'message': 'User deleted', 'user': deleted_user}, ensure_ascii=False)
+            return HTTPResponse.create_200_response(response_body, 'application/json')
+        
+        except Exception as e:
+            return HTTPResponse.create_500_response(f'Server error: {str(e)}')
+    
+    def serve_static(self, path, headers):
+        """
+        정적 파일 응답 (파일 시스템 기반 자동 서빙)
         
-        - GET /users → users.json 반환 (200, 딕셔너리 → 리스트 변환)
         - GET / → index.html 반환 (200)
         - GET /about → about.html 반환 (200, 자동으로 .html 확장자 추가)
         - GET /notfound → 404 반환
-        
-        정적 파일은 파일 시스템 기반으로 자동 서빙됩니다.
+        - GET /about (If-None-Match / If-Modified-Since가 최신) → 304
+        - GET /big.bin (Range: bytes=0-99) → 206 부분 전송 (여러 구간이면 multipart/byteranges)
+        - GET /big.bin (Range가 파일 크기를 벗어남) → 416
+        - Accept-Encoding: gzip → 압축본 응답 (Content-Encoding: gzip, Vary: Accept-Encoding)
         """
         try:
-            # 1. API 엔드포인트 처리 (/users)
-            if path == '/users':
-                # 딕셔너리 → 리스트 변환 (클라이언트 호환성)
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # 딕셔너리 values를 리스트로 변환
-                users_list = list(data['users'].values())
-                response_data = {'users': users_list}
-                content = json.dumps(response_data, ensure_ascii=False)
-                return HTTPResponse.create_200_response(content, 'application/json')
-            
-            # 2. 정적 파일 자동 처리
             # 루트 경로(/) → index.html로 변환
             if path == '/':
                 path = '/index.html'
@@ -90,211 +624,175 @@ class HTTPHandler:
                 path = path + '.html'
             
             # 파일 시스템 경로 생성 (예: /about.html → server/data/static/about.html)
-            file_path = os.path.join(self.static_dir, path.lstrip('/'))
-            
-            # 파일 존재 확인 및 반환
-            if os.path.exists(file_path) and os.path.isfile(file_path):
-                # Content-Type 자동 감지
-                content_type = self._get_content_type(file_path)
-                
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                return HTTPResponse.create_200_response(content, content_type)
-            else:
+            # static 디렉토리 밖을 가리키는 경로(../)는 거부
+            file_path = os.path.normpath(os.path.join(self.static_dir, path.lstrip('/')))
+            static_file = None
+            if file_path.startswith(self._static_root):
+                # 캐시 조회 (파일 존재/변경 확인은 revalidate 주기마다 한 번만)
+                static_file = self.static_cache.get(file_path)
+            if static_file is None:
                 # 파일이 존재하지 않음 → 404
                 return HTTPResponse.create_404_response(f'File not found: {path}')
+            
+            # gzip 압축본 선택 (Range 요청은 원본 기준으로 처리)
+            if static_file.vary and get_header(headers, 'Range') is None and accepts_gzip(headers):
+                variant = self.static_cache.compressed(static_file)
+                if variant is not None and variant.size < static_file.size:
+                    static_file = variant
+            
+            # 클라이언트 캐시가 최신이면 바디 없이 304
+            if _not_modified(headers, static_file):
+                return HTTPResponse.create_304_response(static_file.validators)
+            
+            # Range 요청 (If-Range가 현재 버전과 다르면 Range를 무시하고 전체 전송)
+            ranges = None
+            range_header = get_header(headers, 'Range')
+            if range_header is not None and _if_range_matches(headers, static_file):
+                ranges = _parse_range(range_header, static_file.size)
+                if ranges == []:
+                    return HTTPResponse.create_416_response(static_file.size)
+            
+            if static_file.body is not None:
+                # 작은 파일은 캐시된 bytes를 그대로 전송
+                if ranges:
+                    body = static_file.body
+                    return self._range_response(static_file, ranges, lambda start, length: body[start:start + length])
+                return HTTPResponse(200, dict(static_file.headers), static_file.body)
+            # 큰 파일은 메모리에 올리지 않고 서버가 sendfile로 전송
+            return self._file_response(static_file, ranges)
         
         except FileNotFoundError:
             return HTTPResponse.create_404_response(f'File not found: {path}')
         except Exception as e:
             return HTTPResponse.create_500_response(f'Server error: {str(e)}')
     
-    def handle_HEAD(self, path):
-        """
-        HEAD 요청 처리: GET과 동일하지만 바디 없이 헤더만 반환
-        
-        - HEAD / → 200 (바디 없음)
-        """
-        # GET과 동일한 로직으로 응답 생성
-        response = self.handle_GET(path)
-        # 바디만 제거
-        response.body = ''
-        return response
+    def _file_response(self, static_file, ranges=None):
+        """파일을 열어 sendfile 응답 생성 (헤더는 실제로 연 파일 기준)"""
+        file_path = static_file.path
+        f = open(file_path, 'rb')
+        try:
+            st = os.fstat(f.fileno())
+            if st.st_size != static_file.size or st.st_mtime_ns != static_file.mtime_ns:
+                # 캐시 확인 주기 사이에 파일이 바뀜 → 연 파일 기준으로 헤더를 다시 계산
+                # (구간은 이전 버전 기준이므로 Range를 무시하고 전체 전송)
+                self.static_cache.invalidate(file_path)
+                static_file = StaticFile(
+                    file_path, st.st_size, st.st_mtime_ns, static_file.content_type, None, 0,
+                    static_file.encoding, static_file.vary
+                )
+                ranges = None
+        except OSError:
+            f.close()
+            raise
+        if ranges:
+            return self._range_response(static_file, ranges, lambda start, length: FileBody(f, start, length))
+        return HTTPResponse.create_file_response(FileBody(f, 0, st.st_size), dict(static_file.headers))
     
-    def handle_POST(self, path, body):
+    def _range_response(self, static_file, ranges, slice_of):
         """
-        POST 요청 처리: 새 데이터 생성
+        206 Partial Content 응답 생성
         
-        - POST /users (올바른 JSON) → 201 Created
-        - POST /users (잘못된 JSON) → 400 Bad Request
+        Args:
+            static_file (StaticFile): 대상 파일
+            ranges (list): _parse_range()가 반환한 (시작, 끝) 구간 리스트
+            slice_of (callable): (시작, 길이) → 바디 조각 (캐시된 bytes 조각 또는 FileBody)
         """
-        if path == '/users':
-            try:
-                # JSON 파싱
-                user_data = json.loads(body)
-                
-                # 기존 데이터 읽기
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Auto Increment ID 생성 (O(1))
-                new_id = data['next_id']
-                data['next_id'] += 1
-                
-                # 사용자 데이터에 ID 추가
-                user_data['id'] = new_id
-                
-                # 딕셔너리에 추가 (O(1))
-                data['users'][str(new_id)] = user_data
-                
-                # 파일에 저장
-                with open(self.users_file, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                
-                # 201 Created 응답
-                response_body = json.dumps({'message': 'User created', 'user': user_data}, ensure_ascii=False)
-                return HTTPResponse.create_201_response(response_body)
-            
-            except json.JSONDecodeError:
-                return HTTPResponse.create_400_response('Invalid JSON format')
-            except Exception as e:
-                return HTTPResponse.create_500_response(f'Server error: {str(e)}')
+        headers = dict(static_file.headers)
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            body = slice_of(start, end - start + 1)
+            headers['Content-Range'] = f'bytes {start}-{end}/{static_file.size}'
+            headers['Content-Length'] = str(end - start + 1)
         else:
-            return HTTPResponse.create_404_response(f'Endpoint not found: {path}')
+            body, length, content_type = _byterange_parts(
+                ranges, static_file.size, headers['Content-Type'], slice_of
+            )
+            headers['Content-Type'] = content_type
+            headers['Content-Length'] = str(length)
+        
+        if isinstance(body, bytes):
+            return HTTPResponse(206, headers, body)
+        if isinstance(body, list) and all(isinstance(part, bytes) for part in body):
+            return HTTPResponse(206, headers, b''.join(body))
+        return HTTPResponse.create_file_response(body, headers, 206)
     
-    def handle_PUT(self, path, body):
+    def _compress_response(self, response, headers):
         """
-        PUT 요청 처리: 데이터 전체 수정
+        동적 응답 gzip 압축 (클라이언트가 지원하고 텍스트 계열이며 gzip_min_size 이상일 때만)
         
-        - PUT /users/1 (존재하는 사용자) → 200 OK
-        - PUT /users/999 (존재하지 않는 사용자) → 404 Not Found
+        스트리밍 응답은 크기를 미리 알 수 없으므로 항상 청크 단위로 압축합니다.
+        압축 결과는 바이트 단위로 같지 않을 수 있으므로 ETag는 약한 검증자(W/)로 바꿉니다.
         """
-        # 경로에서 사용자 ID 추출
-        if path.startswith('/users/'):
-            try:
-                user_id = int(path.split('/')[-1])
-                user_id_str = str(user_id)
-                
-                # JSON 파싱
-                updated_data = json.loads(body)
-                
-                # 기존 데이터 읽기
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # 사용자 존재 확인 (O(1))
-                if user_id_str in data['users']:
-                    # ID 유지
-                    updated_data['id'] = user_id
-                    
-                    # 딕셔너리 업데이트 (O(1))
-                    data['users'][user_id_str] = updated_data
-                    
-                    # 파일에 저장
-                    with open(self.users_file, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    
-                    # 200 OK 응답
-                    response_body = json.dumps({'message': 'User updated', 'user': updated_data}, ensure_ascii=False)
-                    return HTTPResponse.create_200_response(response_body, 'application/json')
-                else:
-                    return HTTPResponse.create_404_response(f'User not found: {user_id}')
-            
-            except json.JSONDecodeError:
-                return HTTPResponse.create_400_response('Invalid JSON format')
-            except ValueError:
-                return HTTPResponse.create_400_response('Invalid user ID')
-            except Exception as e:
-                return HTTPResponse.create_500_response(f'Server error: {str(e)}')
+        if self.gzip_level <= 0 or not accepts_gzip(headers):
+            return
+        if not is_compressible(response.headers.get('Content-Type', '')):
+            return
+        if response.stream is not None:
+            response.stream = gzip_stream(response.stream, self.gzip_level)
         else:
-            return HTTPResponse.create_404_response(f'Endpoint not found: {path}')
+            body = response.get_body_bytes()
+            if len(body) < self.gzip_min_size:
+                return
+            response.body = gzip_bytes(body, self.gzip_level)
+        response.headers['Content-Encoding'] = 'gzip'
+        etag = response.headers.get('ETag')
+        if etag is not None and not etag.startswith('W/'):
+            response.headers['ETag'] = 'W/' + etag
     
-    def handle_DELETE(self, path):
-        """
-        DELETE 요청 처리: 데이터 삭제
+    def _query_users(self, query_string):
+        """GET /users 조건 조회: 인덱스로 필터링 → 정렬 / 페이지 → 필드 선택 → 일반 또는 스트리밍 응답"""
+        try:
+            query = _parse_user_query(query_string)
+            next_cursor = None
+            if query['limit'] is not None:
+                users, has_more = self.store.page(query['conditions'], query['after_id'], query['limit'])
+                if has_more:
+                    next_cursor = _encode_cursor(users[-1]['id'])
+            elif query['conditions']:
+                users = self.store.find(query['conditions'])
+            else:
+                # 조건이 없으면 목록을 만들지 않고 스냅샷을 그대로 순회
+                users = self.store.iter_users()
+        except ValueError as e:
+            return HTTPResponse.create_400_response(f'Invalid query: {str(e)}')
         
-        - DELETE /users/1 (존재하는 사용자) → 200 OK
-        - DELETE /users/999 (존재하지 않는 사용자) → 404 Not Found
-        """
-        # 경로에서 사용자 ID 추출
-        if path.startswith('/users/'):
-            try:
-                user_id = int(path.split('/')[-1])
-                user_id_str = str(user_id)
-                
-                # 기존 데이터 읽기
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # 사용자 존재 확인 및 삭제 (O(1))
-                if user_id_str in data['users']:
-                    deleted_user = data['users'].pop(user_id_str)
-                    
-                    # 파일에 저장
-                    with open(self.users_file, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    
-                    # 200 OK 응답
-                    response_body = json.dumps({'message': 'User deleted', 'user': deleted_user}, ensure_ascii=False)
-                    return HTTPResponse.create_200_response(response_body, 'application/json')
-                else:
-                    return HTTPResponse.create_404_response(f'User not found: {user_id}')
-            
-            except ValueError:
-                return HTTPResponse.create_400_response('Invalid user ID')
-            except Exception as e:
-                return HTTPResponse.create_500_response(f'Server error: {str(e)}')
+        if query['sort_field'] is not None:
+            users = sort_users(users, query['sort_field'], query['descending'])
+        
+        fields = query['fields']
+        if fields is None:
+            encode_user = self.store.fragment
         else:
-            return HTTPResponse.create_404_response(f'Endpoint not found: {path}')
+            # 필요한 필드만 골라 응답 크기 축소 (부분 객체는 캐시하지 않음)
+            def encode_user(user):
+                projected = {field: user[field] for field in fields if field in user}
+                return json.dumps(projected, ensure_ascii=False).encode('utf-8')
+        
+        chunks = _iter_users_json(users, encode_user, next_cursor, query['limit'] is not None)
+        if query['stream']:
+            return HTTPResponse.create_stream_response(chunks, 'application/json')
+        return HTTPResponse.create_200_response(b''.join(chunks), 'application/json')
     
-    def handle_PATCH(self, path, body):
+    def _strip_body(self, response):
         """
-        PATCH 요청 처리: 데이터 부분 수정
+        HEAD 응답: GET과 같은 헤더에서 바디만 제거
         
-        - PATCH /users/1 (존재하는 사용자) → 200 OK
-        - PATCH /users/999 (존재하지 않는 사용자) → 404 Not Found
-        
-        PUT과의 차이: PUT은 전체 리소스 교체, PATCH는 부분 수정
-        (이 구현에서는 동작이 유사하지만, 의미적으로 구분)
+        - HEAD / → 200 (바디 없음)
         """
-        # 경로에서 사용자 ID 추출
-        if path.startswith('/users/'):
-            try:
-                user_id = int(path.split('/')[-1])
-                user_id_str = str(user_id)
-                
-                # JSON 파싱
-                patch_data = json.loads(body)
-                
-                # 기존 데이터 읽기
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # 사용자 존재 확인 (O(1))
-                if user_id_str in data['users']:
-                    # 부분 업데이트 (기존 필드 유지, 새 필드만 변경)
-                    for key, value in patch_data.items():
-                        if key != 'id':  # ID는 변경 불가
-                            data['users'][user_id_str][key] = value
-                    
-                    # 파일에 저장
-                    with open(self.users_file, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    
-                    # 200 OK 응답
-                    response_body = json.dumps({'message': 'User patched', 'user': data['users'][user_id_str]}, ensure_ascii=False)
-                    return HTTPResponse.create_200_response(response_body, 'application/json')
-                else:
-                    return HTTPResponse.create_404_response(f'User not found: {user_id}')
-            
-            except json.JSONDecodeError:
-                return HTTPResponse.create_400_response('Invalid JSON format')
-            except ValueError:
-                return HTTPResponse.create_400_response('Invalid user ID')
-            except Exception as e:
-                return HTTPResponse.create_500_response(f'Server error: {str(e)}')
-        else:
-            return HTTPResponse.create_404_response(f'Endpoint not found: {path}')
+        if response.status_code == 304:
+            return response  # 바디와 Content-Length가 없는 응답
+        if response.file is not None:
+            # 파일 응답은 Content-Length가 이미 있으므로 파일만 닫음
+            response.close_files()
+            return response
+        if response.stream is not None:
+            # 스트리밍 응답은 길이를 미리 알 수 없으므로 바디를 만들지 않고 헤더만 반환
+            response.stream = None
+            return response
+        # 바디만 제거 (Content-Length는 GET 응답 기준으로 유지)
+        response.set_header('Content-Length', str(len(response.get_body_bytes())))
+        response.body = b''
+        return response
     
     def _get_content_type(self, file_path):
         """
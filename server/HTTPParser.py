@@ -1,72 +1,357 @@
 """
 HTTP 요청 파싱 모듈
-클라이언트로부터 받은 raw HTTP 요청 데이터를 파싱하여 딕셔너리로 변환합니다.
+클라이언트로부터 받은 raw HTTP 요청 바이트를 파싱하여 딕셔너리로 변환합니다.
+
+바이트 단위 증분 파서(상태 머신)로 동작합니다.
+- feed()로 수신한 바이트를 조각 단위로 넣고 next_request()로 완성된 요청을 꺼냄
+- 헤더 종료(빈 줄)는 bytes.find로 찾고, 헤더 바이트만 문자열로 디코딩
+- 바디는 수신 버퍼를 가리키는 memoryview로 반환 (복사 없음)
+- 한 연결에서 파서 하나를 여러 요청에 재사용
 """
 
 import sys
 import os
+import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from common.HTTPConstants import CRLF
+from common.HTTPConstants import CRLF, MAX_HEADER_SIZE, MAX_BODY_SIZE
+
+HEADER_TERMINATOR = b'\r\n\r\n'
+# 청크 크기에 쓸 수 있는 문자 (int(..., 16)이 허용하는 부호, '0x', '_'는 거부)
+_HEX_DIGITS = frozenset(b'0123456789abcdefABCDEF')
+
+
+def get_header(headers, name, default=None):
+    """
+    헤더 값 조회 (헤더 이름은 대소문자를 구분하지 않음)
+    
+    Args:
+        headers (dict): 파싱된 헤더 딕셔너리
+        name (str): 헤더 이름
+        default: 헤더가 없을 때 반환할 값
+    
+    Returns:
+        str: 헤더 값
+    """
+    if name in headers:
+        return headers[name]
+    lower_name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == lower_name:
+            return value
+    return default
+
+
+class HTTPParseError(Exception):
+    """요청을 파싱할 수 없을 때 발생 (응답할 상태 코드 포함)"""
+    
+    def __init__(self, status_code, message):
+        """
+        Args:
+            status_code (int): 클라이언트에 보낼 상태 코드 (400, 413, 431)
+            message (str): 에러 메시지
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
 
 
 class HTTPParser:
-    """HTTP 요청을 파싱하는 클래스"""
+    """HTTP 요청을 파싱하는 클래스 (바이트 단위 증분 파서)"""
     
-    def __init__(self):
+    def __init__(self, max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE):
+        """
+        Args:
+            max_header_size (int): 요청 라인 + 헤더 최대 크기 (초과 시 431)
+            max_body_size (int): 바디 최대 크기 (초과 시 413)
+        """
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+        
+        # 마지막으로 파싱한 요청
         self.method = None
         self.path = None
         self.version = None
         self.headers = {}
         self.body = None
+        
+        # 수신 버퍼: self._start 이전은 이미 처리한 요청
+        self.buffer = bytearray()
+        self._start = 0
+        # 바디 memoryview가 버퍼를 참조 중이면 버퍼 크기를 바꿀 수 없음
+        self._exported = False
+        # 현재 요청을 파싱하는 데 쓴 시간 (여러 번의 next_request 호출 합계, ns)
+        self._parse_ns = 0
+        # 현재 요청의 첫 바이트를 받은 시각 (perf_counter_ns)
+        self._received_ns = 0
+        
+        self._reset()
     
-    def parse_request(self, raw_data):
+    def _reset(self):
+        """현재 요청의 파싱 상태 초기화 (다음 요청 준비)"""
+        self._scan_from = self._start   # 헤더 종료를 찾기 시작할 위치
+        self._header_end = None         # 헤더 종료(빈 줄) 위치
+        self._request = None            # 헤더까지 파싱된 요청
+        self._content_length = 0
+        self._chunked = False
+        self._chunk_pos = 0             # chunked: 다음 청크 크기 줄의 위치
+        self._chunk_body = None         # chunked: 디코딩된 바디
+    
+    def has_buffered_data(self):
+        """버퍼에 아직 처리하지 않은 바이트가 있는지 여부"""
+        return len(self.buffer) > self._start
+    
+    def feed(self, data):
         """
-        raw HTTP 요청 데이터를 파싱합니다.
+        수신한 바이트를 버퍼에 추가
         
         Args:
-            raw_data (str): 클라이언트로부터 받은 HTTP 요청 문자열
-            
+            data (bytes | bytearray | memoryview): 수신한 바이트 조각
+        """
+        if not self.has_buffered_data():
+            self._received_ns = time.perf_counter_ns()
+        if self._start:
+            self._compact()
+        self.buffer += data
+    
+    def _compact(self):
+        """처리 완료된 앞부분을 버퍼에서 제거 (남은 바이트만 유지)"""
+        shift = self._start
+        if self._exported:
+            # 이전 요청의 바디가 기존 버퍼를 참조하므로 남은 바이트만 새 버퍼로 옮김
+            self.buffer = self.buffer[shift:]
+            self._exported = False
+        else:
+            del self.buffer[:shift]
+        
+        self._start = 0
+        self._scan_from = max(0, self._scan_from - shift)
+        if self._header_end is not None:
+            self._header_end -= shift
+        if self._chunked:
+            self._chunk_pos -= shift
+    
+    def next_request(self):
+        """
+        버퍼에서 완성된 요청 하나를 파싱합니다.
+        
         Returns:
-            dict: 파싱된 요청 정보 {'method', 'path', 'version', 'headers', 'body'}
+            dict: 파싱된 요청 정보
+                  {'method', 'path', 'version', 'headers', 'body', 'size', 'parse_ns', 'read_ns', 'parsed_at_ns'}
+                  (body는 memoryview, size는 수신한 요청 바이트 수,
+                   parse_ns는 이 요청을 파싱하는 데 쓴 시간 합계,
+                   read_ns는 첫 바이트 수신부터 요청 완성까지의 시간,
+                   parsed_at_ns는 요청이 완성된 시각 (perf_counter_ns),
+                   아직 다 도착하지 않았으면 None 반환)
+        
+        Raises:
+            HTTPParseError: 잘못된 요청 또는 크기 제한 초과
         """
+        if not self.has_buffered_data():
+            return None  # 받은 바이트 없음 (recv 전 호출은 파싱 시간에 포함하지 않음)
+        
+        started = time.perf_counter_ns()
+        try:
+            request = self._next_request()
+        finally:
+            finished = time.perf_counter_ns()
+            self._parse_ns += finished - started
+        if request is not None:
+            request['parse_ns'] = self._parse_ns
+            request['read_ns'] = finished - self._received_ns
+            request['parsed_at_ns'] = finished
+            self._parse_ns = 0
+            # 파이프라인으로 이미 받아 둔 다음 요청은 지금부터 계산
+            self._received_ns = finished
+        return request
+    
+    def _next_request(self):
+        """next_request의 파싱 본체 (시간 측정 제외)"""
+        if self._header_end is None and not self._parse_head():
+            return None
+        
+        if self._chunked:
+            return self._next_chunked_body()
+        
+        body_start = self._header_end + len(HEADER_TERMINATOR)
+        body_end = body_start + self._content_length
+        if len(self.buffer) < body_end:
+            return None
+        
+        if self._content_length:
+            body = memoryview(self.buffer)[body_start:body_end]
+            self._exported = True
+        else:
+            body = b''
+        return self._finish_request(body, body_end)
+    
+    def _parse_head(self):
+        """헤더 종료를 찾아 요청 라인과 헤더 파싱"""
+        header_end = self.buffer.find(HEADER_TERMINATOR, self._scan_from)
+        if header_end == -1:
+            if len(self.buffer) - self._start > self.max_header_size:
+                raise HTTPParseError(431, 'Request header too large')
+            # 종료 문자열이 두 번의 수신에 걸쳐 도착할 수 있으므로 3바이트 겹쳐서 다시 탐색
+            self._scan_from = max(self._start, len(self.buffer) - len(HEADER_TERMINATOR) + 1)
+            return False
+        
+        if header_end - self._start > self.max_header_size:
+            raise HTTPParseError(431, 'Request header too large')
+        
+        # 헤더 바이트만 디코딩 (바디는 디코딩하지 않음)
+        with memoryview(self.buffer) as view:
+            try:
+                head = str(view[self._start:header_end], 'utf-8')
+            except UnicodeDecodeError:
+                raise HTTPParseError(400, 'Invalid header encoding')
+        
+        lines = head.split(CRLF)
+        
+        # 1. 요청 라인 파싱 (첫 번째 줄)
+        # 예: "GET /index.html HTTP/1.1"
+        parts = lines[0].split(' ')
+        if len(parts) != 3:
+            raise HTTPParseError(400, 'Invalid request line')
+        
+        # 2. 헤더 파싱 (두 번째 줄부터 빈 줄 전까지)
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip()] = value.strip()
+        
+        self._request = {
+            'method': parts[0],
+            'path': parts[1],
+            'version': parts[2],
+            'headers': headers,
+            'size': header_end - self._start + len(HEADER_TERMINATOR)
+        }
+        self._header_end = header_end
+        self._parse_framing(headers)
+        return True
+    
+    def _parse_framing(self, headers):
+        """헤더에서 바디 길이 결정 (Content-Length / Transfer-Encoding: chunked)"""
+        transfer_encoding = get_header(headers, 'Transfer-Encoding', '')
+        if 'chunked' in transfer_encoding.lower():
+            # chunked가 있으면 Content-Length는 무시 (RFC 7230 3.3.3)
+            self._chunked = True
+            self._chunk_pos = self._header_end + len(HEADER_TERMINATOR)
+            self._chunk_body = bytearray()
+            return
+        
+        content_length = get_header(headers, 'Content-Length')
+        if content_length is None:
+            return
         try:
-            # CRLF로 줄 분리
-            lines = raw_data.split(CRLF)
+            self._content_length = int(content_length)
+        except ValueError:
+            raise HTTPParseError(400, 'Invalid Content-Length')
+        if self._content_length < 0:
+            raise HTTPParseError(400, 'Invalid Content-Length')
+        if self._content_length > self.max_body_size:
+            raise HTTPParseError(413, 'Request body too large')
+    
+    def _next_chunked_body(self):
+        """chunked 바디를 도착한 만큼 디코딩 (마지막 청크까지 오면 요청 반환)"""
+        while True:
+            line_end = self.buffer.find(b'\r\n', self._chunk_pos)
+            # 청크 크기 줄(확장 포함)도 헤더 크기 제한 적용 (줄바꿈 없이 계속 보내 버퍼를 키우지 못하도록)
+            line_length = (len(self.buffer) if line_end == -1 else line_end) - self._chunk_pos
+            if line_length > self.max_header_size:
+                raise HTTPParseError(400, 'Chunk size line too long')
+            if line_end == -1:
+                return None
             
-            # 1. 요청 라인 파싱 (첫 번째 줄)
-            # 예: "GET /index.html HTTP/1.1"
-            request_line = lines[0]
-            parts = request_line.split(' ')
+            # 청크 크기 (16진수 숫자만, ';' 뒤 확장은 무시)
+            size_line = bytes(self.buffer[self._chunk_pos:line_end]).split(b';', 1)[0].strip()
+            if not size_line or not _HEX_DIGITS.issuperset(size_line):
+                raise HTTPParseError(400, 'Invalid chunk size')
+            chunk_size = int(size_line, 16)
             
-            if len(parts) != 3:
-                raise ValueError("Invalid request line")
+            if chunk_size == 0:
+                return self._finish_chunked_body(line_end + 2)
             
-            self.method = parts[0]
-            self.path = parts[1]
-            self.version = parts[2]
+            if len(self._chunk_body) + chunk_size > self.max_body_size:
+                raise HTTPParseError(413, 'Request body too large')
             
-            # 2. 헤더 파싱 (두 번째 줄부터 빈 줄 전까지)
-            i = 1
-            while i < len(lines) and lines[i] != '':
-                line = lines[i]
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    self.headers[key.strip()] = value.strip()
-                i += 1
+            data_start = line_end + 2
+            data_end = data_start + chunk_size
+            if len(self.buffer) < data_end + 2:
+                return None
+            if self.buffer[data_end:data_end + 2] != b'\r\n':
+                raise HTTPParseError(400, 'Invalid chunk terminator')
+            
+            with memoryview(self.buffer) as view:
+                self._chunk_body += view[data_start:data_end]
+            self._chunk_pos = data_end + 2
+    
+    def _finish_chunked_body(self, trailer_start):
+        """마지막 청크 이후 트레일러(빈 줄까지)를 건너뛰고 요청 완성"""
+        pos = trailer_start
+        while True:
+            line_end = self.buffer.find(b'\r\n', pos)
+            # 트레일러는 헤더 필드이므로 헤더와 같은 크기 제한 적용
+            if (len(self.buffer) if line_end == -1 else line_end) - trailer_start > self.max_header_size:
+                raise HTTPParseError(431, 'Request trailer fields too large')
+            if line_end == -1:
+                return None
+            if line_end == pos:
+                break  # 빈 줄 → 메시지 끝
+            pos = line_end + 2
+        
+        return self._finish_request(memoryview(self._chunk_body), line_end + 2)
+    
+    def _finish_request(self, body, request_end):
+        """요청 완성: 결과 반환 후 다음 요청을 위해 상태 초기화"""
+        request = self._request
+        request['body'] = body
+        # 헤더 크기 + 바디 부분의 수신 바이트 (chunked면 청크 크기 줄과 트레일러 포함)
+        request['size'] += request_end - (self._header_end + len(HEADER_TERMINATOR))
+        
+        self.method = request['method']
+        self.path = request['path']
+        self.version = request['version']
+        self.headers = request['headers']
+        self.body = body
+        
+        self._start = request_end
+        if self._start == len(self.buffer):
+            # 버퍼를 모두 소비함 → 다음 요청은 빈 버퍼에서 시작
+            if self._exported:
+                self.buffer = bytearray()
+            else:
+                self.buffer.clear()
+            self._start = 0
+            self._exported = False
+        self._reset()
+        return request
+    
+    def parse_request(self, raw_data):
+        """
+        raw HTTP 요청 데이터를 한 번에 파싱합니다.
+        
+        Args:
+            raw_data (bytes | str): 클라이언트로부터 받은 HTTP 요청
+        
+        Returns:
+            dict: 파싱된 요청 정보 {'method', 'path', 'version', 'headers', 'body'}
+        """
+        try:
+            if isinstance(raw_data, str):
+                raw_data = raw_data.encode('utf-8')
             
-            # 3. 바디 파싱 (빈 줄 이후)
-            # 빈 줄 다음부터가 바디
-            if i + 1 < len(lines):
-                self.body = CRLF.join(lines[i + 1:])
+            self.buffer = bytearray()
+            self._start = 0
+            self._exported = False
+            self._reset()
             
-            return {
-                'method': self.method,
-                'path': self.path,
-                'version': self.version,
-                'headers': self.headers,
-                'body': self.body
-            }
+            self.feed(raw_data)
+            parsed = self.next_request()
+            if parsed is None:
+                raise HTTPParseError(400, 'Incomplete request')
+            return parsed
         
         except Exception as e:
             print(f"파싱 에러: {e}")
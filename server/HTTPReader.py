@@ -0,0 +1,101 @@
+"""
+HTTP 요청 수신 모듈
+소켓에서 바이트를 받아 HTTPParser에 넣고, 완성된 HTTP 요청 단위로 꺼냅니다.
+
+- 헤더 종료(빈 줄)가 도착할 때까지 수신
+- Content-Length 만큼 바디를 정확히 수신
+- Transfer-Encoding: chunked 바디 디코딩
+- 헤더/바디 크기 제한 (초과 시 431 / 413)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.HTTPConstants import BUFFER_SIZE, MAX_HEADER_SIZE, MAX_BODY_SIZE
+from server.HTTPParser import HTTPParser, HTTPParseError
+
+
+class HTTPReader:
+    """
+    블로킹 소켓용 요청 리더
+    
+    연결마다 하나의 HTTPParser를 두고 여러 요청에 재사용합니다.
+    요청 하나를 꺼낸 뒤 남은 바이트는 다음 요청을 위해 파서 버퍼에 남아 있습니다.
+    """
+    
+    def __init__(self, sock, max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE):
+        """
+        Args:
+            sock: 요청을 읽을 소켓
+            max_header_size (int): 요청 라인 + 헤더 최대 크기 (bytes)
+            max_body_size (int): 바디 최대 크기 (bytes)
+        """
+        self.socket = sock
+        self.parser = HTTPParser(max_header_size, max_body_size)
+        # recv_into용 고정 수신 버퍼 (recv마다 새 bytes 객체를 만들지 않음)
+        self._recv_buffer = bytearray(BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buffer)
+        # 파이프라인 중간에서 발생한 파싱 에러 (앞선 요청을 처리한 뒤 다음 호출에서 발생)
+        self._pending_error = None
+    
+    def has_buffered_data(self):
+        """버퍼에 아직 처리하지 않은 바이트가 있는지 여부"""
+        return self.parser.has_buffered_data()
+    
+    def read_request(self):
+        """
+        소켓에서 요청 하나를 완성될 때까지 읽습니다. (블로킹)
+        
+        Returns:
+            dict: 파싱된 요청 정보 {'method', 'path', 'version', 'headers', 'body'}
+                  요청 전에 클라이언트가 연결을 닫으면 None
+        
+        Raises:
+            HTTPParseError: 크기 제한 초과, 잘못된 요청, 요청 도중 연결 종료
+            socket.timeout: 소켓 타임아웃
+        """
+        while True:
+            request = self.parser.next_request()
+            if request is not None:
+                return request
+            
+            received = self.socket.recv_into(self._recv_view)
+            if received == 0:
+                if self.parser.has_buffered_data():
+                    raise HTTPParseError(400, 'Incomplete request')
+                return None
+            self.parser.feed(self._recv_view[:received])
+    
+    def read_requests(self):
+        """
+        파이프라인으로 함께 도착한 요청들을 모두 꺼냅니다.
+        
+        첫 요청은 도착할 때까지 블로킹으로 기다리고,
+        이후 버퍼에 이미 완성된 요청이 있으면 추가로 recv 하지 않고 함께 반환합니다.
+        
+        Returns:
+            list: 파싱된 요청 목록 (클라이언트가 연결을 닫았으면 빈 리스트)
+            
+        Raises:
+            HTTPParseError: 크기 제한 초과, 잘못된 요청, 요청 도중 연결 종료
+            socket.timeout: 소켓 타임아웃
+        """
+        if self._pending_error is not None:
+            error, self._pending_error = self._pending_error, None
+            raise error
+        
+        request = self.read_request()
+        if request is None:
+            return []
+        
+        batch = [request]
+        try:
+            while True:
+                request = self.parser.next_request()
+                if request is None:
+                    break
+                batch.append(request)
+        except HTTPParseError as e:
+            self._pending_error = e
+        return batch
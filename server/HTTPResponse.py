@@ -1,65 +1,187 @@
 """
 HTTP 응답 생성 모듈
-상태 코드, 헤더, 바디를 조합하여 HTTP 응답 문자열을 생성합니다.
+상태 코드, 헤더, 바디를 조합하여 HTTP 응답 바이트를 생성합니다.
+
+- 상태 라인은 STATUS_CODES의 모든 코드에 대해 미리 인코딩
+- Date 헤더 문자열은 1초에 한 번만 다시 만듦
+- 헤더와 바디는 합치지 않고 버퍼 리스트로 반환 (서버가 sendmsg로 한 번에 전송)
+
+바디를 한 번에 만들기 어려운 응답은 bytes 이터레이터(stream)로 만들어
+Transfer-Encoding: chunked로 나눠 보낼 수 있습니다.
+파일 바디(FileBody)는 메모리에 올리지 않고 서버가 sendfile로 전송합니다.
+(multipart/byteranges처럼 bytes와 파일 구간이 섞인 바디는 조각 리스트로 전달)
 """
 
 import sys
 import os
+import time
+from email.utils import formatdate
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common.HTTPConstants import HTTP_VERSION, STATUS_CODES, CRLF
-from datetime import datetime
+
+# 상태 코드 → 인코딩된 상태 라인 (예: b'HTTP/1.1 200 OK\r\n')
+_STATUS_LINES = {
+    code: f"{HTTP_VERSION} {code} {message}{CRLF}".encode('ascii')
+    for code, message in STATUS_CODES.items()
+}
+
+# (초, Date 헤더 문자열): 같은 초 안의 응답은 문자열을 다시 만들지 않음
+_date_cache = (0, '')
+
+
+def http_date():
+    """
+    현재 시각의 HTTP Date 헤더 값 (예: 'Sun, 06 Nov 1994 08:49:37 GMT')
+    
+    튜플을 통째로 교체하므로 여러 스레드가 동시에 호출해도 안전합니다.
+    """
+    global _date_cache
+    now = int(time.time())
+    cached = _date_cache
+    if cached[0] != now:
+        cached = (now, formatdate(now, usegmt=True))
+        _date_cache = cached
+    return cached[1]
+
+
+class FileBody:
+    """sendfile로 전송할 파일 구간 (서버가 전송 후 닫음)"""
+    
+    def __init__(self, file, offset, length):
+        """
+        Args:
+            file: 바이너리 모드로 연 파일 객체
+            offset (int): 전송을 시작할 파일 위치
+            length (int): 전송할 바이트 수
+        """
+        self.file = file
+        self.offset = offset
+        self.remaining = length
+    
+    def close(self):
+        """파일 닫기 (여러 번 호출해도 안전)"""
+        self.file.close()
 
 
 class HTTPResponse:
     """HTTP 응답을 생성하는 클래스"""
     
-    def __init__(self, status_code=200, headers=None, body=''):
+    def __init__(self, status_code=200, headers=None, body='', stream=None, file=None):
         """
         Args:
             status_code (int): HTTP 상태 코드 (200, 404 등)
             headers (dict): 응답 헤더 딕셔너리
-            body (str): 응답 바디
+            body (str | bytes): 응답 바디 (미리 인코딩한 bytes도 가능)
+            stream (iterable): 바디 대신 나눠 보낼 bytes 조각들 (chunked 전송)
+            file (FileBody | list): 바디 대신 sendfile로 보낼 파일 구간 또는 bytes / FileBody 조각 리스트
+                                    (Content-Length 헤더 필요)
         """
         self.status_code = status_code
         self.headers = headers or {}
         self.body = body
+        self.stream = stream
+        self.file = file
+        # 응답을 만든 라우트 (메트릭 라벨: 경로 패턴 / 'static', 그 밖의 응답은 None)
+        self.route = None
+        # 바디의 끝을 연결 종료로 표시하는 응답 (HTTP/1.0 스트리밍, Content-Length / chunked 없음)
+        self.close_delimited = False
         
         # 기본 헤더 설정
         if 'Server' not in self.headers:
             self.headers['Server'] = 'Python-Socket-Server/1.0'
         if 'Date' not in self.headers:
-            self.headers['Date'] = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
+            self.headers['Date'] = http_date()
     
     def set_header(self, key, value):
         """헤더 추가/수정"""
         self.headers[key] = value
     
-    def build_response(self):
+    def get_body_bytes(self):
+        """바디를 bytes로 반환 (str 바디만 UTF-8로 인코딩)"""
+        if isinstance(self.body, str):
+            return self.body.encode('utf-8')
+        return bytes(self.body)
+    
+    def file_parts(self):
+        """파일 응답의 바디 조각 리스트 (bytes / FileBody)"""
+        if isinstance(self.file, FileBody):
+            return [self.file]
+        return list(self.file)
+    
+    def close_files(self):
+        """보내지 않을 파일 응답의 파일 닫기 (HEAD 응답 등)"""
+        for part in self.file_parts():
+            if isinstance(part, FileBody):
+                part.close()
+        self.file = None
+    
+    def set_close_delimited(self):
         """
-        HTTP 응답 문자열을 생성합니다.
+        스트리밍 바디를 chunked 대신 연결 종료로 구분 (chunked를 모르는 HTTP/1.0 클라이언트용)
         
-        Returns:
-            str: 완성된 HTTP 응답 문자열
+        Content-Length가 있으면 클라이언트가 그 길이만 바디로 읽으므로 길이 헤더를 모두 제거합니다.
         """
-        # 1. 상태 라인 생성
-        # 예: "HTTP/1.1 200 OK"
-        status_message = STATUS_CODES.get(self.status_code, 'Unknown')
-        status_line = f"{HTTP_VERSION} {self.status_code} {status_message}{CRLF}"
+        self.close_delimited = True
+        self.headers.pop('Transfer-Encoding', None)
+        self.headers.pop('Content-Length', None)
+    
+    def _needs_content_length(self):
+        """Content-Length를 자동으로 추가해야 하는지 (304와 연결 종료로 구분하는 응답은 제외)"""
+        return (
+            self.status_code != 304
+            and not self.close_delimited
+            and 'Content-Length' not in self.headers
+            and 'Transfer-Encoding' not in self.headers
+        )
+    
+    def to_buffers(self):
+        """
+        전송할 HTTP 응답을 버퍼 리스트로 생성합니다. (바디는 한 번만 인코딩, 헤더와 합치지 않음)
+        
+        Content-Length는 바디가 비어 있어도 항상 포함합니다. (keep-alive 연결에서 응답 경계를 알 수 있도록)
+        스트리밍 응답은 길이를 미리 알 수 없으므로 chunked 인코딩으로 경계를 표시합니다.
         
-        # 2. Content-Length 헤더 자동 추가
-        if self.body and 'Content-Length' not in self.headers:
-            self.headers['Content-Length'] = str(len(self.body.encode('utf-8')))
+        Returns:
+            list: [상태 라인 + 헤더 + 빈 줄, 바디] (바디가 비어 있으면 헤더만)
+        """
+        body = self.get_body_bytes()
+        if self._needs_content_length():
+            self.headers['Content-Length'] = str(len(body))
+        head = self._build_head()
+        return [head, body] if body else [head]
+    
+    def to_bytes(self):
+        """
+        전송할 HTTP 응답 바이트를 생성합니다.
         
-        # 3. 헤더 생성
-        header_lines = ''
-        for key, value in self.headers.items():
-            header_lines += f"{key}: {value}{CRLF}"
+        Returns:
+            bytes: 상태 라인 + 헤더 + 빈 줄 + 바디
+        """
+        return b''.join(self.to_buffers())
+    
+    def _build_head(self):
+        """상태 라인 + 헤더 + 빈 줄 바이트 생성 (헤더는 한 번에 join 후 인코딩)"""
+        # 1. 상태 라인 (예: b"HTTP/1.1 200 OK\r\n")
+        status_line = _STATUS_LINES.get(self.status_code)
+        if status_line is None:
+            status_line = f"{HTTP_VERSION} {self.status_code} Unknown{CRLF}".encode('ascii')
         
-        # 4. 응답 조합 (상태 라인 + 헤더 + 빈 줄 + 바디)
-        response = status_line + header_lines + CRLF + self.body
+        # 2. 헤더 + 빈 줄
+        header_lines = ''.join([f"{key}: {value}{CRLF}" for key, value in self.headers.items()])
+        return status_line + (header_lines + CRLF).encode('utf-8')
+    
+    def iter_chunked_body(self):
+        """
+        stream의 각 조각을 chunked 형식으로 인코딩 (to_buffers()의 헤더 다음에 전송)
         
-        return response
+        Yields:
+            bytes: 크기(16진수) CRLF 데이터 CRLF 형식의 청크, 마지막은 0 CRLF CRLF
+        """
+        for data in self.stream:
+            if data:
+                yield b'%X\r\n' % len(data) + data + b'\r\n'
+        yield b'0\r\n\r\n'
     
     @staticmethod
     def create_200_response(body, content_type='text/html'):
@@ -67,26 +189,89 @@ class HTTPResponse:
         headers = {'Content-Type': content_type}
         return HTTPResponse(200, headers, body)
     
+    @staticmethod
+    def create_stream_response(stream, content_type='application/json'):
+        """200 OK 스트리밍(chunked) 응답 생성 헬퍼 메소드"""
+        headers = {'Content-Type': content_type, 'Transfer-Encoding': 'chunked'}
+        return HTTPResponse(200, headers, '', stream)
+    
+    @staticmethod
+    def create_file_response(file_body, headers, status_code=200):
+        """파일 응답 생성 헬퍼 메소드 (바디는 서버가 sendfile로 전송, 부분 전송이면 206)"""
+        return HTTPResponse(status_code, headers, b'', file=file_body)
+    
     @staticmethod
     def create_201_response(body):
         """201 Created 응답 생성 헬퍼 메소드"""
         headers = {'Content-Type': 'application/json'}
         return HTTPResponse(201, headers, body)
     
+    @staticmethod
+    def create_202_response(body, headers=None):
+        """202 Accepted 응답 생성 헬퍼 메소드 (처리는 백그라운드에서 계속)"""
+        return HTTPResponse(202, {'Content-Type': 'application/json', **(headers or {})}, body)
+    
+    @staticmethod
+    def create_304_response(headers=None):
+        """304 Not Modified 응답 생성 헬퍼 메소드 (바디 없음, 검증 헤더만 포함)"""
+        return HTTPResponse(304, dict(headers or {}), b'')
+    
     @staticmethod
     def create_400_response(message='Bad Request'):
         """400 Bad Request 응답 생성 헬퍼 메소드"""
         headers = {'Content-Type': 'text/plain'}
         return HTTPResponse(400, headers, message)
     
+    @staticmethod
+    def create_403_response(message='Forbidden'):
+        """403 Forbidden 응답 생성 헬퍼 메소드"""
+        headers = {'Content-Type': 'text/plain'}
+        return HTTPResponse(403, headers, message)
+    
     @staticmethod
     def create_404_response(message='Not Found'):
         """404 Not Found 응답 생성 헬퍼 메소드"""
         headers = {'Content-Type': 'text/plain'}
         return HTTPResponse(404, headers, message)
     
+    @staticmethod
+    def create_405_response(allow):
+        """405 Method Not Allowed 응답 생성 헬퍼 메소드 (Allow 헤더에 허용 메소드 목록)"""
+        headers = {'Content-Type': 'text/plain', 'Allow': allow}
+        return HTTPResponse(405, headers, 'Method Not Allowed')
+    
+    @staticmethod
+    def create_409_response(message='Conflict'):
+        """409 Conflict 응답 생성 헬퍼 메소드"""
+        headers = {'Content-Type': 'text/plain'}
+        return HTTPResponse(409, headers, message)
+    
+    @staticmethod
+    def create_413_response(message='Payload Too Large'):
+        """413 Payload Too Large 응답 생성 헬퍼 메소드"""
+        headers = {'Content-Type': 'text/plain'}
+        return HTTPResponse(413, headers, message)
+    
+    @staticmethod
+    def create_431_response(message='Request Header Fields Too Large'):
+        """431 Request Header Fields Too Large 응답 생성 헬퍼 메소드"""
+        headers = {'Content-Type': 'text/plain'}
+        return HTTPResponse(431, headers, message)
+    
+    @staticmethod
+    def create_416_response(size):
+        """416 Range Not Satisfiable 응답 생성 헬퍼 메소드 (Content-Range에 전체 크기 표시)"""
+        headers = {'Content-Type': 'text/plain', 'Content-Range': f'bytes */{size}'}
+        return HTTPResponse(416, headers, 'Range Not Satisfiable')
+    
     @staticmethod
     def create_500_response(message='Internal Server Error'):
         """500 Internal Server Error 응답 생성 헬퍼 메소드"""
         headers = {'Content-Type': 'text/plain'}
         return HTTPResponse(500, headers, message)
+    
+    @staticmethod
+    def create_503_response(message='Service Unavailable'):
+        """503 Service Unavailable 응답 생성 헬퍼 메소드"""
+        headers = {'Content-Type': 'text/plain', 'Connection': 'close', 'Retry-After': '1'}
+        return HTTPResponse(503, headers, message)
@@ -0,0 +1,298 @@
+"""
+서버 메트릭 모듈
+요청 수, 전송 바이트, 단계별 처리 시간 등을 수집해 Prometheus 텍스트 형식으로 내보냅니다.
+
+- 기록은 스레드별 저장소(threading.local)에만 하므로 잠금이 없음
+- 스레드별 값은 조회(GET /_metrics) 때만 합산
+- 히스토그램은 고정 버킷 (METRICS_LATENCY_BUCKETS)
+- 현재 값(활성 연결 수, 대기 큐 길이)은 조회 때 호출하는 함수로 계산
+- prefork: 워커마다 share()로 METRICS_SHARE_INTERVAL마다 공유 디렉토리에 합산 결과를 쓰고,
+  조회를 받은 워커가 다른 워커의 값을 더해 모든 워커의 합계를 출력
+  (다른 워커의 값은 최대 METRICS_SHARE_INTERVAL 전 값, 종료된 워커의 카운터/히스토그램은 유지)
+"""
+
+import sys
+import os
+import json
+import threading
+from bisect import bisect_left
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.HTTPConstants import METRICS_LATENCY_BUCKETS, METRICS_SHARE_INTERVAL
+
+# 메트릭 이름 → (종류, 설명) (출력 순서)
+METRICS = {
+    'http_requests_total': ('counter', 'HTTP requests by method, route and status'),
+    'http_parse_errors_total': ('counter', 'Requests rejected by the parser, by status'),
+    'http_request_bytes_total': ('counter', 'Request bytes received (request line, headers and body)'),
+    'http_response_bytes_total': ('counter', 'Response bytes produced (headers and body, streamed bodies as sent)'),
+    'http_connections_total': ('counter', 'Accepted client connections'),
+    'http_connections_closed_total': ('counter', 'Closed client connections'),
+    'http_active_connections': ('gauge', 'Open client connections'),
+    'http_queue_depth': ('gauge', 'Connections or request batches waiting for a worker thread'),
+    'http_request_duration_seconds': ('histogram', 'Time from handler start to serialized response'),
+    'http_phase_duration_seconds': ('histogram', 'Time spent per request phase (parse, handle, serialize, send)'),
+}
+
+
+def _escape(value):
+    """라벨 값 이스케이프 (\\, ", 줄바꿈)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=''):
+    """(('method', 'GET'), ...) → '{method="GET",...}'"""
+    items = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        items.append(extra)
+    return '{' + ','.join(items) + '}' if items else ''
+
+
+def _format_value(value):
+    """정수는 그대로, 실수는 repr (Prometheus 숫자 형식)"""
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _is_alive(pid):
+    """프로세스가 실행 중인지 확인 (종료된 워커의 현재 값 메트릭은 합산하지 않음)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge_histogram(histograms, key, histogram):
+    """히스토그램 하나를 합산 결과에 더함 (처음 보는 키면 그대로 저장)"""
+    merged = histograms.get(key)
+    if merged is None:
+        histograms[key] = histogram
+    else:
+        for index, value in enumerate(histogram):
+            merged[index] += value
+
+
+class _ThreadMetrics:
+    """스레드 하나의 기록 (해당 스레드만 값을 바꿈)"""
+    
+    __slots__ = ('counters', 'histograms')
+    
+    def __init__(self):
+        self.counters = {}      # (이름, 라벨) → 값
+        self.histograms = {}    # (이름, 라벨) → [버킷별 개수..., +Inf 개수, 합계]
+
+
+class Metrics:
+    """스레드별로 기록하고 조회 때 합산하는 메트릭 저장소"""
+    
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS):
+        """
+        Args:
+            buckets (tuple): 히스토그램 버킷 경계 (초, 오름차순)
+        """
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._threads = []          # 모든 스레드의 _ThreadMetrics (종료된 스레드 값도 유지)
+        self._lock = threading.Lock()
+        self._gauges = {}           # 이름 → 현재 값을 돌려주는 함수
+        self._share_dir = None      # prefork: 워커들이 메트릭을 공유하는 디렉토리
+        self._share_stop = threading.Event()
+        self._share_thread = None
+    
+    def _stats(self):
+        """현재 스레드의 저장소 (처음 기록할 때 한 번만 잠금을 잡고 등록)"""
+        try:
+            return self._local.stats
+        except AttributeError:
+            stats = _ThreadMetrics()
+            with self._lock:
+                self._threads.append(stats)
+            self._local.stats = stats
+            return stats
+    
+    def inc(self, name, labels=(), value=1):
+        """
+        카운터 증가
+        
+        Args:
+            name (str): 메트릭 이름 (METRICS에 정의된 이름)
+            labels (tuple): ((라벨 이름, 값), ...) (같은 메트릭은 같은 라벨 순서로)
+            value (int): 증가량
+        """
+        counters = self._stats().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+    
+    def observe(self, name, labels, seconds):
+        """
+        히스토그램에 값 하나 기록
+        
+        Args:
+            name (str): 메트릭 이름
+            labels (tuple): ((라벨 이름, 값), ...)
+            seconds (float): 기록할 시간 (초)
+        """
+        histograms = self._stats().histograms
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        histogram[bisect_left(self.buckets, seconds)] += 1
+        histogram[-1] += seconds
+    
+    def gauge(self, name, func):
+        """현재 값 메트릭 등록 (조회 때 func()를 호출)"""
+        self._gauges[name] = func
+    
+    def total(self, name):
+        """카운터의 모든 스레드·라벨 합계"""
+        with self._lock:
+            threads = list(self._threads)
+        return sum(
+            value for stats in threads
+            for (key_name, _), value in stats.counters.copy().items() if key_name == name
+        )
+    
+    def _collect(self):
+        """
+        이 프로세스의 모든 스레드 기록 합산
+        
+        Returns:
+            tuple: (카운터 dict, 히스토그램 dict, 현재 값 dict)
+        """
+        with self._lock:
+            threads = list(self._threads)
+        
+        counters = {}
+        histograms = {}
+        for stats in threads:
+            # dict.copy()는 GIL 안에서 한 번에 실행되므로 기록 중인 스레드와 충돌하지 않음
+            for key, value in stats.counters.copy().items():
+                counters[key] = counters.get(key, 0) + value
+            for key, histogram in stats.histograms.copy().items():
+                _merge_histogram(histograms, key, list(histogram))
+        gauges = {name: func() for name, func in self._gauges.items()}
+        return counters, histograms, gauges
+    
+    def share(self, directory, interval=METRICS_SHARE_INTERVAL):
+        """
+        prefork 워커 간 메트릭 공유 시작 (워커 프로세스에서 서버 시작 전에 한 번)
+        
+        interval마다 합산 결과를 directory/metrics-<pid>.json에 쓰고,
+        render()는 다른 워커가 쓴 파일의 값을 함께 합산합니다.
+        
+        Args:
+            directory (str): 모든 워커가 함께 쓰는 디렉토리
+            interval (float): 기록 주기 (초)
+        """
+        self._share_dir = directory
+        self._share_thread = threading.Thread(
+            target=self._share_loop, args=(interval,), name='metrics-share', daemon=True
+        )
+        self._share_thread.start()
+    
+    def _share_loop(self, interval):
+        """공유 스레드: 주기적으로 이 워커의 메트릭 기록"""
+        while not self._share_stop.wait(interval):
+            self._write_shared()
+    
+    def _write_shared(self):
+        """이 워커의 메트릭을 공유 파일로 저장 (다 쓴 뒤 이름을 바꿔 읽는 쪽이 쓰다 만 파일을 보지 않음)"""
+        counters, histograms, gauges = self._collect()
+        data = {
+            'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+            'histograms': [[name, labels, histogram] for (name, labels), histogram in histograms.items()],
+            'gauges': gauges,
+        }
+        path = os.path.join(self._share_dir, f'metrics-{os.getpid()}.json')
+        try:
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass  # 종료 중 공유 디렉토리가 삭제됨
+    
+    def _read_shared(self):
+        """다른 워커가 쓴 메트릭 파일 읽기 → [(pid, 데이터), ...]"""
+        try:
+            names = os.listdir(self._share_dir)
+        except OSError:
+            return []
+        own = f'metrics-{os.getpid()}.json'
+        peers = []
+        for name in names:
+            if not (name.startswith('metrics-') and name.endswith('.json')) or name == own:
+                continue
+            try:
+                with open(os.path.join(self._share_dir, name), 'r', encoding='utf-8') as f:
+                    peers.append((int(name[len('metrics-'):-len('.json')]), json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return peers
+    
+    def close(self):
+        """공유 중지 후 마지막 값 기록 (종료된 워커의 카운터도 다른 워커의 조회 결과에 남도록)"""
+        if self._share_thread is None:
+            return
+        self._share_stop.set()
+        self._share_thread.join()
+        self._share_thread = None
+        self._write_shared()
+    
+    def render(self):
+        """
+        모든 스레드의 기록을 합산해 Prometheus 텍스트 형식으로 출력
+        (share()를 호출했으면 다른 워커 프로세스의 기록도 합산)
+        
+        Returns:
+            str: text/plain; version=0.0.4 형식의 메트릭
+        """
+        counters, histograms, gauges = self._collect()
+        if self._share_dir is not None:
+            for pid, peer in self._read_shared():
+                for name, labels, value in peer['counters']:
+                    key = (name, tuple(tuple(label) for label in labels))
+                    counters[key] = counters.get(key, 0) + value
+                for name, labels, histogram in peer['histograms']:
+                    _merge_histogram(histograms, (name, tuple(tuple(label) for label in labels)), histogram)
+                if _is_alive(pid):
+                    for name, value in peer['gauges'].items():
+                        gauges[name] = gauges.get(name, 0) + value
+        
+        lines = []
+        for name, (kind, description) in METRICS.items():
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'gauge':
+                if name in gauges:
+                    lines.append(f'{name} {_format_value(gauges[name])}')
+            elif kind == 'counter':
+                samples = sorted((labels, value) for (key_name, labels), value in counters.items()
+                                 if key_name == name)
+                for labels, value in samples:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+            else:
+                samples = sorted((labels, histogram) for (key_name, labels), histogram in histograms.items()
+                                 if key_name == name)
+                for labels, histogram in samples:
+                    lines.extend(self._render_histogram(name, labels, histogram))
+        return '\n'.join(lines) + '\n'
+    
+    def _render_histogram(self, name, labels, histogram):
+        """히스토그램 하나 → _bucket(누적) / _sum / _count 줄"""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, histogram):
+            cumulative += count
+            le = _format_labels(labels, f'le="{_format_value(float(bound))}"')
+            lines.append(f'{name}_bucket{le} {cumulative}')
+        cumulative += histogram[len(self.buckets)]
+        le = _format_labels(labels, 'le="+Inf"')
+        lines.append(f'{name}_bucket{le} {cumulative}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(histogram[-1])}')
+        lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+        return lines
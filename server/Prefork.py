@@ -0,0 +1,364 @@
+"""
+멀티 프로세스(prefork) 실행 모듈
+워커 프로세스 여러 개가 SO_REUSEPORT로 같은 포트에서 연결을 나눠 받아 여러 CPU 코어를 사용합니다.
+
+- 감독(supervisor) 프로세스: 데이터 프로세스와 워커 프로세스를 fork하고, 비정상 종료된 프로세스를 다시 실행
+- 워커 프로세스: 각자 서버(thread / eventloop 엔진)를 실행하고 정적 파일, 파싱, 라우팅을 직접 처리
+- 데이터 프로세스: 사용자 데이터(UserStore)를 가진 유일한 프로세스
+  워커는 라우트 테이블에 등록된 요청(/users)을 Unix 소켓으로 전달하므로
+  어느 워커로 연결되어도 같은 데이터를 보고, 쓰기 순서와 로그 기록은 한 곳에서 관리됩니다.
+- 종료: SIGTERM / Ctrl+C → 워커를 먼저 정상 종료한 뒤 데이터 프로세스가 로그를 기록하고 종료
+"""
+
+import sys
+import os
+import time
+import queue
+import signal
+import shutil
+import tempfile
+import threading
+import traceback
+from multiprocessing.connection import Listener, Client
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.HTTPConstants import (
+    WORKER_RESTART_DELAY, WORKER_MAX_FAST_EXITS, WORKER_SHUTDOWN_TIMEOUT, DATA_PROCESS_START_TIMEOUT
+)
+from server.HTTPHandler import HTTPHandler
+from server.HTTPResponse import HTTPResponse
+
+
+def _raise_interrupt(signum, frame):
+    """SIGTERM을 Ctrl+C와 같이 처리 (서버 루프의 KeyboardInterrupt 종료 경로 사용)"""
+    raise KeyboardInterrupt
+
+
+class ForwardingHandler(HTTPHandler):
+    """
+    워커 프로세스용 요청 처리기
+    
+    라우트 테이블에 등록된 요청은 데이터 프로세스로 전달하고,
+    정적 파일 / 405 / 404 응답은 워커에서 직접 만듭니다.
+    """
+    
+    def __init__(self, address, authkey, **handler_options):
+        """
+        Args:
+            address (str): 데이터 프로세스의 Unix 소켓 경로
+            authkey (bytes): 연결 인증 키
+            **handler_options: HTTPHandler 생성자 인자
+        """
+        self.address = address
+        self.authkey = authkey
+        # 데이터 프로세스 연결 풀 (요청마다 새로 연결하지 않음, 최근에 쓴 연결부터 재사용)
+        self._connections = queue.LifoQueue()
+        super().__init__(**handler_options)
+    
+    def _open_store(self, durability, flush_interval, compact_threshold, index_fields):
+        """사용자 데이터는 데이터 프로세스가 담당"""
+        return None
+    
+    def close(self):
+        """풀의 연결 닫기"""
+        while True:
+            try:
+                conn = self._connections.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+    
+    def handle_request(self, method, path, headers, body):
+        """라우트가 있으면 데이터 프로세스로 전달, 없으면 HTTPHandler와 같이 처리"""
+        handler, _, _ = self.routes.resolve(method, path.partition('?')[0])
+        if handler is None:
+            return super().handle_request(method, path, headers, body)
+        
+        try:
+            response = self._forward((method, path, headers, bytes(body)))
+        except (OSError, EOFError) as e:
+            print(f"❌ 데이터 프로세스 연결 실패: {e}")
+            response = HTTPResponse.create_503_response('User data service unavailable')
+        response.route = self.routes.patterns[handler]
+        return response
+    
+    def _acquire(self):
+        """풀에서 연결 꺼내기 (없으면 새로 연결) → (연결, 풀에서 꺼냈는지)"""
+        try:
+            return self._connections.get_nowait(), True
+        except queue.Empty:
+            return Client(self.address, family='AF_UNIX', authkey=self.authkey), False
+    
+    def _forward(self, message):
+        """
+        요청을 데이터 프로세스로 보내고 응답 받기
+        
+        풀에 있던 연결이 끊겨 있으면(데이터 프로세스 재시작) 새 연결로 한 번만 다시 보냅니다.
+        요청을 보낸 뒤의 실패는 처리 여부를 알 수 없으므로 다시 보내지 않습니다.
+        """
+        while True:
+            conn, pooled = self._acquire()
+            try:
+                conn.send(message)
+                break
+            except OSError:
+                conn.close()
+                if not pooled:
+                    raise
+        
+        try:
+            status_code, headers, body, streaming = conn.recv()
+        except BaseException:
+            conn.close()
+            raise
+        
+        if streaming:
+            return HTTPResponse(status_code, headers, body, self._relay_stream(conn))
+        self._connections.put(conn)
+        return HTTPResponse(status_code, headers, body)
+    
+    def _relay_stream(self, conn):
+        """데이터 프로세스가 보내는 스트리밍 응답 조각 전달 (빈 조각이 끝, 끝까지 받은 연결만 재사용)"""
+        completed = False
+        try:
+            while True:
+                chunk = conn.recv_bytes()
+                if not chunk:
+                    completed = True
+                    return
+                yield chunk
+        finally:
+            if completed:
+                self._connections.put(conn)
+            else:
+                conn.close()
+
+
+def _serve_connection(handler, conn):
+    """데이터 프로세스: 워커 연결 하나의 요청을 차례로 처리"""
+    try:
+        while True:
+            try:
+                method, path, headers, body = conn.recv()
+            except EOFError:
+                return
+            
+            try:
+                response = handler.handle_request(method, path, headers, body)
+            except Exception as e:
+                print(f"❌ 요청 처리 에러: {e}")
+                response = HTTPResponse.create_500_response()
+            
+            streaming = response.stream is not None
+            conn.send((response.status_code, response.headers, response.get_body_bytes(), streaming))
+            if streaming:
+                for chunk in response.stream:
+                    if chunk:
+                        conn.send_bytes(chunk)
+                conn.send_bytes(b'')
+    except Exception as e:
+        print(f"❌ 워커 연결 에러: {e}")
+    finally:
+        conn.close()
+
+
+def _run_data_process(address, authkey, handler_options):
+    """데이터 프로세스: 사용자 저장소를 열고 워커의 요청을 처리 (워커 연결마다 스레드 하나)"""
+    handler = HTTPHandler(**handler_options)
+    # 비정상 종료로 남은 소켓 파일 제거 후 리스닝 (소켓 파일이 생기면 준비 완료)
+    if os.path.exists(address):
+        os.unlink(address)
+    listener = Listener(address, family='AF_UNIX', authkey=authkey)
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except OSError as e:
+                print(f"❌ 워커 연결 수락 에러: {e}")
+                continue
+            threading.Thread(target=_serve_connection, args=(handler, conn), daemon=True).start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        handler.close()
+
+
+class PreforkSupervisor:
+    """데이터 프로세스 1개 + 워커 프로세스 N개를 실행하고 관리하는 감독 프로세스"""
+    
+    def __init__(self, workers, handler_options, server_factory):
+        """
+        Args:
+            workers (int): 워커 프로세스 수
+            handler_options (dict): HTTPHandler 생성자 인자 (데이터 프로세스와 워커가 같은 설정 사용)
+            server_factory (callable): 요청 처리기 → SO_REUSEPORT 서버 객체 (워커 프로세스에서 호출)
+        """
+        self.workers = workers
+        self.handler_options = handler_options
+        self.server_factory = server_factory
+        
+        self.socket_dir = None
+        self.address = None
+        self.authkey = os.urandom(32)
+        
+        self.data_pid = None
+        self.worker_pids = {}   # pid → (워커 번호, 시작 시각)
+        self.fast_exits = {}    # 워커 번호 → 시작 직후 연속으로 종료된 횟수
+    
+    def run(self):
+        """프로세스 실행 후 종료 신호를 받을 때까지 비정상 종료된 프로세스 재실행"""
+        signal.signal(signal.SIGTERM, _raise_interrupt)
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self._forward_signal)
+        self.socket_dir = tempfile.mkdtemp(prefix='http-prefork-')
+        self.address = os.path.join(self.socket_dir, 'data.sock')
+        try:
+            self._start_data_process()
+            for index in range(self.workers):
+                self._start_worker(index)
+            print(f"🧩 prefork: 워커 프로세스 {self.workers}개 + 데이터 프로세스 (감독 pid {os.getpid()})")
+            
+            while True:
+                pid, status = os.wait()
+                self._on_exit(pid, status)
+        except KeyboardInterrupt:
+            print("\n\n⚠️  서버 종료 중...")
+        finally:
+            self.shutdown()
+    
+    def _forward_signal(self, signum, frame):
+        """SIGUSR1을 모든 워커에 전달 (워커마다 각자 프로파일 파일을 저장)"""
+        for pid in list(self.worker_pids):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+    
+    def _fork(self, target, *args):
+        """자식 프로세스 실행 (Ctrl+C는 감독 프로세스만 처리, SIGTERM은 종료 요청)"""
+        pid = os.fork()
+        if pid:
+            return pid
+        
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, _raise_interrupt)
+        if hasattr(signal, 'SIGUSR1'):
+            # 워커는 서버 시작 때 프로파일러를 등록 (데이터 프로세스는 무시)
+            signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+        code = 0
+        try:
+            target(*args)
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+    
+    def _start_data_process(self):
+        """데이터 프로세스 실행 후 저장소 복구가 끝나 소켓이 열릴 때까지 대기"""
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        self.data_pid = self._fork(_run_data_process, self.address, self.authkey, self.handler_options)
+        
+        deadline = time.monotonic() + DATA_PROCESS_START_TIMEOUT
+        while not os.path.exists(self.address):
+            pid, status = os.waitpid(self.data_pid, os.WNOHANG)
+            if pid:
+                self.data_pid = None
+                raise RuntimeError(f'Data process exited during startup (status {status})')
+            if time.monotonic() > deadline:
+                raise RuntimeError('Data process did not become ready in time')
+            time.sleep(0.05)
+        print(f"🗄️  데이터 프로세스 준비 완료 (pid {self.data_pid})")
+    
+    def _start_worker(self, index):
+        """워커 프로세스 실행"""
+        pid = self._fork(self._run_worker)
+        self.worker_pids[pid] = (index, time.monotonic())
+    
+    def _run_worker(self):
+        """워커 프로세스: 데이터 프로세스로 요청을 전달하는 처리기로 서버 실행"""
+        handler = ForwardingHandler(self.address, self.authkey, **self.handler_options)
+        server = self.server_factory(handler)
+        # GET /_metrics를 받은 워커가 모든 워커의 메트릭을 합산하도록 공유
+        server.metrics.share(self.socket_dir)
+        try:
+            server.start()
+        finally:
+            server.metrics.close()
+    
+    def _on_exit(self, pid, status):
+        """
+        종료된 자식 프로세스 다시 실행 (시작 직후 종료가 반복되면 잠시 대기)
+        
+        bind 실패처럼 다시 실행해도 같은 이유로 바로 종료되는 워커를 계속 띄우지 않도록
+        시작 직후 종료가 WORKER_MAX_FAST_EXITS번 연속되면 RuntimeError로 전체 서버를 종료합니다.
+        """
+        if pid == self.data_pid:
+            print(f"❌ 데이터 프로세스 종료 (status {status}) → 재시작")
+            self._start_data_process()
+            return
+        
+        entry = self.worker_pids.pop(pid, None)
+        if entry is None:
+            return
+        index, started_at = entry
+        if time.monotonic() - started_at < WORKER_RESTART_DELAY:
+            self.fast_exits[index] = self.fast_exits.get(index, 0) + 1
+            if self.fast_exits[index] >= WORKER_MAX_FAST_EXITS:
+                print(f"❌ 워커 {index} 종료 (pid {pid}, status {status}) → 시작 직후 종료가 반복되어 재시작 중단")
+                raise RuntimeError(
+                    f'Worker {index} exited right after start {self.fast_exits[index]} times in a row'
+                )
+            print(f"❌ 워커 {index} 종료 (pid {pid}, status {status}) → 재시작")
+            time.sleep(WORKER_RESTART_DELAY)
+        else:
+            self.fast_exits[index] = 0
+            print(f"❌ 워커 {index} 종료 (pid {pid}, status {status}) → 재시작")
+        self._start_worker(index)
+    
+    def shutdown(self):
+        """워커 → 데이터 프로세스 순서로 정상 종료 (시간 안에 끝나지 않은 워커는 SIGKILL)"""
+        self._stop(list(self.worker_pids), WORKER_SHUTDOWN_TIMEOUT)
+        self.worker_pids.clear()
+        if self.data_pid is not None:
+            # 데이터 프로세스는 저장되지 않은 로그를 기록해야 하므로 끝날 때까지 대기
+            self._stop([self.data_pid], None)
+            self.data_pid = None
+        if self.socket_dir is not None:
+            shutil.rmtree(self.socket_dir, ignore_errors=True)
+            self.socket_dir = None
+        print("✅ 서버 종료 완료")
+    
+    def _stop(self, pids, timeout):
+        """SIGTERM을 보내고 종료 대기 (timeout이 None이면 끝날 때까지)"""
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        remaining = set(pids)
+        while remaining:
+            for pid in list(remaining):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    remaining.discard(pid)
+            if not remaining:
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                for pid in remaining:
+                    print(f"⚠️  워커 강제 종료 (pid {pid})")
+                    os.kill(pid, signal.SIGKILL)
+                    os.waitpid(pid, 0)
+                break
+            time.sleep(0.05)
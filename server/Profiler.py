@@ -0,0 +1,221 @@
+"""
+실행 중 프로파일러 모듈
+서버를 다시 시작하지 않고 정해진 시간 동안만 요청 처리를 프로파일링합니다.
+
+- 'stack': 샘플링 스레드가 PROFILE_SAMPLE_INTERVAL마다 요청을 처리 중인 스레드의 스택을 수집
+           → collapsed stack 텍스트 (flamegraph.pl / speedscope 입력 형식)
+- 'cprofile': 프로파일링 중에 시작한 handle_request 호출을 cProfile로 감싸 합산
+           → pstats 덤프 (python -m pstats, snakeviz 등으로 확인)
+- 시작 방법: SIGUSR1 신호 또는 GET /_profile?seconds=N&mode=stack
+  프로파일링은 별도 스레드에서 실행되고 결과는 output_dir에 파일로 저장 (GET /_profile/<파일 이름>으로 조회)
+- 꺼져 있을 때는 요청마다 active 속성 확인 한 번 외에 추가 작업 없음
+"""
+
+import sys
+import os
+import time
+import signal
+import marshal
+import cProfile
+import pstats
+import threading
+import re
+from collections import Counter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.HTTPConstants import (
+    PROFILE_MODES, DEFAULT_PROFILE_MODE, DEFAULT_PROFILE_SECONDS, PROFILE_SAMPLE_INTERVAL
+)
+
+
+# start()가 만드는 결과 파일 이름 (예: profile-1234-20260101-120000-1.folded)
+_RESULT_NAME = re.compile(r'profile-\d+-\d{8}-\d{6}-\d+\.(?:folded|prof)')
+
+
+def _frame_name(code):
+    """코드 객체 → collapsed stack의 프레임 이름 (예: 'handle_request (HTTPHandler.py:382)')"""
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+class Profiler:
+    """한 번에 하나의 프로파일링 세션만 실행하는 요청 프로파일러"""
+    
+    def __init__(self, output_dir=None, interval=PROFILE_SAMPLE_INTERVAL, switch_interval=None):
+        """
+        Args:
+            output_dir (str): 신호로 시작한 프로파일 결과를 저장할 디렉토리 (기본값: 현재 디렉토리)
+            interval (float): 'stack' 모드의 스택 수집 주기 (초)
+            switch_interval (float): 'stack' 모드 동안 사용할 GIL 전환 주기 (초, None이면 바꾸지 않음)
+                기본 전환 주기(5ms)에서는 짧은 핸들러가 I/O로 GIL을 놓을 때만 샘플링되어 잘 잡히지 않습니다.
+                값을 줄이면 더 많이 잡히지만 프로세스 전체의 스레드 전환이 늘어나
+                측정하려는 요청 지연 시간도 함께 달라지므로 필요할 때만 지정합니다.
+        """
+        self.output_dir = output_dir or os.getcwd()
+        self.interval = interval
+        self.switch_interval = switch_interval
+        self.active = False     # 요청 처리 스레드가 확인하는 유일한 값 (꺼져 있으면 False)
+        
+        self._lock = threading.Lock()
+        self._mode = None
+        self._profiles = []     # 'cprofile': 요청별 cProfile.Profile
+        self._stacks = Counter()    # 'stack': collapsed stack → 샘플 수
+        self._busy = {}         # 'stack': 요청을 처리 중인 스레드 ident → 처리 중인 요청 수
+        self._sampler = None
+        self._saved_switch_interval = None
+        self._runs = 0          # 결과 파일 이름이 겹치지 않도록 붙이는 실행 번호
+    
+    def call(self, func, *args):
+        """
+        프로파일링 중인 요청 처리 (active일 때만 호출)
+        
+        Args:
+            func (callable): 요청 처리 함수
+            *args: 함수 인자
+        
+        Returns:
+            func의 반환값
+        """
+        if self._mode == 'cprofile':
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # 다른 스레드의 프로파일러가 실행 중 (Python 3.12+는 동시에 하나만 가능) → 이 요청은 제외
+                return func(*args)
+            try:
+                return func(*args)
+            finally:
+                profile.disable()
+                with self._lock:
+                    if self.active:
+                        self._profiles.append(profile)
+        
+        ident = threading.get_ident()
+        with self._lock:
+            self._busy[ident] = self._busy.get(ident, 0) + 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                count = self._busy.pop(ident) - 1
+                if count:
+                    self._busy[ident] = count
+    
+    def start(self, seconds=DEFAULT_PROFILE_SECONDS, mode=DEFAULT_PROFILE_MODE):
+        """
+        백그라운드 스레드에서 seconds 동안 프로파일링 후 결과를 output_dir에 파일로 저장
+        
+        호출한 스레드(요청 처리 스레드 / 신호 처리)는 프로파일링이 끝나기를 기다리지 않습니다.
+        결과 파일은 다 쓴 뒤에 이름을 바꿔 만들므로, 파일이 보이면 결과가 완성된 것입니다.
+        
+        Args:
+            seconds (float): 프로파일링 시간 (초)
+            mode (str): 'stack' 또는 'cprofile'
+        
+        Returns:
+            str: 결과 파일 이름 (output_dir 기준, 이미 다른 프로파일링이 실행 중이면 None)
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f'Unknown profile mode: {mode}')
+        with self._lock:
+            if self.active:
+                return None
+            self._mode = mode
+            self._profiles = []
+            self._stacks = Counter()
+            self._runs += 1
+            name = (f'profile-{os.getpid()}-{time.strftime("%Y%m%d-%H%M%S")}-{self._runs}.'
+                    f'{"folded" if mode == "stack" else "prof"}')
+            self.active = True
+        
+        self._saved_switch_interval = sys.getswitchinterval()
+        if mode == 'stack':
+            if self.switch_interval is not None:
+                # 지정했을 때만 GIL 전환 주기 변경 (프로세스 전체에 적용됨)
+                sys.setswitchinterval(self.switch_interval)
+            self._sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+            self._sampler.start()
+        threading.Thread(
+            target=self._finish, args=(seconds, mode, name), name='profile-run', daemon=True
+        ).start()
+        return name
+    
+    def _finish(self, seconds, mode, name):
+        """프로파일링 스레드: seconds 후 수집을 멈추고 결과 파일 저장"""
+        try:
+            time.sleep(seconds)
+        finally:
+            with self._lock:
+                self.active = False
+            if self._sampler is not None:
+                self._sampler.join()
+                self._sampler = None
+            sys.setswitchinterval(self._saved_switch_interval)
+        
+        path = os.path.join(self.output_dir, name)
+        try:
+            with open(path + '.tmp', 'wb') as f:
+                f.write(self._result(mode))
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print(f"❌ 프로파일 저장 실패: {e}")
+            return
+        print(f"🔬 프로파일 저장: {path}")
+    
+    def result_path(self, name):
+        """
+        결과 파일 이름 → 경로 (start()가 만드는 이름 형식이 아니면 None, 다른 경로 접근 방지)
+        
+        prefork 워커들은 같은 output_dir을 쓰므로 어느 워커가 저장한 결과든 찾을 수 있습니다.
+        """
+        if not _RESULT_NAME.fullmatch(name):
+            return None
+        return os.path.join(self.output_dir, name)
+    
+    def _sample(self):
+        """샘플링 스레드: 요청을 처리 중인 스레드의 스택을 주기적으로 수집"""
+        while self.active:
+            with self._lock:
+                busy = list(self._busy)
+            frames = sys._current_frames()
+            for ident in busy:
+                frame = frames.get(ident)
+                names = []
+                while frame is not None:
+                    names.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                if names:
+                    self._stacks[';'.join(reversed(names))] += 1
+            del frames
+            time.sleep(self.interval)
+    
+    def _result(self, mode):
+        """수집한 결과 → bytes"""
+        if mode == 'stack':
+            lines = [f'{stack} {count}' for stack, count in self._stacks.most_common()]
+            return ('\n'.join(lines) + '\n').encode('utf-8') if lines else b''
+        
+        stats = pstats.Stats()
+        for profile in self._profiles:
+            stats.add(profile)
+        self._profiles = []
+        # Stats.dump_stats()와 같은 형식 (pstats.Stats(파일 경로)로 다시 읽을 수 있음)
+        return marshal.dumps(stats.stats)
+    
+    def install_signal(self):
+        """
+        SIGUSR1을 받으면 기본 시간/모드로 프로파일링 후 파일로 저장 (메인 스레드에서 호출)
+        
+        신호 처리 함수에서는 스레드만 시작하고 바로 반환합니다. (SIGUSR1이 없는 Windows에서는 무시)
+        """
+        if not hasattr(signal, 'SIGUSR1'):
+            return
+        
+        def on_signal(signum, frame):
+            threading.Thread(target=self._start_from_signal, name='profile-signal', daemon=True).start()
+        signal.signal(signal.SIGUSR1, on_signal)
+    
+    def _start_from_signal(self):
+        """SIGUSR1: 기본 시간/모드로 프로파일링 시작"""
+        if self.start() is None:
+            print("⚠️  프로파일링이 이미 실행 중")
@@ -0,0 +1,133 @@
+"""
+요청 라우터 모듈
+등록된 경로 패턴을 세그먼트 트라이로 만들어 요청 경로와 처리 함수를 연결합니다.
+
+- 패턴 예: /users, /users/{user_id:int} (변환기: int, str)
+- 매칭 비용은 경로의 세그먼트 수에만 비례 (등록된 라우트 수와 무관)
+- 경로는 있지만 메소드가 등록되지 않았으면 허용 메소드(Allow)를 돌려줘 405 응답
+- GET을 등록하면 HEAD도 같은 처리 함수로 허용
+"""
+
+
+def _to_int(segment):
+    """정수 세그먼트 변환 (ASCII 숫자만 허용, '+1'이나 ' 1' 등은 ValueError)"""
+    if not (segment.isascii() and segment.isdigit()):
+        raise ValueError(f'Not an integer segment: {segment}')
+    return int(segment)
+
+
+# 경로 파라미터 변환기 (ValueError가 나면 매칭 실패)
+CONVERTERS = {
+    'int': _to_int,
+    'str': str,
+}
+
+
+def _split(path):
+    """경로 → 세그먼트 리스트 (예: '/users/1' → ['users', '1'], '/' → [''])"""
+    return path.split('/')[1:]
+
+
+class _Node:
+    """트라이 노드: 고정 세그먼트 자식 + 파라미터 자식 하나 + 메소드별 처리 함수"""
+    
+    __slots__ = ('children', 'param', 'handlers', 'allow')
+    
+    def __init__(self):
+        self.children = {}      # 고정 세그먼트 → _Node
+        self.param = None       # (파라미터 이름, 변환기, _Node)
+        self.handlers = {}      # 메소드 → 처리 함수
+        self.allow = ''         # Allow 헤더 값 (등록 시 미리 계산)
+
+
+class Router:
+    """경로 패턴 → 처리 함수 라우트 테이블"""
+    
+    def __init__(self):
+        self._root = _Node()
+        self.patterns = {}      # 처리 함수 → 등록한 경로 패턴 (메트릭 라벨 등)
+    
+    def add(self, method, pattern, handler):
+        """
+        라우트 등록 (서버 시작 전에 한 번)
+        
+        Args:
+            method (str): HTTP 메소드
+            pattern (str): 경로 패턴 (예: '/users/{user_id:int}')
+            handler (callable): 처리 함수 (경로 파라미터는 키워드 인자로 전달)
+        
+        Raises:
+            ValueError: 알 수 없는 변환기, 같은 위치의 다른 파라미터, 중복 등록
+        """
+        node = self._root
+        for segment in _split(pattern):
+            if segment.startswith('{') and segment.endswith('}'):
+                name, _, kind = segment[1:-1].partition(':')
+                converter = CONVERTERS.get(kind or 'str')
+                if converter is None:
+                    raise ValueError(f'Unknown converter in {pattern}: {kind}')
+                if node.param is None:
+                    node.param = (name, converter, _Node())
+                elif node.param[0] != name or node.param[1] is not converter:
+                    raise ValueError(f'Conflicting path parameter in {pattern}: {segment}')
+                node = node.param[2]
+            else:
+                node = node.children.setdefault(segment, _Node())
+        
+        if method in node.handlers:
+            raise ValueError(f'Duplicate route: {method} {pattern}')
+        node.handlers[method] = handler
+        self.patterns[handler] = pattern
+        methods = set(node.handlers)
+        if 'GET' in methods:
+            methods.add('HEAD')
+        node.allow = ', '.join(sorted(methods))
+    
+    def route(self, method, pattern):
+        """
+        처리 함수 등록 데코레이터
+        
+        예:
+            @routes.route('GET', '/users')
+            def list_users(self, request): ...
+        """
+        def decorator(handler):
+            self.add(method, pattern, handler)
+            return handler
+        return decorator
+    
+    def resolve(self, method, path):
+        """
+        요청 경로에 맞는 처리 함수 찾기 (고정 세그먼트가 파라미터보다 우선)
+        
+        Args:
+            method (str): HTTP 메소드
+            path (str): 쿼리 문자열을 제외한 요청 경로
+        
+        Returns:
+            tuple: (처리 함수, 경로 파라미터 dict, Allow 헤더 값)
+                   경로가 없으면 (None, None, None),
+                   경로는 있지만 메소드가 없으면 (None, None, Allow 헤더 값)
+        """
+        node = self._root
+        params = {}
+        for segment in _split(path):
+            child = node.children.get(segment)
+            if child is None:
+                if node.param is None:
+                    return None, None, None
+                name, converter, child = node.param
+                try:
+                    params[name] = converter(segment)
+                except ValueError:
+                    return None, None, None
+            node = child
+        
+        if not node.handlers:
+            return None, None, None
+        handler = node.handlers.get(method)
+        if handler is None and method == 'HEAD':
+            handler = node.handlers.get('GET')
+        if handler is None:
+            return None, None, node.allow
+        return handler, params, node.allow
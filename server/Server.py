@@ -1,34 +1,461 @@
 """
-HTTP 소켓 서버 (멀티스레딩)
+HTTP 소켓 서버
 TCP 소켓을 사용하여 HTTP 요청을 받고 응답하는 서버입니다.
-각 클라이언트 연결을 별도의 스레드로 처리합니다.
+
+두 가지 엔진을 제공합니다.
+- HTTPServer: 고정 크기 워커 풀이 대기 큐에서 클라이언트 연결을 꺼내 처리 (블로킹)
+- EventLoopServer: selectors(epoll) 기반 단일 스레드 논블로킹 서버
 """
 
 import socket
 import threading
+import queue
+import selectors
+import argparse
+import time
+import hmac
+import json
+from urllib.parse import parse_qsl
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from common.HTTPConstants import DEFAULT_HOST, DEFAULT_PORT, BUFFER_SIZE
-from server.HTTPParser import HTTPParser
+from common.HTTPConstants import (
+    HTTP_METHODS, METRICS_PATH, SLOW_REQUEST_THRESHOLD, PROFILE_PATH, PROFILE_MODES,
+    DEFAULT_PROFILE_MODE, DEFAULT_PROFILE_SECONDS, PROFILE_MAX_SECONDS, DEFAULT_HOST, DEFAULT_PORT, BUFFER_SIZE,
+    DEFAULT_POOL_SIZE, DEFAULT_QUEUE_SIZE, POOL_SHUTDOWN_TIMEOUT, DEFAULT_REJECT_POLICY, REJECT_POLICIES,
+    SERVER_ENGINES, DEFAULT_ENGINE, DEFAULT_EXECUTOR_WORKERS, DEFAULT_WORKERS,
+    LOG_LEVELS, DEFAULT_LOG_LEVEL, LOG_FORMATS, DEFAULT_LOG_FORMAT, DEFAULT_LOG_SAMPLE_RATE,
+    DURABILITY_MODES, DEFAULT_DURABILITY, DEFAULT_FLUSH_INTERVAL, DEFAULT_COMPACT_THRESHOLD,
+    DEFAULT_INDEX_FIELDS, STATIC_CACHE_SIZE, STATIC_REVALIDATE_INTERVAL, DEFAULT_GZIP_LEVEL, GZIP_MIN_SIZE,
+    DEFAULT_KEEPALIVE_TIMEOUT, DEFAULT_MAX_KEEPALIVE_REQUESTS,
+    MAX_HEADER_SIZE, MAX_BODY_SIZE, STREAM_CHUNK_SIZE
+)
+from server.HTTPParser import HTTPParser, HTTPParseError, get_header
+from server.HTTPReader import HTTPReader
 from server.HTTPHandler import HTTPHandler
+from server.HTTPResponse import HTTPResponse, FileBody
+from server.Prefork import PreforkSupervisor
+from server.AccessLog import AccessLogger
+from server.Metrics import Metrics
+from server.Profiler import Profiler
+
+
+def _should_keep_alive(parsed):
+    """
+    요청의 HTTP 버전과 Connection 헤더로 연결 유지 여부 판단
+    
+    - HTTP/1.1: 기본 유지, 'Connection: close'이면 종료
+    - HTTP/1.0: 기본 종료, 'Connection: keep-alive'이면 유지
+    """
+    connection = get_header(parsed['headers'], 'Connection', '').lower()
+    if parsed['version'] == 'HTTP/1.0':
+        return 'keep-alive' in connection
+    return 'close' not in connection
+
+
+def _apply_connection_headers(response_obj, keep_alive, timeout=None, max_requests=None):
+    """응답에 Connection / Keep-Alive 헤더 설정"""
+    if keep_alive:
+        response_obj.set_header('Connection', 'keep-alive')
+        response_obj.set_header('Keep-Alive', f'timeout={int(timeout)}, max={max_requests}')
+    else:
+        response_obj.set_header('Connection', 'close')
+
+
+def _parse_error_response(error):
+    """HTTPParseError → 에러 응답 (이후 바이트를 신뢰할 수 없으므로 연결 종료)"""
+    if error.status_code == 413:
+        response_obj = HTTPResponse.create_413_response(error.message)
+    elif error.status_code == 431:
+        response_obj = HTTPResponse.create_431_response(error.message)
+    else:
+        response_obj = HTTPResponse.create_400_response(error.message)
+    _apply_connection_headers(response_obj, False)
+    return response_obj
+
+
+# sendmsg 한 번에 넘길 최대 버퍼 수 (리눅스 IOV_MAX)
+_IOV_MAX = 1024
+
+
+def _advance_buffers(buffers, sent):
+    """sendmsg로 sent bytes를 보낸 뒤 남은 버퍼 리스트 (memoryview 슬라이스라 복사 없음)"""
+    index = 0
+    while index < len(buffers) and sent >= len(buffers[index]):
+        sent -= len(buffers[index])
+        index += 1
+    remaining = buffers[index:]
+    if sent:
+        remaining[0] = remaining[0][sent:]
+    return remaining
+
+
+def _send_buffers(client_socket, buffers):
+    """
+    여러 버퍼를 하나로 합치지 않고 sendmsg(writev)로 모두 전송 (블로킹 소켓)
+    
+    sendmsg가 없는 플랫폼(Windows)에서는 합쳐서 sendall로 전송합니다.
+    """
+    if not hasattr(client_socket, 'sendmsg'):
+        client_socket.sendall(b''.join(buffers))
+        return
+    views = [memoryview(buffer) for buffer in buffers if buffer]
+    while views:
+        sent = client_socket.sendmsg(views[:_IOV_MAX])
+        views = _advance_buffers(views, sent)
+
 
+# 단계별 처리 시간 히스토그램 라벨
+_PHASE_PARSE = (('phase', 'parse'),)
+_PHASE_HANDLE = (('phase', 'handle'),)
+_PHASE_SERIALIZE = (('phase', 'serialize'),)
+_PHASE_SEND = (('phase', 'send'),)
 
-class HTTPServer:
-    """멀티스레딩 HTTP 서버"""
+
+def _server_timing(phases):
+    """단계별 시간 → Server-Timing 헤더 값 (ms, 예: 'read;dur=0.120, handle;dur=1.350')"""
+    return ', '.join([
+        f'{name};dur={duration / 1e6:.3f}' for name, duration in phases.items() if name != 'serialize'
+    ])
+
+
+def _body_size(buffers, response_obj):
+    """접근 로그/메트릭용 응답 바디 크기 (스트리밍 응답은 미리 알 수 없으므로 None)"""
+    if response_obj.file is not None:
+        return sum(part.remaining if isinstance(part, FileBody) else len(part)
+                   for part in response_obj.file_parts())
+    if response_obj.stream is not None:
+        return None
+    return len(buffers[1]) if len(buffers) > 1 else 0
+
+
+def _close_files(parts):
+    """아직 보내지 못한 응답 조각 중 파일 바디 닫기"""
+    for part in parts:
+        if isinstance(part, FileBody):
+            part.close()
+
+
+class _BaseServer:
+    """
+    두 서버 엔진이 공유하는 요청 처리 로직
+    
+    하위 클래스는 handler, logger, metrics, profiler, profile_token, running,
+    keepalive_timeout, max_keepalive_requests 속성을 가져야 합니다.
+    """
     
-    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    def _handle(self, method, path, parsed):
+        """예약 경로(GET /_metrics, /_profile)는 서버가 직접 응답, 그 밖의 요청은 핸들러로"""
+        if method == 'GET':
+            route = path.partition('?')[0]
+            if route == METRICS_PATH:
+                response_obj = HTTPResponse.create_200_response(
+                    self.metrics.render(), 'text/plain; version=0.0.4; charset=utf-8'
+                )
+                response_obj.route = METRICS_PATH
+                return response_obj
+            if self.profile_token and (route == PROFILE_PATH or route.startswith(PROFILE_PATH + '/')):
+                response_obj = self._profile_response(path, parsed['headers'])
+                response_obj.route = PROFILE_PATH
+                return response_obj
+        
+        if self.profiler.active:
+            return self.profiler.call(
+                self.handler.handle_request, method, path, parsed['headers'], parsed['body']
+            )
+        return self.handler.handle_request(method, path, parsed['headers'], parsed['body'])
+    
+    def _profile_response(self, path, headers):
+        """
+        GET /_profile?seconds=N&mode=stack|cprofile → 프로파일링 시작 (202, 결과 경로는 Location)
+        GET /_profile/<파일 이름> → 저장된 결과 (끝나지 않았거나 없으면 404)
+        
+        토큰은 X-Profile-Token 헤더로만 받습니다 (요청 경로는 쿼리까지 접근 로그에 기록되므로).
+        프로파일링은 프로파일러 스레드에서 실행되므로 이 요청을 처리하는 스레드는 기다리지 않습니다.
+        """
+        token = get_header(headers, 'X-Profile-Token') or ''
+        if not hmac.compare_digest(token.encode('utf-8'), self.profile_token.encode('utf-8')):
+            return HTTPResponse.create_403_response('Invalid profile token')
+        
+        route, _, query_string = path.partition('?')
+        if route != PROFILE_PATH:
+            return self._profile_result_response(route[len(PROFILE_PATH) + 1:])
+        
+        params = dict(parse_qsl(query_string, keep_blank_values=True))
+        mode = params.get('mode', DEFAULT_PROFILE_MODE)
+        if mode not in PROFILE_MODES:
+            return HTTPResponse.create_400_response(f'Invalid profile mode: {mode}')
+        try:
+            seconds = float(params.get('seconds', DEFAULT_PROFILE_SECONDS))
+        except ValueError:
+            return HTTPResponse.create_400_response('Invalid seconds')
+        if not 0 < seconds <= PROFILE_MAX_SECONDS:
+            return HTTPResponse.create_400_response(f'seconds must be in (0, {PROFILE_MAX_SECONDS}]')
+        
+        name = self.profiler.start(seconds, mode)
+        if name is None:
+            return HTTPResponse.create_409_response('Profiling already in progress')
+        location = f'{PROFILE_PATH}/{name}'
+        body = json.dumps({'message': 'Profiling started', 'mode': mode, 'seconds': seconds, 'result': location})
+        return HTTPResponse.create_202_response(body, {'Location': location})
+    
+    def _profile_result_response(self, name):
+        """저장된 프로파일 결과 파일 응답 ('stack'은 텍스트, 'cprofile'은 pstats 덤프)"""
+        result_path = self.profiler.result_path(name)
+        if result_path is None:
+            return HTTPResponse.create_404_response(f'Unknown profile: {name}')
+        try:
+            with open(result_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return HTTPResponse.create_404_response(f'Profile not ready or not found: {name}')
+        
+        if name.endswith('.folded'):
+            return HTTPResponse(200, {'Content-Type': 'text/plain; charset=utf-8'}, data)
+        return HTTPResponse(200, {
+            'Content-Type': 'application/octet-stream',
+            'Content-Disposition': f'attachment; filename="{name}"'
+        }, data)
+    
+    def _record(self, parsed, client_address, response_obj, buffers, phases):
+        """
+        요청 하나의 접근 로그와 메트릭 기록
+        
+        Args:
+            parsed (dict): 파싱된 요청
+            client_address: 클라이언트 주소
+            response_obj (HTTPResponse): 직렬화를 마친 응답
+            buffers (list): to_buffers() 결과
+            phases (dict): 단계별 처리 시간 (ns, read / parse / wait / handle / serialize)
+        """
+        size = _body_size(buffers, response_obj)
+        method = parsed['method']
+        latency_ns = phases['handle'] + phases['serialize']
+        self.logger.access(
+            client_address, method, parsed['path'], parsed['version'], response_obj.status_code,
+            size, latency_ns / 1e9
+        )
+        
+        metrics = self.metrics
+        labels = (
+            ('method', method if method in HTTP_METHODS else 'OTHER'),
+            ('route', response_obj.route or 'other')
+        )
+        metrics.inc('http_requests_total', labels + (('status', str(response_obj.status_code)),))
+        metrics.inc('http_request_bytes_total', value=parsed['size'])
+        metrics.inc('http_response_bytes_total', value=len(buffers[0]) + (size or 0))
+        metrics.observe('http_request_duration_seconds', labels, latency_ns / 1e9)
+        metrics.observe('http_phase_duration_seconds', _PHASE_PARSE, phases['parse'] / 1e9)
+        metrics.observe('http_phase_duration_seconds', _PHASE_HANDLE, phases['handle'] / 1e9)
+        metrics.observe('http_phase_duration_seconds', _PHASE_SERIALIZE, phases['serialize'] / 1e9)
+    
+    def _process_request(self, parsed, client_address, request_number):
+        """
+        요청 하나 처리: 핸들러 실행 + 연결 헤더 설정 + 응답 직렬화
+        
+        Args:
+            parsed (dict): 파싱된 요청
+            client_address: 클라이언트 주소
+            request_number (int): 이 연결에서 몇 번째 요청인지
+        
+        Returns:
+            tuple: (전송할 응답 조각 리스트, 연결 유지 여부, 처리 시간 기록)
+                   조각은 bytes 버퍼 리스트, bytes, 스트리밍 바디를 만드는 bytes 이터레이터, 또는 FileBody
+                   처리 시간 기록은 (메소드, 경로, 상태 코드, 단계별 시간 dict) (전송 후 느린 요청 확인용)
+        """
+        started = time.perf_counter_ns()
+        # 단계별 시간 (ns): 수신(첫 바이트 → 요청 완성, 파싱 포함), 파싱, 처리 대기, 핸들러, 직렬화
+        phases = {
+            'read': parsed['read_ns'],
+            'parse': parsed['parse_ns'],
+            'wait': started - parsed['parsed_at_ns'],
+            'handle': 0,
+            'serialize': 0
+        }
+        try:
+            response_obj = self._handle(parsed['method'], parsed['path'], parsed)
+            handled = time.perf_counter_ns()
+            phases['handle'] = handled - started
+            
+            streaming = response_obj.stream is not None
+            # HTTP/1.0은 chunked를 모르므로 스트리밍 바디의 끝을 연결 종료로 표시
+            close_delimited = streaming and parsed['version'] == 'HTTP/1.0'
+            if close_delimited:
+                response_obj.set_close_delimited()
+            
+            keep_alive = (
+                self.running
+                and not close_delimited
+                and request_number < self.max_keepalive_requests
+                and _should_keep_alive(parsed)
+            )
+            _apply_connection_headers(
+                response_obj, keep_alive,
+                self.keepalive_timeout, self.max_keepalive_requests - request_number
+            )
+            if self.server_timing:
+                response_obj.set_header('Server-Timing', _server_timing(phases))
+            
+            buffers = response_obj.to_buffers()
+            phases['serialize'] = time.perf_counter_ns() - handled
+            self._record(parsed, client_address, response_obj, buffers, phases)
+            timing = (parsed['method'], parsed['path'], response_obj.status_code, phases)
+            if response_obj.file is not None:
+                return [buffers] + response_obj.file_parts(), keep_alive, timing
+            if not streaming:
+                return [buffers], keep_alive, timing
+            body = response_obj.stream if close_delimited else response_obj.iter_chunked_body()
+            return [buffers, body], keep_alive, timing
+        
+        except Exception as e:
+            self.logger.error(f"❌ 클라이언트 처리 에러: {e}")
+            phases['handle'] = time.perf_counter_ns() - started
+            response_obj = HTTPResponse.create_500_response('Server Error')
+            _apply_connection_headers(response_obj, False)
+            buffers = response_obj.to_buffers()
+            self._record(parsed, client_address, response_obj, buffers, phases)
+            return [buffers], False, (parsed['method'], parsed['path'], 500, phases)
+    
+    def _process_batch(self, batch, client_address, requests_handled):
+        """
+        파이프라인된 요청들을 도착 순서대로 처리하고 연속된 응답 바이트를 버퍼 리스트 하나로 묶음
+        (바이트를 복사해 합치지 않고 sendmsg 한 번으로 전송)
+        
+        Args:
+            batch (list): 파싱된 요청 목록 (도착 순서)
+            client_address: 클라이언트 주소
+            requests_handled (int): 이 연결에서 이미 처리한 요청 수
+            
+        Returns:
+            tuple: (응답 조각 리스트, 처리한 요청 수, 연결 유지 여부, 요청별 처리 시간 기록 리스트)
+                   스트리밍/파일 응답이 없으면 조각은 bytes 버퍼 리스트 하나
+        """
+        parts = []
+        pending = []        # 아직 조각으로 넣지 않은 연속된 응답 바이트
+        timings = []
+        processed = 0
+        keep_alive = True
+        for parsed in batch:
+            processed += 1
+            request_parts, keep_alive, timing = self._process_request(
+                parsed, client_address, requests_handled + processed
+            )
+            timings.append(timing)
+            for part in request_parts:
+                if isinstance(part, bytes):
+                    pending.append(part)
+                    continue
+                if isinstance(part, list):
+                    pending.extend(part)
+                    continue
+                if pending:
+                    parts.append(pending)
+                    pending = []
+                parts.append(part)
+            if not keep_alive:
+                break  # 연결을 닫을 응답 이후의 요청은 처리하지 않음
+        
+        if pending:
+            parts.append(pending)
+        return parts, processed, keep_alive, timings
+    
+    def _finish_batch(self, client_address, timings, send_ns):
+        """
+        응답 묶음 전송 후: 전송 시간 메트릭 기록 + 임계값을 넘은 요청은 단계별 시간과 함께 느린 요청 로그
+        
+        Args:
+            client_address: 클라이언트 주소
+            timings (list): _process_batch()의 요청별 처리 시간 기록
+            send_ns (int): 묶음 전체의 전송 시간 (ns, 파이프라인된 요청은 같은 값)
+        """
+        self.metrics.observe('http_phase_duration_seconds', _PHASE_SEND, send_ns / 1e9)
+        threshold_ns = self.slow_request_threshold_ns
+        if not threshold_ns:
+            return
+        for method, path, status_code, phases in timings:
+            # 파싱은 수신 시간에 포함되므로 합계에서 제외
+            total_ns = phases['read'] + phases['wait'] + phases['handle'] + phases['serialize'] + send_ns
+            if total_ns >= threshold_ns:
+                self.logger.slow_request(
+                    client_address, method, path, status_code, dict(phases, send=send_ns), total_ns
+                )
+
+
+class HTTPServer(_BaseServer):
+    """멀티스레딩 HTTP 서버 (고정 크기 워커 풀)"""
+    
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 pool_size=DEFAULT_POOL_SIZE, queue_size=DEFAULT_QUEUE_SIZE,
+                 reject_policy=DEFAULT_REJECT_POLICY,
+                 keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+                 max_keepalive_requests=DEFAULT_MAX_KEEPALIVE_REQUESTS,
+                 max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE,
+                 handler=None, reuse_port=False, logger=None, metrics=None,
+                 server_timing=False, slow_request_threshold=SLOW_REQUEST_THRESHOLD,
+                 profiler=None, profile_token=None):
         """
         Args:
             host (str): 서버 호스트 주소
             port (int): 서버 포트 번호
+            pool_size (int): 워커 스레드 수 (동시 처리 가능한 연결 수)
+            queue_size (int): 워커를 기다리는 연결의 최대 개수
+            reject_policy (str): 대기 큐가 가득 찼을 때의 정책 ('reject', 'drop', 'block')
+            keepalive_timeout (float): 지속 연결의 유휴 시간 제한 (초)
+            max_keepalive_requests (int): 한 연결에서 처리할 최대 요청 수
+            max_header_size (int): 요청 헤더 최대 크기 (초과 시 431)
+            max_body_size (int): 요청 바디 최대 크기 (초과 시 413)
+            handler (HTTPHandler): 요청 처리기 (기본값: 새 HTTPHandler)
+            reuse_port (bool): SO_REUSEPORT 설정 (prefork 워커 프로세스들이 같은 포트에서 연결을 나눠 받음)
+            logger (AccessLogger): 접근/에러 로그 기록기 (기본값: 새 AccessLogger, stdout)
+            metrics (Metrics): 메트릭 저장소 (기본값: 새 Metrics, GET /_metrics로 조회)
+            server_timing (bool): 응답에 Server-Timing 헤더(단계별 처리 시간) 추가
+            slow_request_threshold (float): 이 시간(초)을 넘은 요청은 단계별 시간을 느린 요청 로그로 기록 (0이면 끔)
+            profiler (Profiler): 요청 프로파일러 (기본값: 새 Profiler, SIGUSR1로 시작)
+            profile_token (str): GET /_profile 접근 토큰 (None이면 /_profile 사용 안 함)
         """
+        if pool_size < 1:
+            raise ValueError("pool_size must be >= 1")
+        if queue_size < 1:
+            raise ValueError("queue_size must be >= 1")
+        if reject_policy not in REJECT_POLICIES:
+            raise ValueError(f"Unknown reject_policy: {reject_policy}")
+        
         self.host = host
         self.port = port
         self.server_socket = None
         self.running = False
-        self.handler = HTTPHandler()
+        self.handler = handler or HTTPHandler()
+        self.reuse_port = reuse_port
+        self.logger = logger or AccessLogger()
+        self.metrics = metrics or Metrics()
+        self.server_timing = server_timing
+        self.slow_request_threshold_ns = int(slow_request_threshold * 1e9)
+        self.profiler = profiler or Profiler()
+        self.profile_token = profile_token
+        
+        # 워커 풀 설정
+        self.pool_size = pool_size
+        self.queue_size = queue_size
+        self.reject_policy = reject_policy
+        self.client_queue = queue.Queue(maxsize=queue_size)
+        self.workers = []
+        
+        # 지속 연결 설정
+        self.keepalive_timeout = keepalive_timeout
+        self.max_keepalive_requests = max_keepalive_requests
+        
+        # 요청 크기 제한
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+        
+        # 현재 값 메트릭 (조회 때 계산)
+        self.metrics.gauge('http_active_connections', lambda: (
+            self.metrics.total('http_connections_total') - self.metrics.total('http_connections_closed_total')
+        ))
+        self.metrics.gauge('http_queue_depth', self.client_queue.qsize)
     
     def start(self):
         """서버 시작"""
@@ -38,6 +465,9 @@ class HTTPServer:
             
             # 소켓 옵션 설정 (포트 재사용 가능)
             self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.reuse_port:
+                # 커널이 같은 포트의 리스닝 소켓들에 새 연결을 분산
+                self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
             
             # 2. bind: 주소와 포트 바인딩
             self.server_socket.bind((self.host, self.port))
@@ -46,104 +476,841 @@ class HTTPServer:
             self.server_socket.listen(10)
             
             self.running = True
+            
+            # 4. 워커 스레드 미리 생성 (연결마다 스레드를 만들지 않음)
+            self._start_workers()
+            
+            # SIGUSR1 → 프로파일링 후 파일로 저장 (신호 처리 함수는 메인 스레드에서만 등록 가능)
+            if threading.current_thread() is threading.main_thread():
+                self.profiler.install_signal()
+            
             print(f"🚀 서버 시작: http://{self.host}:{self.port}")
+            print(f"🧵 워커 {self.pool_size}개, 대기 큐 {self.queue_size}개 ({self.reject_policy})")
             print(f"📡 연결 대기 중... (Ctrl+C로 종료)")
             print("-" * 50)
             
-            # 4. accept 루프: 클라이언트 연결 수락
+            # 5. accept 루프: 클라이언트 연결 수락 → 대기 큐에 넣기
             while self.running:
                 try:
                     # accept(): 클라이언트 연결 대기 (블로킹)
                     client_socket, client_address = self.server_socket.accept()
-                    print(f"✅ 클라이언트 연결: {client_address}")
+                    self.logger.event(f"✅ 클라이언트 연결: {client_address}")
                     
-                    # 새 스레드 생성하여 클라이언트 처리
-                    client_thread = threading.Thread(
-                        target=self.handle_client,
-                        args=(client_socket, client_address)
-                    )
-                    client_thread.daemon = True  # 메인 스레드 종료 시 함께 종료
-                    client_thread.start()
+                    self._dispatch(client_socket, client_address)
                     
                 except KeyboardInterrupt:
                     print("\n\n⚠️  서버 종료 중...")
                     break
                 except Exception as e:
-                    print(f"❌ 연결 수락 에러: {e}")
+                    self.logger.error(f"❌ 연결 수락 에러: {e}")
         
         except Exception as e:
+            # 호출한 쪽(prefork 워커 등)이 실패를 알 수 있도록 다시 발생시킴
             print(f"❌ 서버 시작 실패: {e}")
+            raise
         finally:
             self.shutdown()
     
+    def _start_workers(self):
+        """고정 개수의 워커 스레드 생성"""
+        for i in range(self.pool_size):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"http-worker-{i}"
+            )
+            worker.daemon = True  # 메인 스레드 종료 시 함께 종료
+            worker.start()
+            self.workers.append(worker)
+    
+    def _worker_loop(self):
+        """워커 스레드: 대기 큐에서 연결을 꺼내 처리 (None을 받으면 종료)"""
+        while True:
+            item = self.client_queue.get()
+            try:
+                if item is None:
+                    break
+                client_socket, client_address = item
+                self.handle_client(client_socket, client_address)
+            finally:
+                self.client_queue.task_done()
+    
+    def _dispatch(self, client_socket, client_address):
+        """
+        수락한 연결을 대기 큐에 넣기 (큐가 가득 차면 reject_policy에 따라 처리)
+        
+        Args:
+            client_socket: 클라이언트 소켓
+            client_address: 클라이언트 주소
+        """
+        if self.reject_policy == 'block':
+            # 워커가 자리를 비울 때까지 accept 스레드가 대기 (backpressure)
+            self.client_queue.put((client_socket, client_address))
+            return
+        
+        try:
+            self.client_queue.put_nowait((client_socket, client_address))
+        except queue.Full:
+            self._reject(client_socket, client_address)
+    
+    def _reject(self, client_socket, client_address):
+        """
+        과부하 상태의 연결 거절 (요청을 읽지 않고 바로 응답)
+        
+        Args:
+            client_socket: 클라이언트 소켓
+            client_address: 클라이언트 주소
+        """
+        self.logger.error(f"⛔ 대기 큐 초과, 연결 거절: {client_address}")
+        try:
+            if self.reject_policy == 'reject':
+                response = HTTPResponse.create_503_response('Server busy')
+                client_socket.sendall(response.to_bytes())
+                client_socket.shutdown(socket.SHUT_WR)
+                # 이미 도착한 요청 바이트를 비워야 close() 시 RST로 503이 유실되지 않음
+                client_socket.setblocking(False)
+                client_socket.recv(BUFFER_SIZE)
+        except OSError:
+            pass
+        finally:
+            client_socket.close()
+    
     def handle_client(self, client_socket, client_address):
         """
-        클라이언트 요청 처리 (별도 스레드에서 실행)
+        클라이언트 요청 처리 (워커 스레드에서 실행)
+        
+        HTTP/1.1 지속 연결: 클라이언트가 'Connection: close'를 보내거나,
+        유휴 시간 초과 또는 최대 요청 수에 도달할 때까지 같은 연결에서 요청을 반복 처리합니다.
         
         Args:
             client_socket: 클라이언트 소켓
             client_address: 클라이언트 주소
         """
+        self.metrics.inc('http_connections_total')
         try:
-            # 1. 요청 받기 (recv: 블로킹)
-            raw_data = client_socket.recv(BUFFER_SIZE)
-            
-            if not raw_data:
-                return
-            
-            # 바이트 → 문자열 변환
-            request_string = raw_data.decode('utf-8')
-            
-            print(f"\n📨 요청 받음 from {client_address}:")
-            print(request_string.split('\r\n')[0])  # 요청 라인만 출력
-            
-            # 2. 요청 파싱
-            parser = HTTPParser()
-            parsed = parser.parse_request(request_string)
+            # 유휴 시간 초과 설정 (다음 요청을 기다리는 최대 시간)
+            client_socket.settimeout(self.keepalive_timeout)
+            requests_handled = 0
+            # 연결 단위 리더 (파서 하나를 이 연결의 모든 요청에 재사용)
+            reader = HTTPReader(client_socket, self.max_header_size, self.max_body_size)
             
-            if not parsed:
-                # 파싱 실패 → 400 Bad Request
-                response = "HTTP/1.1 400 Bad Request\r\n\r\nBad Request"
-                client_socket.send(response.encode('utf-8'))
-                return
-            
-            # 3. 요청 처리
-            method = parsed['method']
-            path = parsed['path']
-            headers = parsed['headers']
-            body = parsed['body']
-            
-            response_obj = self.handler.handle_request(method, path, headers, body)
-            
-            # 4. 응답 생성
-            response_string = response_obj.build_response()
-            
-            print(f"📤 응답 전송: {response_obj.status_code} {method} {path}")
-            
-            # 5. 응답 전송 (문자열 → 바이트)
-            client_socket.send(response_string.encode('utf-8'))
+            while True:
+                # 1. 요청 받기 + 파싱 (recv: 블로킹)
+                # 파이프라인으로 함께 도착한 요청들은 한 번에 꺼냄
+                try:
+                    batch = reader.read_requests()
+                except socket.timeout:
+                    break  # 유휴 연결 종료
+                except HTTPParseError as e:
+                    # 잘못된 요청 / 크기 제한 초과 → 400 / 413 / 431
+                    self.logger.error(f"⚠️  요청 파싱 실패 from {client_address}: {e.status_code} {e.message}")
+                    self.metrics.inc('http_parse_errors_total', (('status', str(e.status_code)),))
+                    client_socket.sendall(_parse_error_response(e).to_bytes())
+                    break
+                
+                if not batch:
+                    break  # 클라이언트가 연결을 닫음
+                
+                # 2. 요청 처리 + 응답 생성 (도착 순서대로)
+                parts, processed, keep_alive, timings = self._process_batch(
+                    batch, client_address, requests_handled
+                )
+                requests_handled += processed
+                
+                # 3. 응답 전송 (파이프라인된 응답 N개를 sendmsg 한 번으로)
+                send_started = time.perf_counter_ns()
+                sent_all = self._send_parts(client_socket, parts)
+                self._finish_batch(client_address, timings, time.perf_counter_ns() - send_started)
+                if not sent_all or not keep_alive:
+                    break
         
         except Exception as e:
-            print(f"❌ 클라이언트 처리 에러: {e}")
+            self.logger.error(f"❌ 클라이언트 처리 에러: {e}")
             try:
-                error_response = "HTTP/1.1 500 Internal Server Error\r\n\r\nServer Error"
-                client_socket.send(error_response.encode('utf-8'))
+                response_obj = HTTPResponse.create_500_response('Server Error')
+                _apply_connection_headers(response_obj, False)
+                client_socket.sendall(response_obj.to_bytes())
             except:
                 pass
         finally:
-            # 6. 연결 종료
+            # 4. 연결 종료
             client_socket.close()
-            print(f"🔌 연결 종료: {client_address}")
+            self.metrics.inc('http_connections_closed_total')
+            self.logger.event(f"🔌 연결 종료: {client_address}")
+    
+    def _send_parts(self, client_socket, parts):
+        """
+        응답 조각 전송 (스트리밍 바디는 청크가 만들어지는 대로, 파일 바디는 sendfile로 전송)
+        
+        Returns:
+            bool: 에러 없이 모두 보냈는지 여부
+                  (헤더를 이미 보냈으므로 에러 응답 대신 연결을 끊어 불완전한 응답임을 알림)
+        """
+        try:
+            for part in parts:
+                if isinstance(part, list):
+                    _send_buffers(client_socket, part)
+                elif isinstance(part, FileBody):
+                    # 커널에서 파일 → 소켓으로 직접 복사 (사용자 공간 버퍼 없음, 파일은 끝난 뒤 닫음)
+                    sent = client_socket.sendfile(part.file, part.offset, part.remaining)
+                    if sent < part.remaining:
+                        self.logger.error(f"❌ 파일 전송 중단: 파일이 예상보다 짧음 ({sent}/{part.remaining} bytes)")
+                        return False
+                else:
+                    try:
+                        for chunk in part:
+                            client_socket.sendall(chunk)
+                            self.metrics.inc('http_response_bytes_total', value=len(chunk))
+                    except OSError:
+                        raise
+                    except Exception as e:
+                        self.logger.error(f"❌ 스트리밍 응답 생성 에러: {e}")
+                        return False
+            return True
+        finally:
+            _close_files(parts)
     
     def shutdown(self):
         """서버 종료"""
         self.running = False
         if self.server_socket:
             self.server_socket.close()
+        
+        # 워커 종료 신호 (대기 중인 연결 처리 후 종료)
+        deadline = time.monotonic() + POOL_SHUTDOWN_TIMEOUT
+        for _ in self.workers:
+            try:
+                self.client_queue.put(None, timeout=max(deadline - time.monotonic(), 0))
+            except queue.Full:
+                break  # 워커는 daemon 스레드이므로 프로세스 종료 시 함께 정리됨
+        
+        # 처리 중인 요청이 저장소를 바꾸는 도중에 데이터를 저장하지 않도록 워커 종료 대기
+        for worker in self.workers:
+            worker.join(max(deadline - time.monotonic(), 0))
+        unfinished = sum(1 for worker in self.workers if worker.is_alive())
+        if unfinished:
+            self.logger.error(f"⚠️  워커 {unfinished}개가 {POOL_SHUTDOWN_TIMEOUT}초 안에 끝나지 않음")
+        self.workers = []
+        
+        # 메모리에만 반영된 사용자 데이터 저장
+        self.handler.close()
+        self.logger.close()
         print("✅ 서버 종료 완료")
 
 
+class _Connection:
+    """이벤트 루프 서버의 연결별 상태"""
+    
+    def __init__(self, client_socket, client_address, parser):
+        self.socket = client_socket
+        self.address = client_address
+        self.parser = parser           # 연결 단위 증분 파서 (수신 버퍼 포함)
+        self.out_buffers = []          # 전송 중인 응답 바이트 (memoryview 리스트, sendmsg로 전송)
+        self.out_parts = deque()       # 이어서 보낼 응답 조각 (버퍼 리스트 / 스트리밍 이터레이터 / FileBody)
+        self.out_file = None           # sendfile로 전송 중인 파일 바디
+        self.busy = False              # executor에서 핸들러 실행 중
+        self.keep_alive = True         # 현재 응답 전송 후 연결 유지 여부
+        self.pending_error = None      # 파이프라인 중간에서 발생한 파싱 에러
+        self.requests_handled = 0
+        self.last_active = time.monotonic()
+        self.write_started = 0         # 현재 응답 전송을 시작한 시각 (perf_counter_ns)
+        self.timings = ()              # 전송 중인 응답들의 처리 시간 기록 (전송 후 느린 요청 확인용)
+        self.events = selectors.EVENT_READ     # selector에 등록한 이벤트 (None이면 등록 해제 상태)
+
+
+class EventLoopServer(_BaseServer):
+    """
+    selectors(epoll/kqueue) 기반 단일 스레드 HTTP 서버
+    
+    accept/recv/send는 모두 논블로킹으로 이벤트 루프에서 처리하고,
+    파일 I/O가 포함된 핸들러 실행만 executor 스레드로 넘깁니다.
+    유휴 연결은 selector에 등록만 되어 있으므로 스레드를 점유하지 않습니다.
+    """
+    
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 executor_workers=DEFAULT_EXECUTOR_WORKERS,
+                 keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+                 max_keepalive_requests=DEFAULT_MAX_KEEPALIVE_REQUESTS,
+                 max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE,
+                 handler=None, reuse_port=False, logger=None, metrics=None,
+                 server_timing=False, slow_request_threshold=SLOW_REQUEST_THRESHOLD,
+                 profiler=None, profile_token=None):
+        """
+        Args:
+            host (str): 서버 호스트 주소
+            port (int): 서버 포트 번호
+            executor_workers (int): 핸들러 실행용 스레드 수
+            keepalive_timeout (float): 지속 연결의 유휴 시간 제한 (초)
+            max_keepalive_requests (int): 한 연결에서 처리할 최대 요청 수
+            max_header_size (int): 요청 헤더 최대 크기 (초과 시 431)
+            max_body_size (int): 요청 바디 최대 크기 (초과 시 413)
+            handler (HTTPHandler): 요청 처리기 (기본값: 새 HTTPHandler)
+            reuse_port (bool): SO_REUSEPORT 설정 (prefork 워커 프로세스들이 같은 포트에서 연결을 나눠 받음)
+            logger (AccessLogger): 접근/에러 로그 기록기 (기본값: 새 AccessLogger, stdout)
+            metrics (Metrics): 메트릭 저장소 (기본값: 새 Metrics, GET /_metrics로 조회)
+            server_timing (bool): 응답에 Server-Timing 헤더(단계별 처리 시간) 추가
+            slow_request_threshold (float): 이 시간(초)을 넘은 요청은 단계별 시간을 느린 요청 로그로 기록 (0이면 끔)
+            profiler (Profiler): 요청 프로파일러 (기본값: 새 Profiler, SIGUSR1로 시작)
+            profile_token (str): GET /_profile 접근 토큰 (None이면 /_profile 사용 안 함)
+        """
+        self.host = host
+        self.port = port
+        self.server_socket = None
+        self.running = False
+        self.handler = handler or HTTPHandler()
+        self.reuse_port = reuse_port
+        self.logger = logger or AccessLogger()
+        self.metrics = metrics or Metrics()
+        self.server_timing = server_timing
+        self.slow_request_threshold_ns = int(slow_request_threshold * 1e9)
+        self.profiler = profiler or Profiler()
+        self.profile_token = profile_token
+        self.executor_workers = executor_workers
+        self.keepalive_timeout = keepalive_timeout
+        self.max_keepalive_requests = max_keepalive_requests
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+        
+        self.selector = None
+        self.executor = None
+        self.connections = {}
+        self._last_idle_check = 0.0
+        
+        # executor → 이벤트 루프 완료 통지 (self-pipe 기법)
+        self._completed = deque()
+        self._wake_reader = None
+        self._wake_writer = None
+        # executor에 넘겼지만 아직 완료되지 않은 요청 묶음 수 (이벤트 루프 스레드만 변경)
+        self._pending_batches = 0
+        
+        # 현재 값 메트릭 (조회 때 계산, 대기 큐 = 실행 스레드를 기다리는 요청 묶음)
+        self.metrics.gauge('http_active_connections', lambda: len(self.connections))
+        self.metrics.gauge('http_queue_depth', lambda: max(0, self._pending_batches - self.executor_workers))
+    
+    def start(self):
+        """서버 시작 (이벤트 루프 실행)"""
+        try:
+            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.reuse_port:
+                self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            self.server_socket.bind((self.host, self.port))
+            self.server_socket.listen(128)
+            self.server_socket.setblocking(False)
+            
+            self.selector = selectors.DefaultSelector()
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.executor_workers,
+                thread_name_prefix='http-executor'
+            )
+            self._wake_reader, self._wake_writer = socket.socketpair()
+            self._wake_reader.setblocking(False)
+            self._wake_writer.setblocking(False)
+            
+            self.selector.register(self.server_socket, selectors.EVENT_READ, self._accept)
+            self.selector.register(self._wake_reader, selectors.EVENT_READ, self._drain_completed)
+            
+            if threading.current_thread() is threading.main_thread():
+                self.profiler.install_signal()
+            
+            self.running = True
+            print(f"🚀 서버 시작 (event loop): http://{self.host}:{self.port}")
+            print(f"📡 연결 대기 중... (Ctrl+C로 종료)")
+            print("-" * 50)
+            
+            while self.running:
+                try:
+                    events = self.selector.select(timeout=1.0)
+                    for key, mask in events:
+                        callback = key.data
+                        if key.fileobj is self.server_socket or key.fileobj is self._wake_reader:
+                            callback()
+                        else:
+                            callback(key.fileobj, mask)
+                    self._close_idle_connections()
+                except KeyboardInterrupt:
+                    print("\n\n⚠️  서버 종료 중...")
+                    break
+                except Exception as e:
+                    self.logger.error(f"❌ 이벤트 루프 에러: {e}")
+        
+        except Exception as e:
+            # 호출한 쪽(prefork 워커 등)이 실패를 알 수 있도록 다시 발생시킴
+            print(f"❌ 서버 시작 실패: {e}")
+            raise
+        finally:
+            self.shutdown()
+    
+    def _accept(self):
+        """대기 중인 연결을 모두 수락하고 selector에 등록"""
+        while True:
+            try:
+                client_socket, client_address = self.server_socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            
+            self.logger.event(f"✅ 클라이언트 연결: {client_address}")
+            client_socket.setblocking(False)
+            parser = HTTPParser(self.max_header_size, self.max_body_size)
+            conn = _Connection(client_socket, client_address, parser)
+            self.connections[client_socket] = conn
+            self.metrics.inc('http_connections_total')
+            self.selector.register(client_socket, selectors.EVENT_READ, self._on_event)
+    
+    def _on_event(self, client_socket, mask):
+        """클라이언트 소켓 이벤트 처리"""
+        conn = self.connections.get(client_socket)
+        if conn is None:
+            return
+        if mask & selectors.EVENT_READ:
+            self._on_readable(conn)
+        if mask & selectors.EVENT_WRITE and conn.socket in self.connections:
+            self._on_writable(conn)
+    
+    def _on_readable(self, conn):
+        """요청 바이트 수신 (요청이 완성되면 executor로 핸들러 실행)"""
+        try:
+            data = conn.socket.recv(BUFFER_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(conn)
+            return
+        
+        if not data:
+            # 클라이언트가 연결을 닫음
+            self._close(conn)
+            return
+        
+        conn.parser.feed(data)
+        conn.last_active = time.monotonic()
+        self._dispatch_if_ready(conn)
+    
+    def _dispatch_if_ready(self, conn):
+        """버퍼에 완성된 요청들이 있으면 한 번에 executor로 넘겨 처리"""
+        if conn.busy or conn.out_buffers or conn.out_file is not None:
+            return
+        
+        if conn.pending_error is not None:
+            # 앞선 요청들의 응답을 모두 보낸 뒤 에러 응답 후 연결 종료
+            error_buffers = _parse_error_response(conn.pending_error).to_buffers()
+            self._start_write(conn, [error_buffers], False)
+            return
+        
+        # 파이프라인으로 도착한 요청을 모두 꺼냄
+        batch = []
+        try:
+            while True:
+                parsed = conn.parser.next_request()
+                if parsed is None:
+                    break  # 아직 다음 요청이 다 도착하지 않음
+                batch.append(parsed)
+        except HTTPParseError as e:
+            # 잘못된 요청 / 크기 제한 초과 → 에러 응답 후 연결 종료
+            self.logger.error(f"⚠️  요청 파싱 실패 from {conn.address}: {e.status_code} {e.message}")
+            self.metrics.inc('http_parse_errors_total', (('status', str(e.status_code)),))
+            conn.pending_error = e
+        
+        if not batch:
+            if conn.pending_error is not None:
+                self._dispatch_if_ready(conn)
+            return
+        
+        conn.busy = True
+        # 처리 중에는 읽지 않음 (응답을 받지 않고 요청만 계속 보내는 클라이언트가 수신 버퍼를 키우지 못하도록)
+        self._watch(conn, None)
+        self._pending_batches += 1
+        future = self.executor.submit(
+            self._process_batch, batch, conn.address, conn.requests_handled
+        )
+        future.add_done_callback(lambda f, c=conn: self._notify_completed(c, f))
+    
+    def _notify_completed(self, conn, future):
+        """executor 완료 콜백: 결과를 큐에 넣고 이벤트 루프를 깨움"""
+        self._completed.append((conn, future))
+        try:
+            self._wake_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass  # 이미 깨우기 신호가 쌓여 있음
+    
+    def _drain_completed(self):
+        """완료된 핸들러 결과를 연결의 송신 버퍼로 옮김 (이벤트 루프 스레드)"""
+        try:
+            while self._wake_reader.recv(BUFFER_SIZE):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        
+        while self._completed:
+            conn, future = self._completed.popleft()
+            conn.busy = False
+            self._pending_batches -= 1
+            if conn.socket not in self.connections:
+                continue  # 처리 중에 연결이 끊김
+            parts, processed, keep_alive, timings = future.result()
+            conn.requests_handled += processed
+            self._start_write(conn, parts, keep_alive, timings)
+    
+    def _start_write(self, conn, parts, keep_alive, timings=()):
+        """응답 조각을 송신 대기열에 넣고 쓰기 이벤트 대기"""
+        conn.out_parts = deque(parts)
+        conn.keep_alive = keep_alive
+        conn.timings = timings
+        conn.write_started = time.perf_counter_ns()
+        self._load_next_part(conn)
+        self._watch(conn, selectors.EVENT_WRITE)
+    
+    def _watch(self, conn, events):
+        """
+        연결 소켓의 감시 이벤트 변경
+        
+        읽기는 대기 중인 응답이 없을 때만 감시하므로(처리 중 = 등록 해제, 전송 중 = 쓰기만)
+        수신 버퍼에는 응답을 기다리는 요청 한 묶음 이상이 쌓이지 않습니다.
+        
+        Args:
+            conn (_Connection): 연결
+            events (int): selectors.EVENT_READ / EVENT_WRITE (None이면 등록 해제)
+        """
+        if events == conn.events:
+            return
+        if events is None:
+            self.selector.unregister(conn.socket)
+        elif conn.events is None:
+            self.selector.register(conn.socket, events, self._on_event)
+        else:
+            self.selector.modify(conn.socket, events, self._on_event)
+        conn.events = events
+    
+    def _load_next_part(self, conn):
+        """
+        다음에 보낼 바이트를 송신 버퍼로 옮김
+        
+        스트리밍 응답은 소켓에 쓸 수 있을 때마다 청크를 하나씩만 만들어
+        응답 전체를 메모리에 올리지 않습니다.
+        
+        Returns:
+            bool: 보낼 바이트가 남아 있는지 여부
+        """
+        while conn.out_parts:
+            part = conn.out_parts[0]
+            if isinstance(part, list):
+                conn.out_parts.popleft()
+                buffers = [memoryview(buffer) for buffer in part if buffer]
+            elif isinstance(part, FileBody):
+                conn.out_parts.popleft()
+                conn.out_buffers = []
+                if part.remaining == 0:
+                    self._finish_file(conn, part)
+                    continue
+                conn.out_file = part
+                return True
+            else:
+                try:
+                    data = next(part, None)
+                except Exception as e:
+                    # 헤더를 이미 보냈으므로 연결을 끊어 불완전한 응답임을 알림
+                    self.logger.error(f"❌ 스트리밍 응답 생성 에러: {e}")
+                    _close_files(conn.out_parts)
+                    conn.out_parts.clear()
+                    conn.keep_alive = False
+                    break
+                if data is None:
+                    conn.out_parts.popleft()
+                    continue
+                self.metrics.inc('http_response_bytes_total', value=len(data))
+                buffers = [memoryview(data)] if data else []
+            if buffers:
+                conn.out_buffers = buffers
+                return True
+        
+        conn.out_buffers = []
+        return False
+    
+    def _on_writable(self, conn):
+        """송신 버퍼 전송 (전송 완료 후 keep-alive면 다시 읽기 대기, 아니면 연결 종료)"""
+        if conn.out_file is not None:
+            if not self._send_file(conn):
+                return
+        else:
+            try:
+                if hasattr(conn.socket, 'sendmsg'):
+                    # 헤더/바디/파이프라인 응답 버퍼를 합치지 않고 한 번의 writev로 전송
+                    sent = conn.socket.sendmsg(conn.out_buffers[:_IOV_MAX])
+                else:
+                    sent = conn.socket.send(conn.out_buffers[0])
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self._close(conn)
+                return
+            
+            conn.out_buffers = _advance_buffers(conn.out_buffers, sent)
+            if conn.out_buffers:
+                return
+        
+        # 남은 조각(스트리밍 청크 등)이 있으면 이어서 전송
+        if self._load_next_part(conn):
+            return
+        self._finish_batch(conn.address, conn.timings, time.perf_counter_ns() - conn.write_started)
+        conn.timings = ()
+        
+        if not conn.keep_alive:
+            self._close(conn)
+            return
+        
+        conn.last_active = time.monotonic()
+        self._watch(conn, selectors.EVENT_READ)
+        # 응답 전송 중에 이미 다음 요청이 도착했을 수 있음
+        self._dispatch_if_ready(conn)
+    
+    def _send_file(self, conn):
+        """
+        파일 바디를 소켓이 받을 수 있는 만큼 sendfile로 전송
+        
+        Returns:
+            bool: 파일 전송 완료 여부 (진행 중이거나 에러로 연결을 닫았으면 False)
+        """
+        file_body = conn.out_file
+        try:
+            if hasattr(os, 'sendfile'):
+                sent = os.sendfile(
+                    conn.socket.fileno(), file_body.file.fileno(), file_body.offset, file_body.remaining
+                )
+            else:
+                # sendfile이 없는 OS: 한 번에 STREAM_CHUNK_SIZE씩 읽어서 전송
+                file_body.file.seek(file_body.offset)
+                sent = conn.socket.send(file_body.file.read(min(file_body.remaining, STREAM_CHUNK_SIZE)))
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            self._close(conn)
+            return False
+        
+        if sent == 0:
+            # 파일이 Content-Length보다 짧아짐 → 응답을 완성할 수 없으므로 연결 종료
+            self.logger.error(f"❌ 파일 전송 중단: 파일이 예상보다 짧음 ({conn.address})")
+            self._close(conn)
+            return False
+        
+        file_body.offset += sent
+        file_body.remaining -= sent
+        if file_body.remaining > 0:
+            return False
+        conn.out_file = None
+        self._finish_file(conn, file_body)
+        return True
+    
+    def _finish_file(self, conn, file_body):
+        """전송을 마친 파일 구간 정리 (같은 파일의 다른 구간이 남아 있으면 열어 둠, multipart/byteranges)"""
+        if not any(isinstance(part, FileBody) and part.file is file_body.file for part in conn.out_parts):
+            file_body.close()
+    
+    def _close_idle_connections(self):
+        """유휴 시간이 초과된 keep-alive 연결 종료 (최대 1초에 한 번만 검사)"""
+        now = time.monotonic()
+        if now - self._last_idle_check < 1.0:
+            return
+        self._last_idle_check = now
+        deadline = now - self.keepalive_timeout
+        for conn in list(self.connections.values()):
+            if (not conn.busy and not conn.out_buffers and conn.out_file is None
+                    and conn.last_active < deadline):
+                self._close(conn)
+    
+    def _close(self, conn):
+        """연결 종료 및 selector 등록 해제"""
+        if self.connections.pop(conn.socket, None) is None:
+            return
+        if conn.out_file is not None:
+            conn.out_file.close()
+            conn.out_file = None
+        _close_files(conn.out_parts)
+        conn.out_parts.clear()
+        try:
+            self.selector.unregister(conn.socket)
+        except (KeyError, ValueError):
+            pass
+        conn.socket.close()
+        self.metrics.inc('http_connections_closed_total')
+        self.logger.event(f"🔌 연결 종료: {conn.address}")
+    
+    def shutdown(self):
+        """서버 종료"""
+        self.running = False
+        for conn in list(self.connections.values()):
+            self._close(conn)
+        if self.selector:
+            self.selector.close()
+        if self.executor:
+            self.executor.shutdown(wait=True)  # 진행 중인 핸들러가 끝난 뒤 데이터 저장
+        for sock in (self._wake_reader, self._wake_writer, self.server_socket):
+            if sock:
+                sock.close()
+        
+        # 메모리에만 반영된 사용자 데이터 저장
+        self.handler.close()
+        self.logger.close()
+        print("✅ 서버 종료 완료")
+
+
+def create_server(engine=DEFAULT_ENGINE, **options):
+    """
+    엔진 이름으로 서버 객체 생성
+    
+    Args:
+        engine (str): 'thread' 또는 'eventloop'
+        **options: 서버 생성자 인자
+        
+    Returns:
+        HTTPServer | EventLoopServer: 서버 객체
+    """
+    if engine == 'thread':
+        return HTTPServer(**options)
+    elif engine == 'eventloop':
+        return EventLoopServer(**options)
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+
+
+def create_logger(level=DEFAULT_LOG_LEVEL, log_format=DEFAULT_LOG_FORMAT,
+                  sample_rate=DEFAULT_LOG_SAMPLE_RATE, log_file=None):
+    """
+    로그 기록기 생성 (기록 스레드가 시작되므로 서버를 실행할 프로세스에서 호출)
+    
+    Args:
+        level (str): 출력 수준 ('error', 'info', 'debug')
+        log_format (str): 'text' 또는 'json'
+        sample_rate (float): 기록할 접근 로그 비율 (0~1)
+        log_file (str): 로그 파일 경로 (이어쓰기, None이면 stdout)
+    
+    Returns:
+        AccessLogger: 로그 기록기
+    """
+    stream = open(log_file, 'a', encoding='utf-8') if log_file else None
+    return AccessLogger(level, log_format, sample_rate, stream)
+
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='HTTP 소켓 서버')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='바인딩 주소')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='포트 번호')
+    parser.add_argument('--engine', choices=SERVER_ENGINES, default=DEFAULT_ENGINE,
+                        help='서버 엔진 (thread: 워커 풀, eventloop: selectors 기반)')
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                        help='[thread] 워커 스레드 수')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help='[thread] 대기 큐 크기')
+    parser.add_argument('--reject-policy', choices=REJECT_POLICIES, default=DEFAULT_REJECT_POLICY,
+                        help='[thread] 대기 큐 초과 시 처리 정책')
+    parser.add_argument('--keepalive-timeout', type=float, default=DEFAULT_KEEPALIVE_TIMEOUT,
+                        help='지속 연결 유휴 시간 제한 (초)')
+    parser.add_argument('--max-keepalive-requests', type=int, default=DEFAULT_MAX_KEEPALIVE_REQUESTS,
+                        help='한 연결에서 처리할 최대 요청 수')
+    parser.add_argument('--max-header-size', type=int, default=MAX_HEADER_SIZE,
+                        help='요청 헤더 최대 크기 (bytes, 초과 시 431)')
+    parser.add_argument('--max-body-size', type=int, default=MAX_BODY_SIZE,
+                        help='요청 바디 최대 크기 (bytes, 초과 시 413)')
+    parser.add_argument('--durability', choices=DURABILITY_MODES, default=DEFAULT_DURABILITY,
+                        help='사용자 데이터 저장 모드 (async: 주기적 로그 기록, sync: 변경마다 로그 기록)')
+    parser.add_argument('--flush-interval', type=float, default=DEFAULT_FLUSH_INTERVAL,
+                        help='[async] 변경 로그 기록 주기 (초)')
+    parser.add_argument('--compact-threshold', type=int, default=DEFAULT_COMPACT_THRESHOLD,
+                        help='변경 로그를 스냅샷으로 압축할 크기 (bytes)')
+    parser.add_argument('--index-fields', default=','.join(DEFAULT_INDEX_FIELDS),
+                        help='GET /users 조회용 보조 인덱스를 만들 필드 (쉼표로 구분)')
+    parser.add_argument('--static-cache-size', type=int, default=STATIC_CACHE_SIZE,
+                        help='정적 파일 캐시 크기 (bytes)')
+    parser.add_argument('--static-revalidate-interval', type=float, default=STATIC_REVALIDATE_INTERVAL,
+                        help='정적 파일 변경(mtime/크기)을 다시 확인하는 주기 (초)')
+    parser.add_argument('--gzip-level', type=int, choices=range(10), default=DEFAULT_GZIP_LEVEL,
+                        help='gzip 압축 레벨 (1: 빠름 ~ 9: 작음, 0이면 압축하지 않음)')
+    parser.add_argument('--gzip-min-size', type=int, default=GZIP_MIN_SIZE,
+                        help='동적 응답(/users)을 압축할 최소 크기 (bytes)')
+    parser.add_argument('--executor-workers', type=int, default=DEFAULT_EXECUTOR_WORKERS,
+                        help='[eventloop] 핸들러 실행 스레드 수')
+    parser.add_argument('--log-level', choices=LOG_LEVELS, default=DEFAULT_LOG_LEVEL,
+                        help='로그 수준 (error: 에러만, info: 접근 로그 포함, debug: 연결 수락/종료 포함)')
+    parser.add_argument('--log-format', choices=LOG_FORMATS, default=DEFAULT_LOG_FORMAT,
+                        help='로그 형식 (text: 한 줄 텍스트, json: 한 줄 JSON)')
+    parser.add_argument('--log-sample-rate', type=float, default=DEFAULT_LOG_SAMPLE_RATE,
+                        help='기록할 접근 로그 비율 (0~1, 에러는 항상 기록)')
+    parser.add_argument('--log-file', default=None,
+                        help='로그 파일 경로 (기본값: stdout)')
+    parser.add_argument('--server-timing', action='store_true',
+                        help='응답에 Server-Timing 헤더(단계별 처리 시간) 추가')
+    parser.add_argument('--slow-request-threshold', type=float, default=SLOW_REQUEST_THRESHOLD,
+                        help='이 시간(초)을 넘은 요청을 단계별 시간과 함께 로그에 기록 (0이면 끔)')
+    parser.add_argument('--profile-token', default=None,
+                        help='GET /_profile?seconds=N&mode=stack|cprofile 접근 토큰 (X-Profile-Token 헤더로 전달, 지정하지 않으면 SIGUSR1로만 프로파일링)')
+    parser.add_argument('--profile-switch-interval', type=float, default=None,
+                        help='stack 프로파일링 동안 사용할 GIL 전환 주기 (초, 예: 0.0001, 짧은 핸들러도 샘플링되지만 '
+                             '모든 요청 스레드의 스케줄링이 바뀌어 지연 시간이 달라짐, 기본값: 바꾸지 않음)')
+    parser.add_argument('--profile-dir', default=None,
+                        help='프로파일 결과(SIGUSR1 / GET /_profile)를 저장할 디렉토리 (기본값: 현재 디렉토리)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='워커 프로세스 수 (2 이상이면 SO_REUSEPORT prefork 모드)')
+    return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
-    # 서버 실행
-    server = HTTPServer()
-    server.start()
+    args = parse_args()
+    
+    if args.engine == 'eventloop':
+        options = {'executor_workers': args.executor_workers}
+    else:
+        options = {
+            'pool_size': args.pool_size,
+            'queue_size': args.queue_size,
+            'reject_policy': args.reject_policy,
+        }
+    
+    handler_options = {
+        'durability': args.durability,
+        'flush_interval': args.flush_interval,
+        'compact_threshold': args.compact_threshold,
+        'index_fields': [field for field in args.index_fields.split(',') if field],
+        'static_cache_size': args.static_cache_size,
+        'static_revalidate_interval': args.static_revalidate_interval,
+        'gzip_level': args.gzip_level,
+        'gzip_min_size': args.gzip_min_size,
+    }
+    server_options = {
+        'host': args.host,
+        'port': args.port,
+        'keepalive_timeout': args.keepalive_timeout,
+        'max_keepalive_requests': args.max_keepalive_requests,
+        'max_header_size': args.max_header_size,
+        'max_body_size': args.max_body_size,
+        'server_timing': args.server_timing,
+        'slow_request_threshold': args.slow_request_threshold,
+        'profile_token': args.profile_token,
+        **options
+    }
+    profiler_options = {
+        'output_dir': args.profile_dir,
+        'switch_interval': args.profile_switch_interval,
+    }
+    log_options = {
+        'level': args.log_level,
+        'log_format': args.log_format,
+        'sample_rate': args.log_sample_rate,
+        'log_file': args.log_file,
+    }
+    
+    if args.workers > 1:
+        # 멀티 프로세스: 워커마다 SO_REUSEPORT 서버, 사용자 데이터는 데이터 프로세스가 담당
+        supervisor = PreforkSupervisor(
+            args.workers, handler_options,
+            lambda handler: create_server(
+                args.engine, handler=handler, reuse_port=True,
+                logger=create_logger(**log_options), profiler=Profiler(**profiler_options), **server_options
+            )
+        )
+        supervisor.run()
+    else:
+        # 서버 실행
+        server = create_server(
+            args.engine, handler=HTTPHandler(**handler_options),
+            logger=create_logger(**log_options), profiler=Profiler(**profiler_options), **server_options
+        )
+        server.start()
@@ -0,0 +1,246 @@
+"""
+정적 파일 캐시 모듈
+자주 요청되는 정적 파일의 내용과 응답 헤더를 메모리에 보관합니다.
+
+- 경로 기준 LRU, 캐시된 바디 총 크기(bytes)와 항목 수 제한
+- 파일 변경 확인(os.stat의 mtime/크기)은 revalidate_interval 초에 한 번만
+- ETag / Last-Modified / Content-Length / Content-Type 헤더를 미리 계산
+- gzip 압축본: 디스크에 더 최신인 .gz 파일이 있으면 사용, 없으면 처음 요청될 때 한 번만 압축
+"""
+
+import sys
+import os
+import stat
+import time
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.HTTPConstants import (
+    STATIC_CACHE_SIZE, STATIC_CACHE_MAX_FILE_SIZE, STATIC_CACHE_MAX_ENTRIES, STATIC_REVALIDATE_INTERVAL,
+    DEFAULT_GZIP_LEVEL
+)
+from server.Compression import is_compressible, gzip_bytes
+
+
+class StaticFile:
+    """캐시된 정적 파일 하나 (바디가 너무 크면 메타데이터와 헤더만 보관)"""
+    
+    def __init__(self, path, size, mtime_ns, content_type, body, checked_at, encoding=None, vary=False):
+        """
+        Args:
+            path (str): 파일 경로 (디스크의 .gz 압축본이면 .gz 파일 경로)
+            size (int): 파일 크기 (bytes)
+            mtime_ns (int): 수정 시각 (ns)
+            content_type (str): Content-Type
+            body (bytes): 파일 내용 (캐시하지 않는 큰 파일이면 None)
+            checked_at (float): 마지막으로 파일 변경을 확인한 시각 (time.monotonic)
+            encoding (str): 압축본이면 Content-Encoding ('gzip'), 원본이면 None
+            vary (bool): Accept-Encoding에 따라 다른 응답을 보내는지 (Vary 헤더 추가)
+        """
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.content_type = content_type
+        self.body = body
+        self.checked_at = checked_at
+        self.encoding = encoding
+        self.vary = vary
+        
+        self.gzip = None            # gzip 압축본 (StaticFile, 아직 없으면 None)
+        self.gzip_source = None     # 디스크 .gz 파일의 (크기, mtime_ns) (변경 확인용)
+        
+        self.mtime = mtime_ns // 1_000_000_000     # Last-Modified는 초 단위
+        # 압축본은 원본과 다른 ETag를 사용 (강한 검증자는 표현마다 달라야 함)
+        self.etag = f'"{size:x}-{mtime_ns:x}-{encoding}"' if encoding else f'"{size:x}-{mtime_ns:x}"'
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+        # 조건부 요청(304) 응답에 포함할 검증 헤더
+        self.validators = {'ETag': self.etag, 'Last-Modified': self.last_modified}
+        # 200 응답 헤더 (응답마다 복사해서 사용)
+        self.headers = {
+            'Content-Type': content_type,
+            'Content-Length': str(size),
+            'ETag': self.etag,
+            'Last-Modified': self.last_modified,
+            'Accept-Ranges': 'bytes'
+        }
+        if encoding:
+            self.headers['Content-Encoding'] = encoding
+        if vary:
+            self.headers['Vary'] = 'Accept-Encoding'
+            self.validators['Vary'] = 'Accept-Encoding'
+    
+    def cached_bytes(self):
+        """캐시 크기 제한에 포함되는 메모리 사용량 (원본 + 압축본 바디)"""
+        size = len(self.body) if self.body is not None else 0
+        if self.gzip is not None and self.gzip.body is not None:
+            size += len(self.gzip.body)
+        return size
+
+
+class StaticFileCache:
+    """스레드 안전한 정적 파일 LRU 캐시"""
+    
+    def __init__(self, content_type_for, max_size=STATIC_CACHE_SIZE,
+                 max_file_size=STATIC_CACHE_MAX_FILE_SIZE,
+                 revalidate_interval=STATIC_REVALIDATE_INTERVAL,
+                 gzip_level=DEFAULT_GZIP_LEVEL):
+        """
+        Args:
+            content_type_for (callable): 파일 경로 → Content-Type
+            max_size (int): 캐시할 바디의 총 크기 제한 (bytes)
+            max_file_size (int): 바디를 캐시할 파일 하나의 최대 크기 (bytes, 초과 시 헤더만 캐시)
+            revalidate_interval (float): 파일 변경을 다시 확인하기까지의 시간 (초)
+            gzip_level (int): 압축본을 만들 때의 gzip 레벨 (0이면 압축본을 사용하지 않음)
+        """
+        self.content_type_for = content_type_for
+        self.max_size = max_size
+        self.max_file_size = min(max_file_size, max_size)
+        self.max_entries = STATIC_CACHE_MAX_ENTRIES
+        self.revalidate_interval = revalidate_interval
+        self.gzip_level = gzip_level
+        
+        self._entries = OrderedDict()   # 경로 → StaticFile (뒤쪽일수록 최근 사용)
+        self._cached_bytes = 0          # 캐시된 바디 총 크기
+        self._lock = threading.Lock()
+    
+    def get(self, path):
+        """
+        정적 파일 조회 (필요할 때만 os.stat으로 변경 확인)
+        
+        Args:
+            path (str): 파일 경로
+        
+        Returns:
+            StaticFile: 캐시 항목 (파일이 없거나 일반 파일이 아니면 None)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                self._entries.move_to_end(path)
+                if now - entry.checked_at < self.revalidate_interval:
+                    return entry
+        
+        # 파일 I/O는 잠금 밖에서 수행
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.invalidate(path)
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            self.invalidate(path)
+            return None
+        
+        if (entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size
+                and entry.gzip_source == self._gzip_source(path)):
+            entry.checked_at = now
+            return entry
+        
+        entry = self._load(path, now)
+        if entry is not None:
+            self._store(entry)
+        return entry
+    
+    def compressed(self, entry):
+        """
+        gzip 압축본 조회 (디스크 .gz 파일이 없으면 처음 요청될 때 한 번만 압축해서 보관)
+        
+        Args:
+            entry (StaticFile): get()이 반환한 원본 항목
+        
+        Returns:
+            StaticFile: 압축본 (압축 대상이 아니거나 바디를 캐시하지 않는 큰 파일이면 None)
+        """
+        if entry.gzip is not None or not entry.vary or entry.body is None:
+            return entry.gzip
+        
+        # 압축(CPU 작업)은 잠금 밖에서 수행
+        body = gzip_bytes(entry.body, self.gzip_level)
+        variant = StaticFile(
+            entry.path, len(body), entry.mtime_ns, entry.content_type, body, entry.checked_at, 'gzip', True
+        )
+        with self._lock:
+            if entry.gzip is not None:
+                return entry.gzip  # 다른 스레드가 먼저 압축함
+            if self._entries.get(entry.path) is not entry:
+                return variant     # 이미 캐시에서 빠진 항목 → 이번 응답에만 사용
+            entry.gzip = variant
+            self._cached_bytes += len(body)
+            self._evict()
+        return variant
+    
+    def _gzip_source(self, path):
+        """디스크에 있는 미리 압축한 .gz 파일의 (크기, mtime_ns) (없거나 gzip을 사용하지 않으면 None)"""
+        if self.gzip_level <= 0:
+            return None
+        try:
+            st = os.stat(path + '.gz')
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return (st.st_size, st.st_mtime_ns)
+    
+    def _load(self, path, now):
+        """파일을 읽어 캐시 항목 생성 (크기와 수정 시각은 읽은 파일 기준)"""
+        gzip_source = self._gzip_source(path)
+        try:
+            with open(path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                body = f.read() if st.st_size <= self.max_file_size else None
+        except OSError:
+            self.invalidate(path)
+            return None
+        
+        if body is not None and len(body) != st.st_size:
+            body = None  # 읽는 도중 파일이 바뀜 → 이번에는 바디를 캐시하지 않음
+        content_type = self.content_type_for(path)
+        
+        # 원본보다 오래된 .gz 파일은 내용이 다를 수 있으므로 사용하지 않음
+        variant = None
+        if gzip_source is not None and gzip_source[1] >= st.st_mtime_ns:
+            variant = self._load_variant(path + '.gz', content_type, now)
+        vary = self.gzip_level > 0 and (variant is not None or is_compressible(content_type))
+        
+        entry = StaticFile(path, st.st_size, st.st_mtime_ns, content_type, body, now, vary=vary)
+        entry.gzip = variant
+        entry.gzip_source = gzip_source
+        return entry
+    
+    def _load_variant(self, gz_path, content_type, now):
+        """디스크의 .gz 파일로 압축본 항목 생성 (큰 파일은 바디 없이 sendfile로 전송)"""
+        try:
+            with open(gz_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                body = f.read() if st.st_size <= self.max_file_size else None
+        except OSError:
+            return None
+        if body is not None and len(body) != st.st_size:
+            return None
+        return StaticFile(gz_path, st.st_size, st.st_mtime_ns, content_type, body, now, 'gzip', True)
+    
+    def _store(self, entry):
+        """항목 저장 후 크기 제한을 넘으면 오래 사용하지 않은 항목부터 제거"""
+        with self._lock:
+            old = self._entries.pop(entry.path, None)
+            if old is not None:
+                self._cached_bytes -= old.cached_bytes()
+            
+            self._entries[entry.path] = entry
+            self._cached_bytes += entry.cached_bytes()
+            self._evict()
+    
+    def _evict(self):
+        """크기/항목 수 제한을 넘지 않을 때까지 오래 사용하지 않은 항목 제거 (잠금 안에서 호출)"""
+        while self._cached_bytes > self.max_size or len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._cached_bytes -= evicted.cached_bytes()
+    
+    def invalidate(self, path):
+        """항목 제거 (파일이 삭제/변경되어 다음 조회 때 다시 확인해야 할 때)"""
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._cached_bytes -= old.cached_bytes()
@@ -0,0 +1,412 @@
+"""
+사용자 보조 인덱스 모듈
+사용자 필드 값으로 ID를 찾는 메모리 인덱스를 제공합니다.
+
+- 동등 비교: 값 → ID 집합 (해시 버킷으로 나눈 딕셔너리, O(1))
+- 범위 비교: (종류, 값, ID) 정렬 블록 리스트 + bisect (O(log n) 탐색)
+
+UserStore의 copy-on-write 방식에 맞춰 인덱스는 한 번 만들면 수정하지 않고,
+변경이 생기면 새 인덱스를 만들어 교체합니다.
+새 인덱스는 바뀐 버킷 / ID 조각 / 정렬 블록만 복사하고 나머지는 이전 인덱스와 공유하므로
+사용자 수가 많아도 변경 한 번의 비용이 전체 크기에 비례하지 않습니다.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+# 인덱스 키 종류 (같은 종류끼리만 크기 비교)
+KIND_NUMBER = 0
+KIND_STRING = 1
+KIND_OTHER = 2      # true/false/null (동등 비교만 가능)
+
+# 정렬 리스트에서 "모든 ID보다 작은/큰 값" 역할을 하는 경계 ID
+_MIN_ID = ''
+_MAX_ID = '\U0010ffff'
+
+# 구조 공유 단위 (변경 시 이 크기 단위로만 복사)
+ID_CHUNK_SIZE = 256         # ID 범위 조각 크기 (ID 집합, UserStore의 사용자 맵)
+_EQUAL_BUCKETS = 256        # 동등 비교 딕셔너리의 해시 버킷 수
+_BLOCK_SIZE = 512           # 정렬 블록 하나의 기본 크기 (2배를 넘으면 나눔)
+
+
+def index_key(value):
+    """
+    필드 값 → 인덱스 키 (종류, 값)
+    
+    bool은 int의 하위 타입이라 1 == True가 되므로 종류를 따로 두어 구분합니다.
+    
+    Returns:
+        tuple: (종류, 값), 인덱싱할 수 없는 값(리스트, 객체)이면 None
+    """
+    if isinstance(value, bool) or value is None:
+        return (KIND_OTHER, value)
+    if isinstance(value, (int, float)):
+        return (KIND_NUMBER, value)
+    if isinstance(value, str):
+        return (KIND_STRING, value)
+    return None
+
+
+def matches(user, field, op, key):
+    """
+    인덱스 없이 사용자 하나가 조건을 만족하는지 검사 (인덱스와 같은 비교 규칙)
+    
+    Args:
+        user (dict): 사용자 딕셔너리
+        field (str): 필드 이름
+        op (str): 연산자 ('eq', 'gt', 'gte', 'lt', 'lte')
+        key (tuple): index_key()로 만든 비교 값
+    
+    Returns:
+        bool: 조건 만족 여부
+    """
+    if field not in user:
+        return False
+    actual = index_key(user[field])
+    if actual is None:
+        return False
+    if op == 'eq':
+        return actual == key
+    if actual[0] != key[0] or key[0] == KIND_OTHER:
+        return False
+    if op == 'gt':
+        return actual[1] > key[1]
+    if op == 'gte':
+        return actual[1] >= key[1]
+    if op == 'lt':
+        return actual[1] < key[1]
+    return actual[1] <= key[1]
+
+
+def sort_users(users, field, descending=False):
+    """
+    필드 값으로 사용자 정렬 (숫자 → 문자열 순, 비교할 수 없는 값이나 필드가 없는 사용자는 맨 뒤)
+    
+    Args:
+        users (list): 사용자 딕셔너리 리스트
+        field (str): 정렬 기준 필드
+        descending (bool): 내림차순 여부
+    
+    Returns:
+        list: 정렬된 새 리스트 (값이 같으면 원래 순서 유지)
+    """
+    comparable = []
+    rest = []
+    for user in users:
+        key = index_key(user.get(field)) if field in user else None
+        if key is None or key[0] == KIND_OTHER:
+            rest.append(user)
+        else:
+            comparable.append((key, user))
+    comparable.sort(key=lambda item: item[0], reverse=descending)
+    return [user for key, user in comparable] + rest
+
+
+class IdSet:
+    """
+    사용자 ID 문자열의 불변 집합
+    
+    ID 범위(ID_CHUNK_SIZE)별 frozenset 조각으로 나누어, 추가/삭제 시 해당 조각만 새로 만듭니다.
+    """
+    
+    __slots__ = ('_chunks', '_size')
+    
+    def __init__(self, chunks=None, size=0):
+        """
+        Args:
+            chunks (dict): 조각 번호 → ID 문자열 frozenset
+            size (int): 전체 ID 수
+        """
+        self._chunks = chunks or {}
+        self._size = size
+    
+    @classmethod
+    def from_ids(cls, ids):
+        """ID 문자열 목록으로 집합 생성"""
+        chunks = {}
+        for user_id in ids:
+            chunks.setdefault(int(user_id) // ID_CHUNK_SIZE, set()).add(user_id)
+        return cls({number: frozenset(chunk) for number, chunk in chunks.items()},
+                   sum(len(chunk) for chunk in chunks.values()))
+    
+    def __len__(self):
+        return self._size
+    
+    def __iter__(self):
+        for chunk in self._chunks.values():
+            yield from chunk
+    
+    def __contains__(self, user_id):
+        chunk = self._chunks.get(int(user_id) // ID_CHUNK_SIZE)
+        return chunk is not None and user_id in chunk
+    
+    def added(self, user_id):
+        """user_id를 추가한 새 집합"""
+        number = int(user_id) // ID_CHUNK_SIZE
+        chunk = self._chunks.get(number, frozenset())
+        if user_id in chunk:
+            return self
+        chunks = dict(self._chunks)
+        chunks[number] = chunk | {user_id}
+        return IdSet(chunks, self._size + 1)
+    
+    def removed(self, user_id):
+        """user_id를 뺀 새 집합"""
+        number = int(user_id) // ID_CHUNK_SIZE
+        chunk = self._chunks.get(number)
+        if chunk is None or user_id not in chunk:
+            return self
+        chunks = dict(self._chunks)
+        if len(chunk) == 1:
+            del chunks[number]
+        else:
+            chunks[number] = chunk - {user_id}
+        return IdSet(chunks, self._size - 1)
+
+
+_EMPTY_IDS = IdSet()
+
+
+class _SortedBlocks:
+    """
+    정렬된 항목의 불변 리스트 (블록 리스트 + 블록별 마지막 항목으로 bisect)
+    
+    삽입/삭제 시 해당 블록과 블록 목록만 새로 만들고 나머지 블록은 공유합니다.
+    """
+    
+    __slots__ = ('_blocks', '_maxes')
+    
+    def __init__(self, blocks, maxes):
+        """
+        Args:
+            blocks (list): 정렬된 항목 리스트들 (비어 있는 블록 없음)
+            maxes (list): 블록별 마지막 항목
+        """
+        self._blocks = blocks
+        self._maxes = maxes
+    
+    @classmethod
+    def build(cls, entries):
+        """정렬된 항목 리스트를 블록으로 나눔"""
+        blocks = [entries[i:i + _BLOCK_SIZE] for i in range(0, len(entries), _BLOCK_SIZE)]
+        return cls(blocks, [block[-1] for block in blocks])
+    
+    def inserted(self, entry):
+        """entry를 정렬 위치에 넣은 새 리스트"""
+        blocks = list(self._blocks)
+        maxes = list(self._maxes)
+        if not blocks:
+            return _SortedBlocks([[entry]], [entry])
+        position = min(bisect_left(maxes, entry), len(blocks) - 1)
+        block = list(blocks[position])
+        insort(block, entry)
+        if len(block) > 2 * _BLOCK_SIZE:
+            half = len(block) // 2
+            blocks[position:position + 1] = [block[:half], block[half:]]
+            maxes[position:position + 1] = [block[half - 1], block[-1]]
+        else:
+            blocks[position] = block
+            maxes[position] = block[-1]
+        return _SortedBlocks(blocks, maxes)
+    
+    def removed(self, entry):
+        """entry를 뺀 새 리스트 (없으면 자기 자신)"""
+        position = bisect_left(self._maxes, entry)
+        if position == len(self._blocks):
+            return self
+        block = self._blocks[position]
+        index = bisect_left(block, entry)
+        if index == len(block) or block[index] != entry:
+            return self
+        blocks = list(self._blocks)
+        maxes = list(self._maxes)
+        if len(block) == 1:
+            del blocks[position]
+            del maxes[position]
+        else:
+            block = block[:index] + block[index + 1:]
+            blocks[position] = block
+            maxes[position] = block[-1]
+        return _SortedBlocks(blocks, maxes)
+    
+    def iter_between(self, start, start_right, end, end_right):
+        """
+        start 이상(start_right면 초과)부터 end 미만(end_right면 이하)까지의 항목을 순서대로 반환
+        
+        Yields:
+            tuple: 항목
+        """
+        blocks = self._blocks
+        find_start = bisect_right if start_right else bisect_left
+        position = find_start(self._maxes, start)
+        if position == len(blocks):
+            return
+        index = find_start(blocks[position], start)
+        while position < len(blocks):
+            block = blocks[position]
+            for i in range(index, len(block)):
+                entry = block[i]
+                if entry > end or (entry == end and not end_right):
+                    return
+                yield entry
+            position += 1
+            index = 0
+
+
+class UserIndex:
+    """필드 하나에 대한 불변 보조 인덱스"""
+    
+    def __init__(self, field, equal, ordered):
+        """
+        Args:
+            field (str): 인덱싱할 필드 이름
+            equal (tuple): 해시 버킷별 딕셔너리 (인덱스 키 → IdSet)
+            ordered (_SortedBlocks): 숫자/문자열 값의 (종류, 값, ID 문자열) 정렬 리스트
+        """
+        self.field = field
+        self._equal = equal
+        self._ordered = ordered
+    
+    @classmethod
+    def build(cls, field, users):
+        """
+        전체 사용자로 인덱스 생성 (서버 시작 시 한 번)
+        
+        Args:
+            field (str): 인덱싱할 필드 이름
+            users: ID 문자열 → 사용자 딕셔너리 매핑 (items() 지원)
+        """
+        equal = {}
+        ordered = []
+        for user_id, user in users.items():
+            if field not in user:
+                continue
+            key = index_key(user[field])
+            if key is None:
+                continue
+            equal.setdefault(key, []).append(user_id)
+            if key[0] != KIND_OTHER:
+                ordered.append((key[0], key[1], user_id))
+        ordered.sort()
+        
+        buckets = [{} for _ in range(_EQUAL_BUCKETS)]
+        for key, ids in equal.items():
+            buckets[hash(key) % _EQUAL_BUCKETS][key] = IdSet.from_ids(ids)
+        return cls(field, tuple(buckets), _SortedBlocks.build(ordered))
+    
+    def _key_of(self, user):
+        """사용자에서 이 인덱스의 키 추출 (필드가 없거나 인덱싱할 수 없으면 None)"""
+        if user is None or self.field not in user:
+            return None
+        return index_key(user[self.field])
+    
+    def updated(self, user_id, old_user, new_user):
+        """
+        사용자 하나가 바뀐 새 인덱스 반환 (기존 인덱스는 그대로 유지)
+        
+        바뀐 키의 버킷, ID 조각, 정렬 블록만 복사합니다.
+        
+        Args:
+            user_id (str): 사용자 ID 문자열
+            old_user (dict): 변경 전 사용자 (생성이면 None)
+            new_user (dict): 변경 후 사용자 (삭제면 None)
+        
+        Returns:
+            UserIndex: 변경이 반영된 인덱스 (필드 값이 같으면 자기 자신)
+        """
+        old_key = self._key_of(old_user)
+        new_key = self._key_of(new_user)
+        if old_key == new_key and (old_key is None or type(old_key[1]) is type(new_key[1])):
+            return self
+        
+        equal = list(self._equal)
+        if old_key is not None:
+            self._set_ids(equal, old_key, self.lookup(old_key).removed(user_id))
+        if new_key is not None:
+            bucket = equal[hash(new_key) % _EQUAL_BUCKETS]
+            self._set_ids(equal, new_key, bucket.get(new_key, _EMPTY_IDS).added(user_id))
+        
+        ordered = self._ordered
+        if old_key is not None and old_key[0] != KIND_OTHER:
+            ordered = ordered.removed((old_key[0], old_key[1], user_id))
+        if new_key is not None and new_key[0] != KIND_OTHER:
+            ordered = ordered.inserted((new_key[0], new_key[1], user_id))
+        return UserIndex(self.field, tuple(equal), ordered)
+    
+    @staticmethod
+    def _set_ids(equal, key, ids):
+        """버킷 리스트에서 key의 버킷만 복사해 ID 집합 교체 (비어 있으면 키 삭제)"""
+        number = hash(key) % _EQUAL_BUCKETS
+        bucket = dict(equal[number])
+        if ids:
+            bucket[key] = ids
+        else:
+            bucket.pop(key, None)
+        equal[number] = bucket
+    
+    def lookup(self, key):
+        """
+        동등 비교 (O(1))
+        
+        Args:
+            key (tuple): index_key()로 만든 인덱스 키
+        
+        Returns:
+            IdSet: 값이 일치하는 사용자 ID 문자열 집합
+        """
+        return self._equal[hash(key) % _EQUAL_BUCKETS].get(key, _EMPTY_IDS)
+    
+    def range(self, kind, lower=None, lower_inclusive=True, upper=None, upper_inclusive=True):
+        """
+        범위 비교 (O(log n) + 결과 수)
+        
+        Args:
+            kind (int): 비교할 값 종류 (KIND_NUMBER, KIND_STRING)
+            lower: 하한 값 (None이면 하한 없음)
+            lower_inclusive (bool): 하한 포함 여부
+            upper: 상한 값 (None이면 상한 없음)
+            upper_inclusive (bool): 상한 포함 여부
+        
+        Returns:
+            set: 범위에 속하는 사용자 ID 문자열 집합
+        """
+        bounds = self._bounds(kind, lower, lower_inclusive, upper, upper_inclusive)
+        return {entry[2] for entry in self._ordered.iter_between(*bounds)}
+    
+    def iter_ids(self, kind, lower=None, lower_inclusive=True):
+        """
+        하한 이후의 ID를 값 순서대로 하나씩 반환 (앞부분만 필요한 페이지 조회용)
+        
+        인덱스는 수정되지 않으므로 반복 도중 다른 스레드가 써도 안전합니다.
+        
+        Args:
+            kind (int): 비교할 값 종류 (KIND_NUMBER, KIND_STRING)
+            lower: 하한 값 (None이면 처음부터)
+            lower_inclusive (bool): 하한 포함 여부
+        
+        Yields:
+            str: 사용자 ID 문자열
+        """
+        bounds = self._bounds(kind, lower, lower_inclusive, None, True)
+        for entry in self._ordered.iter_between(*bounds):
+            yield entry[2]
+    
+    def _bounds(self, kind, lower, lower_inclusive, upper, upper_inclusive):
+        """
+        범위의 시작/끝 경계 항목 계산
+        
+        Returns:
+            tuple: (시작 항목, 시작 항목 제외 여부, 끝 항목, 끝 항목 포함 여부)
+        """
+        if lower is None:
+            start, start_right = (kind,), False
+        elif lower_inclusive:
+            start, start_right = (kind, lower, _MIN_ID), False
+        else:
+            start, start_right = (kind, lower, _MAX_ID), True
+        if upper is None:
+            end, end_right = (kind + 1,), False
+        elif upper_inclusive:
+            end, end_right = (kind, upper, _MAX_ID), True
+        else:
+            end, end_right = (kind, upper, _MIN_ID), False
+        return start, start_right, end, end_right
@@ -0,0 +1,553 @@
+"""
+사용자 데이터 저장소 모듈
+users.json을 서버 시작 시 한 번만 읽어 메모리에 두고, 읽기는 메모리에서 처리합니다.
+
+변경 사항은 전체 파일을 다시 쓰지 않고 쓰기 전 로그(users.json.wal)에 한 줄씩 추가합니다.
+- 'async': flush 주기마다 백그라운드 스레드가 로그를 디스크에 기록
+- 'sync': 변경할 때마다 응답 전에 로그를 디스크에 기록 (동시 요청은 fsync 한 번으로 묶음)
+
+로그가 커지면 백그라운드에서 스냅샷(users.json)으로 압축하고,
+서버 시작 시에는 스냅샷 + 로그 재생으로 상태를 복구합니다.
+
+동시성: 읽기는 잠금 없이, 쓰기는 잠금 하나로 직렬화 (copy-on-write, 바뀐 ID 범위 조각만 복사)
+조회: 설정한 필드마다 보조 인덱스를 두고 변경 시 바뀐 사용자만 반영 (UserIndex)
+응답: 사용자별로 인코딩한 JSON bytes를 캐시하고 변경된 사용자만 무효화
+"""
+
+import sys
+import os
+import json
+import time
+import threading
+from itertools import islice
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.HTTPConstants import (
+    DURABILITY_MODES, DEFAULT_DURABILITY, DEFAULT_FLUSH_INTERVAL, DEFAULT_COMPACT_THRESHOLD,
+    DEFAULT_INDEX_FIELDS
+)
+from server.WriteAheadLog import WriteAheadLog, fsync_dir
+from server.UserIndex import UserIndex, KIND_NUMBER, KIND_OTHER, ID_CHUNK_SIZE, matches
+
+# 커서 페이지 조회용으로 항상 인덱스를 두는 필드
+ID_FIELD = 'id'
+
+
+class _UserMap:
+    """
+    ID 문자열 → 사용자 딕셔너리의 불변 맵 (ID 순서로 순회)
+    
+    ID 범위(ID_CHUNK_SIZE)별 딕셔너리 조각으로 나누어, 변경 시 바뀐 조각과 조각 목록만 새로 만들고
+    나머지 조각은 이전 맵과 공유합니다. (쓰기 한 번의 복사량이 전체 사용자 수에 비례하지 않음)
+    """
+    
+    __slots__ = ('_chunks', '_order', '_size')
+    
+    def __init__(self, chunks=None, order=(), size=0):
+        """
+        Args:
+            chunks (dict): 조각 번호 → {ID 문자열: 사용자 딕셔너리} (ID 순서)
+            order (tuple): 정렬된 조각 번호
+            size (int): 전체 사용자 수
+        """
+        self._chunks = chunks or {}
+        self._order = order
+        self._size = size
+    
+    @classmethod
+    def build(cls, users):
+        """{ID 문자열: 사용자} 딕셔너리로 맵 생성"""
+        chunks = {}
+        for user_id in sorted(users, key=int):
+            chunks.setdefault(int(user_id) // ID_CHUNK_SIZE, {})[user_id] = users[user_id]
+        return cls(chunks, tuple(sorted(chunks)), len(users))
+    
+    def __len__(self):
+        return self._size
+    
+    def get(self, user_id, default=None):
+        chunk = self._chunks.get(int(user_id) // ID_CHUNK_SIZE)
+        return default if chunk is None else chunk.get(user_id, default)
+    
+    def __getitem__(self, user_id):
+        user = self.get(user_id)
+        if user is None:
+            raise KeyError(user_id)
+        return user
+    
+    def values(self):
+        """사용자를 ID 순서로 하나씩 반환"""
+        for number in self._order:
+            yield from self._chunks[number].values()
+    
+    def items(self):
+        """(ID 문자열, 사용자)를 ID 순서로 하나씩 반환"""
+        for number in self._order:
+            yield from self._chunks[number].items()
+    
+    def to_dict(self):
+        """일반 딕셔너리로 변환 (스냅샷 파일 저장용)"""
+        return dict(self.items())
+    
+    def updated(self, user_id, user):
+        """
+        사용자 하나를 바꾼 새 맵
+        
+        Args:
+            user_id (str): ID 문자열
+            user (dict): 새 사용자 (None이면 삭제)
+        """
+        number = int(user_id) // ID_CHUNK_SIZE
+        chunks = dict(self._chunks)
+        chunk = dict(chunks.get(number, ()))
+        existed = user_id in chunk
+        if user is None:
+            del chunk[user_id]
+        else:
+            chunk[user_id] = user
+        
+        order = self._order
+        if chunk:
+            chunks[number] = chunk
+            if number not in self._chunks:
+                order = tuple(sorted(order + (number,)))
+        else:
+            del chunks[number]
+            order = tuple(n for n in order if n != number)
+        return _UserMap(chunks, order, self._size + (user is not None) - existed)
+
+
+class _Snapshot:
+    """한 시점의 사용자 데이터와 인덱스 (공개한 뒤에는 수정하지 않음)"""
+    
+    def __init__(self, users, indexes, version):
+        """
+        Args:
+            users (_UserMap): ID 문자열 → 사용자 딕셔너리
+            indexes (dict): 필드 이름 → UserIndex
+            version (int): 데이터 버전
+        """
+        self.users = users
+        self.indexes = indexes
+        self.version = version
+
+
+class UserStore:
+    """
+    프로세스 메모리에 상주하는 사용자 저장소
+    
+    copy-on-write 방식으로 동시 접근을 처리합니다.
+    - 쓰기: self._lock 안에서 바뀐 부분만 복사한 사용자 맵과 인덱스로 새 스냅샷을 만들어 self._snapshot을 교체
+    - 읽기: self._snapshot 참조를 한 번 읽어 그 스냅샷만 사용 (잠금 없음, 쓰기를 기다리지 않음)
+    한 번 공개된 스냅샷과 사용자 레코드는 다시 수정하지 않으므로
+    읽는 도중 다른 스레드가 쓰더라도 항상 일관된 시점의 데이터를 보게 됩니다.
+    """
+    
+    def __init__(self, users_file, durability=DEFAULT_DURABILITY, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 compact_threshold=DEFAULT_COMPACT_THRESHOLD, index_fields=DEFAULT_INDEX_FIELDS):
+        """
+        Args:
+            users_file (str): 사용자 데이터 스냅샷(JSON) 파일 경로
+            durability (str): 저장 모드 ('async', 'sync')
+            flush_interval (float): 'async' 모드의 로그 기록 주기 (초)
+            compact_threshold (int): 로그가 이 크기(bytes)를 넘으면 스냅샷으로 압축
+            index_fields (list): 보조 인덱스를 만들 필드 이름 목록
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        
+        self.users_file = users_file
+        self.wal_file = users_file + '.wal'
+        # 압축 중인 로그 (스냅샷 교체가 끝나면 삭제)
+        self.compacting_file = users_file + '.wal.compacting'
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.compact_threshold = compact_threshold
+        
+        self._lock = threading.Lock()           # 쓰기 직렬화 (읽기는 잠금 없음)
+        self._compact_lock = threading.Lock()
+        # 저장소 인스턴스 식별자: 재시작하면 version이 0부터 다시 시작하므로 함께 사용해야 유일함
+        self.epoch = format(time.time_ns(), 'x')
+        
+        # 1. 복구: 스냅샷 → 압축 중이던 로그 → 현재 로그 순서로 재생
+        users, self._next_id = self._load_snapshot()
+        recovered = self._replay(self.compacting_file, users) + self._replay(self.wal_file, users)
+        
+        # 복구한 데이터로 인덱스를 한 번 만든 뒤부터는 변경분만 반영
+        users = _UserMap.build(users)
+        indexes = {field: UserIndex.build(field, users) for field in index_fields}
+        if ID_FIELD not in indexes:
+            indexes[ID_FIELD] = UserIndex.build(ID_FIELD, users)
+        self._snapshot = _Snapshot(users, indexes, 0)
+        # 사용자 ID 문자열 → (인코딩할 때의 사용자 딕셔너리, JSON bytes)
+        self._fragments = {}
+        # 캐시 저장과 무효화 직렬화 (쓰기 잠금과 분리: 캐시를 채우는 읽기가 로그 기록을 기다리지 않음)
+        self._fragments_lock = threading.Lock()
+        
+        self._wal = WriteAheadLog(self.wal_file)
+        if recovered or self._wal.size or os.path.exists(self.compacting_file):
+            # 복구한 상태를 새 스냅샷으로 저장하고 로그 정리
+            self._checkpoint()
+        
+        # 2. 백그라운드 스레드: 'async' 로그 기록 + 로그 압축
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._background_thread = threading.Thread(target=self._background_loop, name='user-store-wal')
+        self._background_thread.daemon = True
+        self._background_thread.start()
+    
+    def _load_snapshot(self):
+        """스냅샷 파일에서 사용자 데이터 읽기 (파일이 없으면 빈 저장소)"""
+        try:
+            with open(self.users_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}, 1
+        return data['users'], data['next_id']
+    
+    def _replay(self, path, users):
+        """
+        로그 레코드를 사용자 딕셔너리에 다시 적용
+        
+        레코드는 변경 후의 전체 상태를 담고 있으므로 여러 번 적용해도 결과가 같습니다.
+        
+        Returns:
+            int: 적용한 레코드 수
+        """
+        count = 0
+        for record in WriteAheadLog.replay(path):
+            self._apply(users, record)
+            count += 1
+        return count
+    
+    def _apply(self, users, record):
+        """로그 레코드 하나를 적용 (시작 시 복구 전용, 공개 전이므로 직접 수정)"""
+        if record['op'] == 'put':
+            user = record['user']
+            users[str(user['id'])] = user
+        elif record['op'] == 'delete':
+            users.pop(str(record['id']), None)
+        if 'next_id' in record:
+            self._next_id = max(self._next_id, record['next_id'])
+    
+    def list_users(self):
+        """
+        전체 사용자 목록 반환
+        
+        Returns:
+            list: 사용자 딕셔너리 리스트 (ID 순서)
+        """
+        return list(self._snapshot.users.values())
+    
+    def iter_users(self):
+        """
+        전체 사용자를 하나씩 반환 (목록을 만들지 않음, 스트리밍 응답용)
+        
+        현재 스냅샷의 사용자 맵은 수정되지 않으므로 반복 도중 다른 스레드가 써도 안전합니다.
+        """
+        return self._snapshot.users.values()
+    
+    @property
+    def version(self):
+        """데이터 버전 (변경될 때마다 1씩 증가)"""
+        return self._snapshot.version
+    
+    def find(self, conditions):
+        """
+        조건에 맞는 사용자 조회
+        
+        인덱스가 있는 필드의 조건은 인덱스로 후보를 좁히고 (결과가 작은 조건부터 교집합),
+        인덱스가 없는 필드의 조건만 남은 후보를 하나씩 검사합니다.
+        
+        Args:
+            conditions (list): (필드, 연산자, 인덱스 키) 목록
+                               연산자: 'eq', 'gt', 'gte', 'lt', 'lte' / 인덱스 키: index_key(값)
+        
+        Returns:
+            list: 조건에 맞는 사용자 딕셔너리 리스트 (ID 순서)
+        
+        Raises:
+            ValueError: true/false/null 값에 범위 비교를 요청한 경우
+        """
+        return self._find(self._snapshot, conditions)
+    
+    def _find(self, snapshot, conditions):
+        """find() 구현 (지정한 스냅샷 하나만 사용)"""
+        users = snapshot.users
+        
+        id_sets = []
+        scan_conditions = []
+        for field, op, key in conditions:
+            if op != 'eq' and key[0] == KIND_OTHER:
+                raise ValueError(f"Range comparison not supported for value: {key[1]}")
+            index = snapshot.indexes.get(field)
+            if index is None:
+                scan_conditions.append((field, op, key))
+            elif op == 'eq':
+                id_sets.append(index.lookup(key))
+            elif op in ('gt', 'gte'):
+                id_sets.append(index.range(key[0], lower=key[1], lower_inclusive=(op == 'gte')))
+            else:
+                id_sets.append(index.range(key[0], upper=key[1], upper_inclusive=(op == 'lte')))
+        
+        if id_sets:
+            # 가장 작은 집합에서 시작해 나머지 집합에 있는지만 확인 (큰 집합은 순회하지 않음)
+            id_sets.sort(key=len)
+            candidate_ids = set(id_sets[0])
+            for ids in id_sets[1:]:
+                candidate_ids = {user_id for user_id in candidate_ids if user_id in ids}
+            candidates = [users[user_id] for user_id in sorted(candidate_ids, key=int)]
+        else:
+            candidates = users.values()
+        
+        return [
+            user for user in candidates
+            if all(matches(user, field, op, key) for field, op, key in scan_conditions)
+        ]
+    
+    def fragment(self, user):
+        """
+        사용자 하나의 JSON 인코딩 (UTF-8 bytes, 캐시)
+        
+        사용자 딕셔너리는 변경 시 항상 새 객체로 교체되므로, 캐시에 저장된 객체와
+        같은 객체일 때만 캐시를 사용합니다. 변경 시에는 _publish()가 해당 사용자만 삭제합니다.
+        이전 스냅샷을 읽는 요청이 이미 바뀌거나 삭제된 사용자를 다시 캐시하지 않도록
+        현재 스냅샷의 객체일 때만 저장합니다. (캐시 크기는 현재 사용자 수를 넘지 않음)
+        
+        Args:
+            user (dict): list_users() / find() 등이 반환한 사용자 딕셔너리
+        
+        Returns:
+            bytes: json.dumps(user, ensure_ascii=False)와 같은 UTF-8 bytes
+        """
+        user_id_str = str(user['id'])
+        cached = self._fragments.get(user_id_str)
+        if cached is not None and cached[0] is user:
+            return cached[1]
+        data = json.dumps(user, ensure_ascii=False).encode('utf-8')
+        with self._fragments_lock:
+            if self._snapshot.users.get(user_id_str) is user:
+                self._fragments[user_id_str] = (user, data)
+        return data
+    
+    def page(self, conditions, after_id, limit):
+        """
+        ID 순서 커서 페이지 조회
+        
+        커서(마지막으로 받은 ID) 다음부터 읽으므로 페이지 사이에 사용자가 추가/삭제되어도
+        건너뛰거나 중복되는 사용자가 없습니다.
+        조건이 없으면 ID 인덱스에서 limit + 1개만 읽습니다. (O(log n + limit))
+        
+        Args:
+            conditions (list): find()와 같은 조건 목록
+            after_id (int): 이 ID 다음부터 조회 (None이면 처음부터)
+            limit (int): 페이지 크기
+        
+        Returns:
+            tuple: (사용자 딕셔너리 리스트, 다음 페이지 존재 여부)
+        """
+        snapshot = self._snapshot
+        if conditions:
+            matched = self._find(snapshot, conditions)
+            users = (user for user in matched if after_id is None or user['id'] > after_id)
+        else:
+            user_ids = snapshot.indexes[ID_FIELD].iter_ids(KIND_NUMBER, after_id, lower_inclusive=False)
+            users = (snapshot.users[user_id] for user_id in user_ids)
+        
+        page = list(islice(users, limit + 1))
+        return page[:limit], len(page) > limit
+    
+    def get(self, user_id):
+        """
+        사용자 조회 (O(1))
+        
+        Args:
+            user_id (int): 사용자 ID
+        
+        Returns:
+            dict: 사용자 데이터 (없으면 None)
+        """
+        return self._snapshot.users.get(str(user_id))
+    
+    def _publish(self, user_id_str, old_user, new_user):
+        """
+        사용자 하나를 바꾼 새 스냅샷을 공개 (self._lock을 잡은 상태에서 호출, 참조 교체는 원자적)
+        
+        Args:
+            user_id_str (str): 사용자 ID 문자열
+            old_user (dict): 변경 전 사용자 (생성이면 None)
+            new_user (dict): 변경 후 사용자 (삭제면 None)
+        """
+        current = self._snapshot
+        users = current.users.updated(user_id_str, new_user)
+        indexes = {
+            field: index.updated(user_id_str, old_user, new_user)
+            for field, index in current.indexes.items()
+        }
+        self._snapshot = _Snapshot(users, indexes, current.version + 1)
+        # 바뀐 사용자의 인코딩 캐시만 무효화 (스냅샷 교체 뒤이므로 이전 객체는 다시 저장되지 않음)
+        with self._fragments_lock:
+            self._fragments.pop(user_id_str, None)
+    
+    def create(self, user_data):
+        """
+        새 사용자 생성 (Auto Increment ID)
+        
+        Args:
+            user_data (dict): 사용자 데이터
+        
+        Returns:
+            dict: ID가 추가된 사용자 데이터
+        """
+        with self._lock:
+            new_id = self._next_id
+            self._next_id += 1
+            user = dict(user_data)
+            user['id'] = new_id
+            seq = self._wal.append({'op': 'put', 'user': user, 'next_id': self._next_id})
+            self._publish(str(new_id), None, user)
+        self._commit(seq)
+        return user
+    
+    def replace(self, user_id, user_data):
+        """
+        사용자 전체 교체 (PUT)
+        
+        Args:
+            user_id (int): 사용자 ID
+            user_data (dict): 새 사용자 데이터
+        
+        Returns:
+            dict: 교체된 사용자 데이터 (사용자가 없으면 None)
+        """
+        user_id_str = str(user_id)
+        with self._lock:
+            current = self._snapshot.users.get(user_id_str)
+            if current is None:
+                return None
+            user = dict(user_data)
+            user['id'] = user_id
+            seq = self._wal.append({'op': 'put', 'user': user})
+            self._publish(user_id_str, current, user)
+        self._commit(seq)
+        return user
+    
+    def patch(self, user_id, patch_data):
+        """
+        사용자 부분 수정 (PATCH, ID는 변경 불가)
+        
+        Args:
+            user_id (int): 사용자 ID
+            patch_data (dict): 변경할 필드
+        
+        Returns:
+            dict: 수정된 사용자 데이터 (사용자가 없으면 None)
+        """
+        user_id_str = str(user_id)
+        with self._lock:
+            current = self._snapshot.users.get(user_id_str)
+            if current is None:
+                return None
+            # 기존 딕셔너리를 수정하지 않고 복사본을 만들어 교체
+            user = dict(current)
+            for key, value in patch_data.items():
+                if key != 'id':
+                    user[key] = value
+            # 로그에는 변경 후 전체 레코드를 기록 (재생이 멱등이 되도록)
+            seq = self._wal.append({'op': 'put', 'user': user})
+            self._publish(user_id_str, current, user)
+        self._commit(seq)
+        return user
+    
+    def delete(self, user_id):
+        """
+        사용자 삭제
+        
+        Args:
+            user_id (int): 사용자 ID
+        
+        Returns:
+            dict: 삭제된 사용자 데이터 (사용자가 없으면 None)
+        """
+        user_id_str = str(user_id)
+        with self._lock:
+            user = self._snapshot.users.get(user_id_str)
+            if user is None:
+                return None
+            seq = self._wal.append({'op': 'delete', 'id': user['id']})
+            self._publish(user_id_str, user, None)
+        self._commit(seq)
+        return user
+    
+    def _commit(self, seq):
+        """변경 기록 마무리: 'sync' 모드면 디스크 기록까지 대기, 로그가 크면 압축 요청"""
+        if self.durability == 'sync':
+            self._wal.sync(seq)
+        if self._wal.size >= self.compact_threshold:
+            self._wake_event.set()
+    
+    def _background_loop(self):
+        """flush 주기마다 로그 기록 ('async'), 로그가 커지면 스냅샷으로 압축"""
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.flush_interval)
+            self._wake_event.clear()
+            try:
+                if self.durability == 'async':
+                    self._wal.sync()
+                if self._wal.size >= self.compact_threshold:
+                    self.compact()
+            except Exception as e:
+                print(f"❌ 사용자 데이터 저장 실패: {e}")
+    
+    def flush(self):
+        """지금까지의 변경 사항을 로그에 기록 (디스크 반영까지 대기)"""
+        self._wal.sync()
+    
+    def compact(self):
+        """
+        로그를 새 스냅샷으로 압축
+        
+        1. 잠금 안에서 메모리 상태를 복사하고 현재 로그를 압축용 파일로 넘김
+        2. 잠금 밖에서 스냅샷을 임시 파일에 쓴 뒤 원자적으로 교체
+        3. 압축용 로그 삭제
+        중간에 종료되어도 시작 시 스냅샷 + 압축용 로그 + 현재 로그 재생으로 복구됩니다.
+        """
+        with self._compact_lock:
+            with self._lock:
+                # 공개된 사용자 맵은 수정되지 않으므로 참조만 보관하고 변환은 잠금 밖에서
+                users, next_id = self._snapshot.users, self._next_id
+                self._wal.rotate(self.compacting_file)
+            
+            self._write_snapshot({'users': users.to_dict(), 'next_id': next_id})
+            os.remove(self.compacting_file)
+    
+    def _checkpoint(self):
+        """시작 시 복구한 상태를 스냅샷으로 저장하고 로그 비우기"""
+        snapshot = {'users': self._snapshot.users.to_dict(), 'next_id': self._next_id}
+        self._write_snapshot(snapshot)
+        if os.path.exists(self.compacting_file):
+            os.remove(self.compacting_file)
+        self._wal.truncate()
+    
+    def _write_snapshot(self, data):
+        """임시 파일에 쓴 뒤 교체 (쓰기 도중 종료되어도 기존 스냅샷은 유지)"""
+        tmp_file = self.users_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.users_file)
+        fsync_dir(os.path.dirname(os.path.abspath(self.users_file)))
+    
+    def close(self):
+        """백그라운드 스레드 중지 후 로그를 스냅샷으로 압축 (종료 후 users.json이 최신 상태)"""
+        if self._background_thread is None:
+            return  # 이미 닫힘
+        self._stop_event.set()
+        self._wake_event.set()
+        self._background_thread.join()
+        self._background_thread = None
+        self.flush()
+        if self._wal.size or os.path.exists(self.compacting_file):
+            self.compact()
+        self._wal.close()
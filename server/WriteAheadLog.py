@@ -0,0 +1,187 @@
+"""
+쓰기 전 로그(Write-Ahead Log) 모듈
+사용자 데이터 변경 사항을 한 줄짜리 JSON 레코드로 로그 파일 끝에 추가합니다.
+
+- 동시에 들어온 여러 쓰기를 한 번의 write + fsync로 묶어서 기록 (group commit)
+- 로그를 보관 파일로 넘기고 새 로그를 시작하는 rotate (스냅샷 압축용)
+- 서버 시작 시 로그를 다시 읽어 변경 사항 복구 (replay)
+"""
+
+import os
+import json
+import threading
+
+
+def fsync_dir(path):
+    """디렉토리 엔트리(rename/생성)를 디스크에 반영 (지원하지 않는 OS는 무시)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class WriteAheadLog:
+    """
+    group commit을 지원하는 추가 전용 로그
+    
+    append()는 레코드를 메모리 대기열에 넣고 순번만 반환하며 (논블로킹),
+    sync(seq)는 해당 순번까지 디스크에 기록될 때까지 기다립니다.
+    sync를 기다리는 스레드 중 하나가 대표로 대기열 전체를 기록하므로
+    동시에 쓰는 스레드가 많을수록 fsync 한 번에 더 많은 레코드가 묶입니다.
+    """
+    
+    def __init__(self, path):
+        """
+        Args:
+            path (str): 로그 파일 경로
+        """
+        self.path = path
+        self._file = open(path, 'ab')
+        self.size = self._file.tell()   # 로그 파일 크기 (bytes)
+        
+        self._cond = threading.Condition()
+        self._pending = []              # 아직 기록되지 않은 레코드 (인코딩된 줄)
+        self._last_seq = 0              # 마지막으로 발급한 순번
+        self._durable_seq = 0           # 디스크에 기록된 마지막 순번
+        self._flushing = False          # 대표 스레드가 기록 중인지 여부
+    
+    @staticmethod
+    def encode(record):
+        """레코드 → 한 줄짜리 JSON 바이트"""
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+    
+    def append(self, record):
+        """
+        레코드를 기록 대기열에 추가 (디스크에 쓰지 않고 바로 반환)
+        
+        호출 순서가 곧 로그 순서이므로, 변경 사항을 메모리에 반영한 잠금 안에서 호출해야 합니다.
+        
+        Args:
+            record (dict): 로그 레코드
+        
+        Returns:
+            int: 레코드 순번 (sync()에 전달)
+        """
+        line = self.encode(record)
+        with self._cond:
+            self._pending.append(line)
+            self._last_seq += 1
+            return self._last_seq
+    
+    def sync(self, seq=None):
+        """
+        지정한 순번까지 디스크에 기록될 때까지 대기 (group commit)
+        
+        Args:
+            seq (int): 기다릴 순번 (None이면 지금까지 추가된 모든 레코드)
+        """
+        with self._cond:
+            if seq is None:
+                seq = self._last_seq
+            while self._durable_seq < seq:
+                if self._flushing:
+                    # 다른 스레드가 기록 중 → 끝나면 내 레코드가 포함됐는지 다시 확인
+                    self._cond.wait()
+                    continue
+                self._flush_pending()
+    
+    def _flush_pending(self):
+        """대기열 전체를 한 번에 기록 (self._cond를 잡은 상태에서 호출)"""
+        batch = self._pending
+        batch_seq = self._last_seq
+        self._pending = []
+        self._flushing = True
+        
+        # 디스크 I/O 동안에는 잠금을 풀어 다른 스레드가 계속 append 할 수 있게 함
+        self._cond.release()
+        try:
+            data = b''.join(batch)
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except Exception:
+            self._cond.acquire()
+            self._pending = batch + self._pending  # 다음 시도에서 다시 기록
+            self._flushing = False
+            self._cond.notify_all()
+            raise
+        self._cond.acquire()
+        
+        self.size += len(data)
+        self._durable_seq = batch_seq
+        self._flushing = False
+        self._cond.notify_all()
+    
+    def rotate(self, archive_path):
+        """
+        현재 로그를 보관 파일로 넘기고 빈 로그로 새로 시작
+        
+        보관 파일이 이미 있으면 (이전 압축이 실패한 경우) 그 뒤에 이어 붙입니다.
+        
+        Args:
+            archive_path (str): 보관 파일 경로
+        """
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            if self._pending:
+                self._flush_pending()
+            
+            self._file.close()
+            if os.path.exists(archive_path):
+                with open(self.path, 'rb') as src, open(archive_path, 'ab') as dst:
+                    dst.write(src.read())
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                self._file = open(self.path, 'wb')
+            else:
+                os.replace(self.path, archive_path)
+                self._file = open(self.path, 'ab')
+            fsync_dir(os.path.dirname(os.path.abspath(self.path)))
+            self.size = 0
+    
+    def truncate(self):
+        """로그 비우기 (모든 레코드가 스냅샷에 반영된 뒤에만 호출)"""
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            self._file.close()
+            self._file = open(self.path, 'wb')
+            os.fsync(self._file.fileno())
+            self.size = 0
+    
+    def close(self):
+        """남은 레코드를 기록하고 파일 닫기"""
+        self.sync()
+        with self._cond:
+            self._file.close()
+    
+    @staticmethod
+    def replay(path):
+        """
+        로그 파일의 레코드를 순서대로 읽기
+        
+        기록 도중 종료되어 마지막 줄이 잘렸거나 깨졌으면 그 앞까지만 반환합니다.
+        
+        Args:
+            path (str): 로그 파일 경로
+        
+        Yields:
+            dict: 로그 레코드
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # 잘린 마지막 줄
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    break  # 깨진 레코드 이후는 신뢰할 수 없음